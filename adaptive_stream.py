@@ -0,0 +1,158 @@
+import collections
+
+# Stream settings from best detection to lowest host load: (resolution scale, keep every Nth frame)
+DEFAULT_LEVELS = (
+    (1.0, 1),
+    (0.75, 1),
+    (0.75, 2),
+    (0.5, 2),
+    (0.5, 3),
+)
+
+AdaptiveStats = collections.namedtuple(
+    "AdaptiveStats", ["frames", "hit_rate", "mean_latency", "drop_ratio", "active_ratio"])
+
+
+class AdaptiveStreamController:
+    """Trade host CPU against detection rate while the device keeps running.
+
+    The controller walks a ladder of (resolution scale, frame decimation)
+    levels. The resolution is changed on the device (ImageManip resize
+    through the reader's config queue); the sensor frame rate cannot be
+    changed without rebuilding the pipeline, so the rate is lowered on the
+    host by only processing every Nth frame.
+
+    After every ``window`` processed frames it looks at the decode latency,
+    the hit rate, scene activity and dropped frames (sequence-number gaps on
+    the non-blocking device queue, i.e. the host falling behind):
+
+    * falling behind (latency over budget or frames dropped): one level cheaper
+    * the scene is changing but nothing decodes: one level richer
+    * decodes succeed easily, or the scene is idle: one level cheaper
+
+    Stepping down again after a level has just failed waits twice as long
+    each time, so the controller settles instead of oscillating.
+    """
+
+    def __init__(self, levels=DEFAULT_LEVELS, window=30, latency_budget=0.03, max_drop_ratio=0.2,
+                 min_hit_rate=0.3, easy_hit_rate=0.9, idle_ratio=0.1):
+        """
+        Initialize the controller at the richest level.
+
+        Args:
+            levels (tuple): (scale, decimation) pairs, richest first
+            window (int): Processed frames per evaluation
+            latency_budget (float): Mean decode time in seconds the host can afford
+            max_drop_ratio (float): Fraction of frames lost on the device queue
+                above which the host counts as falling behind
+            min_hit_rate (float): Hit rate of active frames below which decoding fails
+            easy_hit_rate (float): Hit rate above which a cheaper level is tried
+            idle_ratio (float): Fraction of active frames below which the scene is idle
+        """
+        self.levels = tuple(levels)
+        self.window = window
+        self.latency_budget = latency_budget
+        self.max_drop_ratio = max_drop_ratio
+        self.min_hit_rate = min_hit_rate
+        self.easy_hit_rate = easy_hit_rate
+        self.idle_ratio = idle_ratio
+        self.level = 0
+        self.changes = 0
+        self.last_stats = None
+        self._hold = 1
+        self._windows_at_level = 0
+        self._failed_level = None
+        self._last_sequence = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self._frames = 0
+        self._hits = 0
+        self._active = 0
+        self._active_hits = 0
+        self._latency = 0.0
+        self._seen = 0
+        self._dropped = 0
+
+    @property
+    def scale(self):
+        return self.levels[self.level][0]
+
+    @property
+    def decimation(self):
+        return self.levels[self.level][1]
+
+    def should_process(self, sequence_number):
+        """
+        Host-side frame decimation; also counts frames lost on the device queue.
+
+        Args:
+            sequence_number (int): Device sequence number of the received frame
+
+        Returns:
+            bool: True if the frame should be decoded
+        """
+        if self._last_sequence is not None and sequence_number > self._last_sequence:
+            self._seen += sequence_number - self._last_sequence
+            self._dropped += sequence_number - self._last_sequence - 1
+        self._last_sequence = sequence_number
+        return sequence_number % self.decimation == 0
+
+    def record(self, latency, found, active=True):
+        """
+        Add one processed frame.
+
+        Args:
+            latency (float): Decode time in seconds
+            found (bool): At least one code was decoded
+            active (bool): The scene changed (False for frames skipped as static)
+
+        Returns:
+            bool: True if the level changed; apply ``scale`` to the stream
+        """
+        self._frames += 1
+        self._latency += latency
+        self._hits += bool(found)
+        if active:
+            self._active += 1
+            self._active_hits += bool(found)
+        if self._frames < self.window:
+            return False
+        return self._evaluate()
+
+    def _evaluate(self):
+        stats = AdaptiveStats(
+            frames=self._frames,
+            hit_rate=self._hits / self._frames,
+            mean_latency=self._latency / self._frames,
+            drop_ratio=self._dropped / self._seen if self._seen else 0.0,
+            active_ratio=self._active / self._frames,
+        )
+        active_hit_rate = self._active_hits / self._active if self._active else 1.0
+        self.last_stats = stats
+        self._reset_window()
+        self._windows_at_level += 1
+
+        behind = stats.mean_latency > self.latency_budget or stats.drop_ratio > self.max_drop_ratio
+        failing = stats.active_ratio >= self.idle_ratio and active_hit_rate < self.min_hit_rate
+        easy = stats.active_ratio < self.idle_ratio or stats.hit_rate >= self.easy_hit_rate
+
+        if behind:
+            return self._set_level(self.level + 1)
+        if failing:
+            if self.level > 0:
+                self._failed_level = self.level
+                self._hold = min(self._hold * 2, 64)
+            return self._set_level(self.level - 1)
+        if easy and self._windows_at_level >= (self._hold if self.level + 1 == self._failed_level else 1):
+            return self._set_level(self.level + 1)
+        return False
+
+    def _set_level(self, level):
+        level = min(max(level, 0), len(self.levels) - 1)
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes += 1
+        self._windows_at_level = 0
+        return True
@@ -0,0 +1,188 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from oakd_lite_camera import OakDLiteCamera
+from wlkata_controller import CompletionPoller, WlkataRobotController, Motion, PositionMode
+
+
+class AsyncWlkataRobotController:
+    """asyncio front-end for WlkataRobotController.
+
+    All serial I/O runs on one dedicated worker thread, so calls never block
+    the event loop and never interleave on the port. Moves are sent without
+    blocking and completion is awaited by polling the status from the loop,
+    which leaves the serial thread free for other requests between polls.
+    """
+
+    def __init__(self, port="COM3", baudrate=115200, timeout=1):
+        """
+        Initialize the async controller. Call ``connect()`` (or use
+        ``async with``) before sending commands.
+
+        Args:
+            port (str): Serial port of the robot
+            baudrate (int): Serial baud rate
+            timeout (float): Serial read timeout in seconds
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.robot = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wlkata-serial")
+
+    async def _call(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def connect(self):
+        """Open the serial connection on the worker thread."""
+        self.robot = await self._call(WlkataRobotController, self.port, self.baudrate, self.timeout)
+        return self.robot.mirobot is not None
+
+    async def status(self):
+        """Current controller status dictionary."""
+        return await self._call(self.robot.status)
+
+    async def wait_idle(self, timeout=30, poll_interval=0.01, max_poll_interval=0.05, start_grace=0.2):
+        """
+        Await the arm reporting Idle.
+
+        Uses the same CompletionPoller as ``wait_for_completion``, but sleeps
+        on the event loop between polls, so the serial worker stays free for
+        other calls while the arm moves.
+
+        Returns:
+            bool: True if the robot reported Idle, False on timeout
+        """
+        poller = CompletionPoller(timeout, poll_interval, max_poll_interval, start_grace)
+        while True:
+            done = poller.update(await self.status())
+            if done:
+                self.robot.metrics.observe("motion_completion_seconds", poller.elapsed)
+                return True
+            if done is False:
+                print("Timeout waiting for completion.")
+                return False
+            await asyncio.sleep(poller.backoff())
+
+    async def home(self, timeout=60):
+        """Home the robot and await completion."""
+        await self._call(self.robot.home, wait=False)
+        return await self.wait_idle(timeout)
+
+    async def move_joints(self, angles, mode=PositionMode.ABSOLUTE, timeout=30):
+        """Move to joint angles and await completion."""
+        await self._call(self.robot.set_joint_angles, list(angles), mode, wait=False)
+        return await self.wait_idle(timeout)
+
+    async def move_to(self, coordinates, motion=Motion.LINEAR_MOVEMENT, mode=PositionMode.ABSOLUTE, timeout=30):
+        """Move to cartesian coordinates and await completion."""
+        await self._call(self.robot.set_coordinates, list(coordinates), motion, mode, wait=False)
+        return await self.wait_idle(timeout)
+
+    async def pump(self, state, timeout=5):
+        """Switch the pump and await completion."""
+        await self._call(self.robot.set_pump, state, wait=False)
+        return await self.wait_idle(timeout)
+
+    async def close(self):
+        """Close the serial connection and stop the worker thread."""
+        if self.robot is not None:
+            await self._call(self.robot.disconnect)
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        """Async context manager entry point."""
+        if not await self.connect():
+            raise Exception("Failed to connect to the robot.")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit point."""
+        await self.close()
+
+
+class AsyncOakDLiteCamera:
+    """asyncio front-end for OakDLiteCamera in threaded capture mode.
+
+    ``frames()`` is an async iterator over (frame, sequence_number, timestamp)
+    tuples. Frames are views into the capture ring and stay valid until
+    ``ring_size - 1`` newer frames have arrived.
+    """
+
+    def __init__(self, preview_size=(640, 480), fps=30, ring_size=4):
+        """
+        Initialize the async camera.
+
+        Args:
+            preview_size (tuple): Camera preview resolution (width, height)
+            fps (int): Frames per second
+            ring_size (int): Number of buffers in the capture ring
+        """
+        self.camera = OakDLiteCamera(preview_size=preview_size, fps=fps, threaded=True, ring_size=ring_size)
+
+    async def start(self):
+        """Boot the device and start capturing (device boot runs off the loop)."""
+        await asyncio.get_running_loop().run_in_executor(None, self.camera.start_stream)
+        return self.camera.running
+
+    async def get_latest(self, timeout=1.0):
+        """Await a frame newer than the last one returned (None on timeout)."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.camera.get_latest, timeout)
+
+    async def frames(self, timeout=1.0):
+        """Yield new frames until the camera stops.
+
+        Raises RuntimeError if the capture thread dies while the camera is
+        still marked as running, instead of waiting for frames forever.
+        """
+        while self.camera.running:
+            latest = await self.get_latest(timeout)
+            if latest is not None:
+                yield latest
+            elif self.camera.running and not self._capturing():
+                raise RuntimeError("Camera capture thread stopped")
+
+    def _capturing(self):
+        thread = self.camera.capture_thread
+        return thread is not None and thread.is_alive()
+
+    async def stop(self):
+        """Stop capturing and close the device."""
+        await asyncio.get_running_loop().run_in_executor(None, self.camera.stop_stream)
+
+    async def __aenter__(self):
+        """Async context manager entry point."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit point."""
+        await self.stop()
+
+
+if __name__ == "__main__":
+    from qr_tracking import decode_qr
+
+    async def scan(camera, found):
+        async for frame, sequence_number, timestamp in camera.frames():
+            codes = decode_qr(frame)
+            if codes:
+                found.put_nowait(codes[0].data)
+
+    async def main():
+        # replace COM3 and baudrate with your actual settings
+        async with AsyncWlkataRobotController(port="COM3") as robot, \
+                AsyncOakDLiteCamera(preview_size=(640, 480), fps=30) as camera:
+            found = asyncio.Queue()
+            scanner = asyncio.create_task(scan(camera, found))
+
+            # Homing and scanning overlap on the same event loop
+            await robot.home()
+            label = await found.get()
+            print(f"Scanned: {label}")
+            await robot.move_joints([45, -15, 30, 0, 0, 0])
+            await robot.move_to([150, 50, 50, 0, 0, 0])
+            scanner.cancel()
+
+    asyncio.run(main())
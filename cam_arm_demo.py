@@ -6,6 +6,7 @@ import psutil
 from wlkata_controller import WlkataRobotController, PositionMode, Motion
 from OpenCV_depth_cam.oakd_lite_camera import OakDLiteCamera
 from OpenCV_depth_cam.oakd_qr_code_reader import OakDQRCodeReader
+from OpenCV_depth_cam.oakd_device_manager import OakDDeviceManager
 
 
 
@@ -14,11 +15,15 @@ def main():
     # Initialize devices
     # replace COM3 and baudrate with your actual settings
     robot = WlkataRobotController(port="COM3", baudrate=115200, timeout=1)
-    camera = OakDLiteCamera(preview_size=(640, 480), fps=15)  # Lower FPS for bandwidth
+
+    # Camera and scanner share one pipeline, so the device boots only once
+    device_manager = OakDDeviceManager()
+    camera = OakDLiteCamera(preview_size=(640, 480), fps=30, device_manager=device_manager)
+    scanner = OakDQRCodeReader(preview_size=(640, 480), fps=30, device_manager=device_manager)
 
     robot.home()
 
-    with OakDQRCodeReader(preview_size=(640, 480), fps=30) as scanner:
+    with device_manager, scanner:
         # Scan with display window
         qr_data = scanner.read_qr_code(display=True)
         if qr_data:
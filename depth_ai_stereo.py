@@ -1,9 +1,16 @@
+import time
 import cv2
 import depthai as dai
 import numpy as np
+from depth_regions import DepthRegionStats
+from depth_visualizer import DepthColorizer
+from display_sink import DisplaySink
+from instrumentation import shared_metrics
+from point_cloud import PointCloudGenerator
 
 class DepthAIStereoDepth:
-    def __init__(self, resolution=400, extended_disparity=True, median_filter=True):
+    def __init__(self, resolution=400, extended_disparity=True, median_filter=True, device_manager=None,
+                 frame_pool=None, metrics=None):
         """
         Initialize DepthAI stereo depth pipeline.
         
@@ -11,8 +18,15 @@ class DepthAIStereoDepth:
             resolution (int): Camera resolution (400 or 800 pixels)
             extended_disparity (bool): Enable extended disparity for longer range
             median_filter (bool): Enable median filtering for noise reduction
+            device_manager (OakDDeviceManager): Share one device with other
+                streams instead of opening a device of its own
+            frame_pool (FramePool): Read depth as a view of the frame data
+                instead of copying it
+            metrics (Metrics): Latency histograms (default: the shared,
+                normally disabled registry)
         """
         self.resolution = self._get_resolution(resolution)
+        self.frame_size = (1280, 800) if resolution == 800 else (640, 400)
         self.extended_disparity = extended_disparity
         self.median_filter = median_filter
         self.pipeline = None
@@ -20,6 +34,15 @@ class DepthAIStereoDepth:
         self.depth_queue = None
         self.depth_frame = None
         self.running = False
+        self.region_stats = DepthRegionStats()
+        self.point_cloud = None
+        self.colorizer = DepthColorizer(colormap=cv2.COLORMAP_TURBO)
+        self.device_manager = device_manager
+        self.stream_name = "depth"
+        self.frame_pool = frame_pool
+        self.metrics = metrics if metrics is not None else shared_metrics()
+        if device_manager is not None:
+            self.create_pipeline()
 
     def _get_resolution(self, resolution):
         """Convert numeric resolution to DepthAI enum."""
@@ -30,7 +53,12 @@ class DepthAIStereoDepth:
         return resolutions.get(resolution, dai.MonoCameraProperties.SensorResolution.THE_400_P)
 
     def create_pipeline(self):
-        """Create and configure the DepthAI pipeline."""
+        """Create and configure the DepthAI pipeline (or add depth to the shared one)."""
+        if self.device_manager is not None:
+            stereo = self.device_manager.stereo_depth(self.resolution, self.extended_disparity, self.median_filter)
+            self.stream_name = self.device_manager.add_output("depth", stereo.depth)
+            return
+
         self.pipeline = dai.Pipeline()
 
         # Create stereo depth node
@@ -66,40 +94,134 @@ class DepthAIStereoDepth:
             distance = self.depth_frame[y, x] / 1000.0  # Convert mm to meters
             print(f"Depth at ({x}, {y}): {distance:.2f} meters")
 
-    def start(self):
-        """Start the depth stream with interactive visualization."""
-        try:
+    def start_stream(self):
+        """Start the depth stream without any visualization."""
+        if self.device_manager is not None:
+            self.device = self.device_manager.start()
+        else:
             self.create_pipeline()
             self.device = dai.Device(self.pipeline)
-            self.depth_queue = self.device.getOutputQueue(name="depth", maxSize=1, blocking=False)
-            self.running = True
+        self.depth_queue = self.device.getOutputQueue(name=self.stream_name, maxSize=1, blocking=False)
+        self.running = True
 
-            cv2.namedWindow("Depth Image")
-            cv2.setMouseCallback("Depth Image", self._mouse_callback)
+    def get_depth_frame(self):
+        """Block until the next depth frame arrives.
+        
+        Returns:
+            numpy.ndarray: uint16 depth frame in millimetres, None if not running
+        """
+        if not self.running:
+            return None
+        wait_start = time.perf_counter()
+        img_frame = self.depth_queue.get()
+        self.metrics.observe_frame("depth", img_frame, wait_start, dai.Clock.now)
+        if self.frame_pool is not None:
+            self.depth_frame = self.frame_pool.depth(img_frame)
+        else:
+            self.depth_frame = img_frame.getFrame()
+        return self.depth_frame
+
+    def _current_region_stats(self):
+        """Integral images for the current depth frame, rebuilt only when the frame changes."""
+        if self.region_stats.depth is not self.depth_frame:
+            self.region_stats.update(self.depth_frame)
+        return self.region_stats
+
+    def query_regions(self, boxes):
+        """
+        Depth statistics for many rectangles of the current frame, O(1) per box.
+        
+        Args:
+            boxes (array-like): (N, 4) boxes as (x, y, width, height) in pixels
+            
+        Returns:
+            dict: 'count', 'mean' and 'std' arrays (millimetres, NaN where a
+            box has no valid depth)
+        """
+        return self._current_region_stats().query(boxes)
+
+    def query_region_extrema(self, boxes):
+        """
+        Minimum and maximum valid depth for many rectangles of the current frame.
+        
+        Args:
+            boxes (array-like): (N, 4) boxes as (x, y, width, height) in pixels
+            
+        Returns:
+            tuple: (min, max) arrays in millimetres, 0 where a box has no valid depth
+        """
+        return self._current_region_stats().extrema(boxes)
+
+    def query_region_medians(self, boxes, samples=16):
+        """
+        Robust (median) depth for many rectangles of the current frame in one pass.
+        
+        Args:
+            boxes (array-like): (N, 4) boxes as (x, y, width, height) in pixels
+            samples (int): Grid points per box side
+            
+        Returns:
+            numpy.ndarray: Median depth per box in millimetres, NaN where invalid
+        """
+        return self._current_region_stats().medians(boxes, samples)
+
+    def get_point_cloud(self, stride=1, roi=None, voxel_size=None):
+        """
+        Point cloud of the current depth frame in the camera frame.
+        
+        Args:
+            stride (int): Keep every ``stride``-th pixel in both directions
+            roi (tuple): Optional (x, y, width, height) region of the frame
+            voxel_size (float): Optional voxel grid size in metres for downsampling
+            
+        Returns:
+            numpy.ndarray: (N, 3) float32 XYZ in metres for pixels with valid depth
+        """
+        if self.point_cloud is None:
+            # Depth is aligned to the (rectified) right camera by default
+            width, height = self.frame_size
+            intrinsics = self.device.readCalibration().getCameraIntrinsics(
+                dai.CameraBoardSocket.RIGHT, width, height)
+            self.point_cloud = PointCloudGenerator(intrinsics, width, height)
+        return self.point_cloud.points(self.depth_frame, stride, roi, voxel_size)
+
+    def start(self, max_fps=30, headless=False):
+        """
+        Start the depth stream with interactive visualization.
+        
+        The window is drawn from a DisplaySink thread, so rendering never
+        delays the depth queue.
+        
+        Args:
+            max_fps (float): Maximum redraw rate of the window
+            headless (bool): Run the loop without any OpenCV window
+        """
+        sink = DisplaySink(max_fps=max_fps, headless=headless, metrics=self.metrics, stream="depth")
+        try:
+            self.start_stream()
+            sink.set_mouse_callback("Depth Image", self._mouse_callback)
 
             while self.running:
-                depth_data = self.depth_queue.get()
-                self.depth_frame = depth_data.getFrame()
+                self.get_depth_frame()
 
-                # Normalize and colorize for visualization
-                depth_vis = cv2.normalize(self.depth_frame, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-                depth_colored = cv2.applyColorMap(depth_vis, cv2.COLORMAP_TURBO)
+                # Colorize over a fixed range through the lookup table
+                depth_colored = self.colorizer.colorize(self.depth_frame)
 
-                cv2.imshow("Depth Image", depth_colored)
-                if cv2.waitKey(1) == ord('q'):
+                sink.show("Depth Image", depth_colored)
+                if sink.poll_key() == ord('q'):
                     break
 
         except Exception as e:
             print(f"Error: {e}")
         finally:
+            sink.close()
             self.stop()
 
     def stop(self):
         """Stop the pipeline and clean up resources."""
         self.running = False
-        if hasattr(self, 'device') and self.device:
-            self.device.close()
-        cv2.destroyAllWindows()
+        if hasattr(self, 'device') and self.device and self.device_manager is None:
+            self.device.close()  # A shared device is closed by its manager
 
     def __enter__(self):
         """Context manager entry point."""
@@ -113,4 +235,21 @@ class DepthAIStereoDepth:
 if __name__ == "__main__":
     # Example usage
     with DepthAIStereoDepth(resolution=400) as depth_sensor:
-        depth_sensor.start()
\ No newline at end of file
+        depth_sensor.start()
+
+    # Region queries for grasp targeting, no display
+    with DepthAIStereoDepth(resolution=400) as depth_sensor:
+        depth_sensor.start_stream()
+        depth_sensor.get_depth_frame()
+        boxes = [(300, 180, 40, 40), (100, 100, 80, 60)]
+        stats = depth_sensor.query_regions(boxes)
+        medians = depth_sensor.query_region_medians(boxes)
+        for box, mean, count, median in zip(boxes, stats['mean'], stats['count'], medians):
+            print(f"Box {box}: mean {mean:.0f} mm, median {median:.0f} mm over {count} valid pixels")
+
+    # Point cloud for pick planning, every 2nd pixel, 5 mm voxels
+    with DepthAIStereoDepth(resolution=400) as depth_sensor:
+        depth_sensor.start_stream()
+        depth_sensor.get_depth_frame()
+        points = depth_sensor.get_point_cloud(stride=2, voxel_size=0.005)
+        print(f"Point cloud: {len(points)} points")
\ No newline at end of file
@@ -0,0 +1,264 @@
+import cv2
+import numpy as np
+
+# Persistency modes of the temporal filter, named as in
+# dai.StereoDepthConfig.PostProcessing.TemporalFilter.PersistencyMode.
+# Each maps to (frames looked at, valid frames required).
+PERSISTENCY_MODES = {
+    "PERSISTENCY_OFF": None,
+    "VALID_8_OUT_OF_8": (8, 8),
+    "VALID_2_IN_LAST_3": (3, 2),
+    "VALID_2_IN_LAST_4": (4, 2),
+    "VALID_2_OUT_OF_8": (8, 2),
+    "VALID_1_IN_LAST_2": (2, 1),
+    "VALID_1_IN_LAST_5": (5, 1),
+    "VALID_1_IN_LAST_8": (8, 1),
+    "PERSISTENCY_INDEFINITELY": (8, 0),
+}
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Value of invalid pixels inside the spatial filter: further from any depth than
+# any delta, so the edge test alone keeps holes out of the smoothing
+_INVALID = -1.0e6
+
+
+class SpatialFilterConfig:
+    """Edge-preserving spatial filter settings (same names as DepthAI)."""
+
+    def __init__(self):
+        self.enable = False
+        self.holeFillingRadius = 2  # Pixels of zero depth filled from the left/top neighbour
+        self.alpha = 0.5  # Weight of the current pixel: 1 = no filtering, lower = smoother
+        self.delta = 50  # Depth step (mm) treated as an edge and not smoothed across
+        self.numIterations = 1
+
+
+class TemporalFilterConfig:
+    """Temporal filter settings (same names as DepthAI)."""
+
+    def __init__(self):
+        self.enable = False
+        self.persistencyMode = "VALID_2_IN_LAST_3"
+        self.alpha = 0.4
+        self.delta = 50  # Depth change (mm) treated as motion and not smoothed
+
+
+class SpeckleFilterConfig:
+    """Speckle filter settings (same names as DepthAI)."""
+
+    def __init__(self):
+        self.enable = False
+        self.speckleRange = 50  # Largest blob size (pixels) removed as a speckle
+        self.differenceThreshold = 50  # Depth step (mm) separating blobs
+
+
+class PostProcessingConfig:
+    """Host-side mirror of ``StereoDepthConfig.postProcessing``."""
+
+    def __init__(self):
+        self.median = 0  # Kernel size: 0 (off), 3 or 5
+        self.spatialFilter = SpatialFilterConfig()
+        self.temporalFilter = TemporalFilterConfig()
+        self.speckleFilter = SpeckleFilterConfig()
+
+    @classmethod
+    def from_device_config(cls, device_config):
+        """
+        Copy settings from a DepthAI ``RawStereoDepthConfig``.
+
+        Args:
+            device_config: ``stereo.initialConfig.get()`` from a DepthAI pipeline
+
+        Returns:
+            PostProcessingConfig: Host config with the same filter settings
+        """
+        config = cls()
+        post = device_config.postProcessing
+        spatial = post.spatialFilter
+        config.spatialFilter.enable = spatial.enable
+        config.spatialFilter.holeFillingRadius = spatial.holeFillingRadius
+        config.spatialFilter.alpha = spatial.alpha
+        config.spatialFilter.delta = spatial.delta
+        config.spatialFilter.numIterations = spatial.numIterations
+        temporal = post.temporalFilter
+        config.temporalFilter.enable = temporal.enable
+        config.temporalFilter.persistencyMode = temporal.persistencyMode.name
+        config.temporalFilter.alpha = temporal.alpha
+        config.temporalFilter.delta = temporal.delta
+        speckle = post.speckleFilter
+        config.speckleFilter.enable = speckle.enable
+        config.speckleFilter.speckleRange = speckle.speckleRange
+        # Older DepthAI releases have no differenceThreshold; keep the default there
+        config.speckleFilter.differenceThreshold = getattr(speckle, "differenceThreshold",
+                                                           config.speckleFilter.differenceThreshold)
+        # medianBlur on uint16 only goes up to 5x5, so 7x7 falls back to 5x5
+        median = str(post.median)
+        config.median = 3 if "3x3" in median else 5 if ("5x5" in median or "7x7" in median) else 0
+        return config
+
+
+class HostDepthFilterChain:
+    """Vectorized host implementation of the DepthAI depth post-processing filters.
+
+    Filters run in the device's default order (median, speckle, spatial,
+    temporal) on uint16 depth in millimetres, with zero meaning invalid. All
+    working buffers are allocated once per resolution and the temporal state
+    is carried from one ``process()`` call to the next.
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize the filter chain.
+
+        Args:
+            config (PostProcessingConfig): Filter settings (defaults: all off)
+        """
+        self.config = config or PostProcessingConfig()
+        self._shape = None
+
+    def _allocate(self, shape):
+        height, width = shape
+        self._shape = shape
+        self._median = np.empty(shape, np.uint16)
+        self._speckle = np.empty(shape, np.int16)
+        self._work = np.empty(shape, np.float32)
+        self._work_t = np.empty((width, height), np.float32)
+        # Spatial pass weights and hole sources, for the frame and its transpose
+        self._weights = {s: np.empty(s, np.float32) for s in (shape, (width, height))}
+        self._last_valid = {s: np.empty(s, np.int32) for s in (shape, (width, height))}
+        self._difference = np.empty((2, max(shape)), np.float32)
+        self._smooth = np.empty(max(shape), bool)
+        self._out = np.empty(shape, np.uint16)
+        self.reset()
+
+    def reset(self):
+        """Drop the temporal history (e.g. after the camera moves)."""
+        if self._shape is None:
+            return
+        self._previous = np.zeros(self._shape, np.float32)
+        self._history = np.zeros(self._shape, np.uint8)
+
+    def process(self, depth):
+        """
+        Filter one depth frame.
+
+        The returned array is reused by the next call; copy it to keep it.
+
+        Args:
+            depth (numpy.ndarray): uint16 depth frame in millimetres
+
+        Returns:
+            numpy.ndarray: Filtered uint16 depth frame
+        """
+        if depth.shape != self._shape:
+            self._allocate(depth.shape)
+        config = self.config
+
+        if config.median in (3, 5):
+            depth = cv2.medianBlur(depth, config.median, dst=self._median)
+        if config.speckleFilter.enable:
+            depth = self._speckle_filter(depth)
+
+        np.copyto(self._work, depth)
+        if config.spatialFilter.enable:
+            self._spatial_filter(self._work)
+        if config.temporalFilter.enable:
+            self._temporal_filter(self._work)
+
+        np.copyto(self._out, self._work, casting='unsafe')
+        return self._out
+
+    def _speckle_filter(self, depth):
+        settings = self.config.speckleFilter
+        # filterSpeckles works on int16; depth beyond 32.7 m is clamped
+        np.minimum(depth, 32767, out=self._median)
+        np.copyto(self._speckle, self._median, casting='unsafe')
+        cv2.filterSpeckles(self._speckle, 0, int(settings.speckleRange),
+                           int(settings.differenceThreshold))
+        return self._speckle.view(np.uint16)
+
+    def _spatial_filter(self, work):
+        settings = self.config.spatialFilter
+        np.copyto(work, _INVALID, where=work <= 0)
+        for _ in range(max(1, settings.numIterations)):
+            # Horizontal passes run on the transposed copy so each step is a contiguous row
+            np.copyto(self._work_t, work.T)
+            self._recursive_pass(self._work_t, settings)
+            np.copyto(work, self._work_t.T)
+            self._recursive_pass(work, settings)
+        np.maximum(work, 0, out=work)
+
+    def _recursive_pass(self, lines, settings):
+        """One forward and one backward recursive smoothing pass along axis 0.
+
+        The recursion runs a whole line per step, five vector operations each.
+        Holes hold ``_INVALID`` so the delta test alone keeps them apart from
+        valid depth; hole filling is set up per pass by ``_fill_holes``.
+        """
+        width = lines.shape[1]
+        difference, magnitude = self._difference[0, :width], self._difference[1, :width]
+        smooth = self._smooth[:width]
+        for view in (lines, lines[::-1]):
+            weights = self._fill_holes(view, settings)
+            for i in range(1, view.shape[0]):
+                current = view[i]
+                np.subtract(view[i - 1], current, out=difference)
+                np.abs(difference, out=magnitude)
+                np.less(magnitude, settings.delta, out=smooth)
+                np.multiply(difference, weights[i], out=difference)
+                np.add(current, difference, out=current, where=smooth)
+
+    def _fill_holes(self, lines, settings):
+        """
+        Seed the holes a pass along axis 0 fills and return its blend weights.
+
+        The first holeFillingRadius holes after a valid pixel take that pixel's
+        value and weight 1. Smoothing moves the valid pixel by less than delta,
+        so each of them then copies the previous result, as filling them one
+        step at a time would. Every other pixel blends by 1 - alpha.
+
+        Returns:
+            np.ndarray: per-pixel weights shaped like ``lines``, or one weight
+            per line when there is nothing to fill
+        """
+        radius = int(settings.holeFillingRadius)
+        holes = np.flatnonzero(lines < 0) if radius else ()
+        if not len(holes):
+            return np.full(lines.shape[0], 1.0 - settings.alpha, np.float32)
+        # Row of the last valid pixel at or before each pixel, -1 if none
+        last_valid = self._last_valid[lines.shape]
+        last_valid.fill(-1)
+        np.copyto(last_valid, np.arange(lines.shape[0], dtype=np.int32)[:, None], where=lines >= 0)
+        np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+        rows, columns = np.divmod(holes, lines.shape[1])
+        sources = last_valid[rows, columns]
+        bridge = (sources >= 0) & (rows - sources <= radius)
+        rows, columns, sources = rows[bridge], columns[bridge], sources[bridge]
+        lines[rows, columns] = lines[sources, columns]
+        weights = self._weights[lines.shape]
+        weights.fill(1.0 - settings.alpha)
+        weights[rows, columns] = 1.0
+        return weights
+
+    def _temporal_filter(self, work):
+        settings = self.config.temporalFilter
+        previous = self._previous
+        valid = work > 0
+
+        # Shift the per-pixel validity history and record the current frame in bit 0
+        np.left_shift(self._history, 1, out=self._history)
+        self._history |= valid
+
+        smooth = valid & (previous > 0) & (np.abs(work - previous) < settings.delta)
+        np.copyto(work, settings.alpha * work + (1 - settings.alpha) * previous, where=smooth)
+
+        mode = getattr(settings.persistencyMode, "name", settings.persistencyMode)
+        persistency = PERSISTENCY_MODES[mode]
+        if persistency is not None:
+            window, required = persistency
+            recent = _POPCOUNT[self._history & ((1 << window) - 1)]
+            keep = ~valid & (previous > 0) & (recent >= required)
+            np.copyto(work, previous, where=keep)
+
+        np.copyto(previous, work)
@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+
+
+class DepthColorizer:
+    """Colorize uint16 depth frames through a precomputed 65536-entry lookup table.
+
+    Every possible depth value maps to a BGR colour for a fixed range, so a
+    frame costs one table lookup into a reused output buffer instead of a
+    normalize pass, an applyColorMap pass and two allocations. Colours stay
+    stable from frame to frame. With ``adapt_rate`` set the range follows the
+    scene slowly and the table is rebuilt only when the range has moved.
+    """
+
+    def __init__(self, min_depth=200, max_depth=5000, colormap=cv2.COLORMAP_TURBO,
+                 adapt_rate=0.0, invalid_color=(0, 0, 0)):
+        """
+        Initialize the colorizer.
+
+        Args:
+            min_depth (int): Depth in millimetres mapped to the first colour
+            max_depth (int): Depth in millimetres mapped to the last colour
+            colormap (int): OpenCV colormap, e.g. cv2.COLORMAP_TURBO
+            adapt_rate (float): 0 keeps the range fixed; otherwise the weight
+                (0..1) given to each new 2nd/98th percentile estimate
+            invalid_color (tuple): BGR colour for zero (invalid) depth
+        """
+        self.min_depth = float(min_depth)
+        self.max_depth = float(max_depth)
+        self.colormap = colormap
+        self.adapt_rate = adapt_rate
+        self.invalid_color = invalid_color
+        self.adapt_interval = 10  # Frames between range estimates
+        self.lut = None
+        self._lut_range = None
+        self._frame_count = 0
+        self._out = None
+        self._build_lut()
+
+    def _build_lut(self):
+        span = max(self.max_depth - self.min_depth, 1.0)
+        values = np.arange(65536, dtype=np.float32)
+        index = np.clip((values - self.min_depth) * (255.0 / span), 0, 255).astype(np.uint8)
+        palette = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(256, 1), self.colormap)
+        self.lut = palette.reshape(256, 3)[index]
+        self.lut[0] = self.invalid_color
+        self._lut_range = (self.min_depth, self.max_depth)
+
+    def set_range(self, min_depth, max_depth):
+        """Change the depth range and rebuild the lookup table."""
+        self.min_depth = float(min_depth)
+        self.max_depth = float(max_depth)
+        self._build_lut()
+
+    def _adapt(self, depth):
+        samples = depth[::8, ::8]
+        samples = samples[samples > 0]
+        if samples.size == 0:
+            return
+        low, high = np.percentile(samples, (2, 98))
+        rate = self.adapt_rate
+        self.min_depth += rate * (low - self.min_depth)
+        self.max_depth += rate * (high - self.max_depth)
+
+        # Only rebuild once the range has drifted by more than 2% of its span
+        old_min, old_max = self._lut_range
+        tolerance = 0.02 * max(old_max - old_min, 1.0)
+        if abs(self.min_depth - old_min) > tolerance or abs(self.max_depth - old_max) > tolerance:
+            self._build_lut()
+
+    def colorize(self, depth):
+        """
+        Colorize a depth frame.
+
+        The returned image is reused by the next call; copy it to keep it.
+
+        Args:
+            depth (numpy.ndarray): uint16 depth frame in millimetres
+
+        Returns:
+            numpy.ndarray: (height, width, 3) uint8 BGR image
+        """
+        if self.adapt_rate > 0:
+            if self._frame_count % self.adapt_interval == 0:
+                self._adapt(depth)
+            self._frame_count += 1
+
+        shape = depth.shape + (3,)
+        if self._out is None or self._out.shape != shape:
+            self._out = np.empty(shape, np.uint8)
+        np.take(self.lut, depth, axis=0, out=self._out, mode='clip')
+        return self._out
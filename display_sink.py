@@ -0,0 +1,150 @@
+import threading
+import time
+import cv2
+import numpy as np
+from instrumentation import shared_metrics
+
+
+class DisplaySink:
+    """Show frames from a GUI thread so processing loops never wait on HighGUI.
+
+    ``show()`` only stores the frame as the newest one for its window and
+    returns; a frame that is replaced before it was drawn is dropped. The
+    GUI thread redraws every window with a new frame at most ``max_fps``
+    times per second and polls the keyboard. With ``headless=True`` no
+    OpenCV HighGUI function is ever called, so the same code runs on
+    machines without a display (or with opencv-python-headless).
+    """
+
+    def __init__(self, max_fps=30, headless=False, copy=True, metrics=None, stream="display"):
+        """
+        Initialize the sink and start the GUI thread.
+
+        Args:
+            max_fps (float): Maximum redraw rate
+            headless (bool): Count frames but never open windows
+            copy (bool): Copy frames on ``show()``; needed when the caller
+                reuses the buffer (ring or pool frames)
+            metrics (Metrics): Records ``display_seconds`` for every redraw
+                (imshow plus waitKey) on the GUI thread (default: the shared
+                registry)
+            stream (str): Stream label of the recorded durations
+        """
+        self.max_fps = max_fps
+        self.headless = headless
+        self.copy = copy
+        self.metrics = metrics if metrics is not None else shared_metrics()
+        self.stream = stream
+        self.shown = 0
+        self.drawn = 0
+        self.dropped = 0
+        self.closed = False
+        self._frames = {}  # window name -> [back buffer, is new, front buffer]
+        self._mouse_callbacks = {}
+        self._windows = set()
+        self._keys = []
+        self._cond = threading.Condition()
+        self._thread = None
+        if not headless:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def show(self, window_name, frame):
+        """
+        Queue a frame for a window without waiting for it to be drawn.
+
+        Args:
+            window_name (str): Window title
+            frame (numpy.ndarray): Image to display
+        """
+        self.shown += 1
+        if self.headless or self.closed:
+            return
+        with self._cond:
+            entry = self._frames.setdefault(window_name, [None, False, None])  # [back, new, front]
+            if entry[1]:
+                self.dropped += 1  # Previous frame was never drawn
+            if not self.copy:
+                entry[0] = frame
+            elif entry[0] is None or entry[0].shape != frame.shape or entry[0].dtype != frame.dtype:
+                entry[0] = frame.copy()
+            else:
+                np.copyto(entry[0], frame)
+            entry[1] = True
+            self._cond.notify()
+
+    def set_mouse_callback(self, window_name, callback):
+        """Register a mouse callback; it is installed from the GUI thread."""
+        if self.headless:
+            return
+        with self._cond:
+            self._mouse_callbacks[window_name] = callback
+
+    def poll_key(self):
+        """
+        Returns:
+            int: Oldest key pressed since the last call, -1 if none
+        """
+        with self._cond:
+            return self._keys.pop(0) if self._keys else -1
+
+    def _run(self):
+        interval = 1.0 / self.max_fps if self.max_fps else 0.0
+        next_draw = time.perf_counter()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self.closed or any(entry[1] for entry in self._frames.values()),
+                                    timeout=0.05)
+                if self.closed:
+                    break
+                # Swap back and front buffers under the lock, draw outside of it
+                pending = []
+                for name, entry in self._frames.items():
+                    if entry[1]:
+                        entry[0], entry[2] = entry[2], entry[0]
+                        entry[1] = False
+                        pending.append((name, entry[2]))
+                callbacks = list(self._mouse_callbacks.items())
+            start = time.perf_counter()
+            for name, frame in pending:
+                if name not in self._windows:
+                    cv2.namedWindow(name)
+                    self._windows.add(name)
+                cv2.imshow(name, frame)
+                self.drawn += 1
+            for name, callback in callbacks:
+                if name in self._windows:
+                    cv2.setMouseCallback(name, callback)
+                    with self._cond:
+                        self._mouse_callbacks.pop(name, None)
+            key = cv2.waitKey(1)
+            if pending:
+                self.metrics.observe("display_seconds", time.perf_counter() - start, stream=self.stream)
+            if key != -1:
+                with self._cond:
+                    self._keys.append(key & 0xFF)
+            # Rate limit: frames arriving meanwhile replace each other
+            next_draw = max(next_draw + interval, time.perf_counter())
+            delay = next_draw - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if self._windows:
+            cv2.destroyAllWindows()
+            cv2.waitKey(1)
+
+    def close(self):
+        """Stop the GUI thread and close its windows."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close()
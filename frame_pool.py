@@ -0,0 +1,171 @@
+import gc
+import threading
+import cv2
+import numpy as np
+
+# ImgFrame types whose first plane is luminance
+_LUMA_TYPES = ("GRAY8", "RAW8", "NV12", "YUV420p")
+_PLANAR_COLOR_TYPES = ("BGR888p", "RGB888p")
+
+
+class FramePool:
+    """Recycled frame buffers for converting device frames without allocating.
+
+    ``ImgFrame.getCvFrame()`` allocates a new array for every planar to
+    interleaved conversion. The pool keeps a few preallocated buffers per
+    shape and dtype and hands them out round-robin, and the conversions write
+    into them with ``dst=``. A returned array stays valid until ``buffers``
+    further arrays of the same shape have been taken from the pool, across
+    every user of the pool; copy it to keep it longer.
+
+    ``planar()``, ``luma()`` and ``depth()`` return views of the frame data
+    and do not convert at all.
+    """
+
+    def __init__(self, buffers=8):
+        """
+        Initialize the pool.
+
+        Args:
+            buffers (int): Buffers kept per (shape, dtype), at least 2
+        """
+        self.buffers = max(2, buffers)
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.reuses = 0
+        self.conversions = 0
+        self._rings = {}
+        self._lock = threading.Lock()
+        self._gc_start = self._gc_collections()
+
+    @staticmethod
+    def _gc_collections():
+        return sum(generation['collections'] for generation in gc.get_stats())
+
+    def acquire(self, shape, dtype=np.uint8):
+        """
+        Next recycled buffer of the given shape and dtype.
+
+        Returns:
+            numpy.ndarray: Uninitialized buffer
+        """
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            ring = self._rings.setdefault(key, [[], 0])
+            buffers, position = ring
+            if len(buffers) < self.buffers:
+                buffer = np.empty(key[0], dtype=key[1])
+                buffers.append(buffer)
+                self.allocations += 1
+                self.allocated_bytes += buffer.nbytes
+                ring[1] = 0
+                return buffer
+            ring[1] = (position + 1) % len(buffers)
+            self.reuses += 1
+            return buffers[position]
+
+    def interleave(self, planar):
+        """
+        Planar (3, H, W) color to interleaved (H, W, 3) in a pooled buffer.
+        """
+        self.conversions += 1
+        _, height, width = planar.shape
+        return cv2.merge((planar[0], planar[1], planar[2]),
+                         dst=self.acquire((height, width, 3), planar.dtype))
+
+    def planar_to_gray(self, planar, rgb=False):
+        """
+        Luminance of planar (3, H, W) color in a pooled buffer, without interleaving.
+        """
+        self.conversions += 1
+        _, height, width = planar.shape
+        blue, red = (planar[2], planar[0]) if rgb else (planar[0], planar[2])
+        partial = cv2.addWeighted(blue, 0.114 / 0.701, planar[1], 0.587 / 0.701, 0.0,
+                                  dst=self.acquire((height, width), planar.dtype))
+        return cv2.addWeighted(partial, 0.701, red, 0.299, 0.0, dst=self.acquire((height, width), planar.dtype))
+
+    def to_gray(self, image):
+        """Interleaved BGR to grayscale in a pooled buffer (grayscale passes through)."""
+        if image.ndim == 2:
+            return image
+        self.conversions += 1
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self.acquire(image.shape[:2], image.dtype))
+
+    @staticmethod
+    def _frame_type(img_frame):
+        return img_frame.getType().name
+
+    def planar(self, img_frame):
+        """(3, H, W) view of a planar color ImgFrame, no conversion."""
+        return img_frame.getData().reshape(3, img_frame.getHeight(), img_frame.getWidth())
+
+    def luma(self, img_frame):
+        """
+        (H, W) luminance of an ImgFrame: a view for GRAY8/RAW8/NV12/YUV420p,
+        converted into a pooled buffer for color frames.
+        """
+        frame_type = self._frame_type(img_frame)
+        width, height = img_frame.getWidth(), img_frame.getHeight()
+        if frame_type in _LUMA_TYPES:
+            return img_frame.getData()[:width * height].reshape(height, width)
+        if frame_type in _PLANAR_COLOR_TYPES:
+            return self.planar_to_gray(self.planar(img_frame), rgb=frame_type.startswith("RGB"))
+        return self.to_gray(self.bgr(img_frame))
+
+    def bgr(self, img_frame):
+        """
+        Frame as OpenCV expects it, like ``getCvFrame()`` but into a pooled
+        buffer: planar color is interleaved, interleaved BGR and grayscale
+        frames are returned as views.
+        """
+        frame_type = self._frame_type(img_frame)
+        width, height = img_frame.getWidth(), img_frame.getHeight()
+        if frame_type == "BGR888p":
+            return self.interleave(self.planar(img_frame))
+        if frame_type == "BGR888i":
+            return img_frame.getData().reshape(height, width, 3)
+        if frame_type in ("GRAY8", "RAW8"):
+            return img_frame.getData().reshape(height, width)
+        return img_frame.getCvFrame()  # Anything else keeps the allocating path
+
+    def depth(self, img_frame):
+        """(H, W) uint16 view of a RAW16 depth/disparity ImgFrame."""
+        return img_frame.getData().view(np.uint16).reshape(img_frame.getHeight(), img_frame.getWidth())
+
+    def stats(self):
+        """
+        Returns:
+            dict: 'conversions', 'allocations', 'allocated_bytes', 'reuses',
+            'allocations_per_conversion', 'gc_collections' and
+            'gc_collections_per_conversion' since creation or ``reset_stats()``
+        """
+        conversions = max(self.conversions, 1)
+        collections = self._gc_collections() - self._gc_start
+        return {
+            'conversions': self.conversions,
+            'allocations': self.allocations,
+            'allocated_bytes': self.allocated_bytes,
+            'reuses': self.reuses,
+            'allocations_per_conversion': self.allocations / conversions,
+            'gc_collections': collections,
+            'gc_collections_per_conversion': collections / conversions,
+        }
+
+    def reset_stats(self):
+        """Restart the counters (the buffers are kept)."""
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.reuses = 0
+        self.conversions = 0
+        self._gc_start = self._gc_collections()
+
+
+_shared_pool = None
+
+
+def shared_frame_pool():
+    """The process-wide FramePool used by the camera classes."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = FramePool()
+    return _shared_pool
@@ -0,0 +1,276 @@
+import os
+import struct
+import time
+import numpy as np
+
+# File layout:
+#   <path>      fixed 4096-byte header followed by the raw frames back to back
+#   <path>.idx  one INDEX_DTYPE record (sequence number, timestamp) per frame
+MAGIC = b"OAKFRM01"
+HEADER_FORMAT = "<8s8sIIIIQI"  # magic, dtype, ndim, dim0, dim1, dim2, frame_count, chunk_frames
+HEADER_SIZE = 4096
+INDEX_DTYPE = np.dtype([("sequence_number", "<i8"), ("timestamp", "<f8")])
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(struct.calcsize(HEADER_FORMAT))
+    magic, dtype, ndim, dim0, dim1, dim2, frame_count, chunk_frames = struct.unpack(HEADER_FORMAT, raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a frame recording")
+    shape = (dim0, dim1, dim2)[:ndim]
+    return np.dtype(dtype.rstrip(b"\0").decode()), shape, frame_count, chunk_frames
+
+
+class FrameRecorder:
+    """Append frames of one stream (RGB or depth) to a memory-mapped recording.
+
+    The data file grows ``chunk_frames`` frames at a time and each chunk is
+    written through a memory map, so appending a frame is a single copy.
+    Sequence numbers and timestamps go to a small index file next to it.
+    """
+
+    def __init__(self, path, shape, dtype=np.uint8, chunk_frames=64):
+        """
+        Create a new recording, overwriting any existing file.
+
+        Args:
+            path (str): Recording file path
+            shape (tuple): Frame shape, e.g. (480, 640, 3) or (400, 640)
+            dtype: Frame dtype (uint8 for RGB, uint16 for depth)
+            chunk_frames (int): Frames added to the file each time it grows
+        """
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.chunk_frames = chunk_frames
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.count = 0
+        self._capacity = 0
+        self._chunk = None
+        self._file = open(path, "w+b")
+        self._index = open(path + ".idx", "wb")
+        self._write_header()
+
+    def _write_header(self):
+        dims = self.shape + (0,) * (3 - len(self.shape))
+        header = struct.pack(HEADER_FORMAT, MAGIC, self.dtype.str.encode(), len(self.shape),
+                             *dims, self.count, self.chunk_frames)
+        self._file.seek(0)
+        self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self._file.flush()
+
+    def _grow(self):
+        if self._chunk is not None:
+            # Windows cannot resize a file while a view of it is mapped
+            self._chunk.flush()
+            del self._chunk
+            self._chunk = None
+        start = self._capacity
+        self._capacity += self.chunk_frames
+        self._file.truncate(HEADER_SIZE + self._capacity * self.frame_bytes)
+        self._chunk = np.memmap(self._file, dtype=self.dtype, mode="r+",
+                                offset=HEADER_SIZE + start * self.frame_bytes,
+                                shape=(self.chunk_frames,) + self.shape)
+
+    def append(self, frame, sequence_number=-1, timestamp=None):
+        """
+        Append one frame.
+
+        Args:
+            frame (numpy.ndarray): Frame with the recording's shape
+            sequence_number (int): Device sequence number (-1 if unknown)
+            timestamp (float): Capture time in seconds (defaults to now)
+        """
+        if self.count == self._capacity:
+            self._grow()
+        self._chunk[self.count % self.chunk_frames] = frame
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._index.write(struct.pack("<qd", sequence_number, timestamp))
+        self.count += 1
+
+    def close(self):
+        """Flush the data, trim the unused part of the last chunk and finalize the header."""
+        if self._file.closed:
+            return
+        if self._chunk is not None:
+            self._chunk.flush()
+            del self._chunk
+            self._chunk = None
+        self._file.truncate(HEADER_SIZE + self.count * self.frame_bytes)
+        self._write_header()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close()
+
+
+class FrameReplay:
+    """Replay a recording through the same interface as the live camera classes.
+
+    Frames are zero-copy views into the memory-mapped file. With ``realtime``
+    set, playback follows the wall clock like a live camera: ``get_latest()``
+    returns the frame due now and skips the ones a slow consumer missed
+    (counted in ``dropped``). Otherwise every frame is returned, as fast as
+    they are asked for.
+    """
+
+    def __init__(self, path, realtime=True, loop=False):
+        """
+        Open a recording.
+
+        Args:
+            path (str): Recording file path
+            realtime (bool): Pace frames by their recorded timestamps
+            loop (bool): Start over after the last frame
+        """
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.dtype, self.shape, frame_count, _ = _read_header(path)
+        self.index = np.fromfile(path + ".idx", dtype=INDEX_DTYPE)
+        if frame_count == 0:
+            # Recorder did not close cleanly; trust the index and the data size
+            data_frames = (os.path.getsize(path) - HEADER_SIZE) // (int(np.prod(self.shape)) * self.dtype.itemsize)
+            frame_count = min(len(self.index), data_frames)
+        self.index = self.index[:frame_count]
+        if frame_count:
+            self.frames = np.memmap(path, dtype=self.dtype, mode="r", offset=HEADER_SIZE,
+                                    shape=(frame_count,) + self.shape)
+        else:
+            self.frames = np.empty((0,) + self.shape, self.dtype)  # Empty files cannot be mapped
+        self.position = 0
+        self.dropped = 0
+        self.running = False
+        self._start_time = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        """Frame ``i`` as a read-only view."""
+        return self.frames[i]
+
+    def find(self, timestamp):
+        """Index of the first frame captured at or after ``timestamp``."""
+        return int(np.searchsorted(self.index["timestamp"], timestamp))
+
+    def seek(self, position):
+        """Continue playback from frame ``position``."""
+        self.position = position
+        self._start_time = None
+
+    def start_stream(self):
+        """Start playback from the current position."""
+        self.running = len(self) > 0
+        self._start_time = None
+
+    def get_latest(self, timeout=None):
+        """
+        Frame newer than the last one returned, with its metadata.
+
+        In realtime mode this is the newest frame due at the current wall-clock
+        time, waiting for the next one if none is due yet, like
+        ``OakDLiteCamera.get_latest``. Otherwise it is simply the next frame.
+
+        Args:
+            timeout (float): Maximum time to wait for a frame in realtime mode,
+                None waits as long as needed
+
+        Returns:
+            tuple: (frame, sequence_number, timestamp), or None at the end or on timeout
+        """
+        if not self.running:
+            return None
+        if self.position >= len(self):
+            if not self.loop:
+                self.running = False
+                return None
+            self.seek(0)
+
+        if self.realtime:
+            timestamps = self.index["timestamp"]
+            if self._start_time is None:
+                self._start_time = (time.perf_counter(), timestamps[self.position])
+            wall_start, recorded_start = self._start_time
+            now = recorded_start + time.perf_counter() - wall_start
+            delay = timestamps[self.position] - now
+            if delay > 0:
+                if timeout is not None and delay > timeout:
+                    time.sleep(timeout)
+                    return None
+                time.sleep(delay)
+            else:
+                # Skip to the newest frame already due, as a live ring would
+                due = int(np.searchsorted(timestamps, now, side="right")) - 1
+                if due > self.position:
+                    self.dropped += due - self.position
+                    self.position = due
+
+        sequence_number, timestamp = self.index[self.position]
+        frame = self.frames[self.position]
+        self.position += 1
+        return frame, int(sequence_number), float(timestamp)
+
+    def get_frame(self):
+        """
+        Next frame of the recording.
+
+        Returns:
+            numpy.ndarray: Read-only view of the frame, None at the end
+        """
+        latest = self.get_latest()
+        return latest[0] if latest is not None else None
+
+    get_depth_frame = get_frame
+
+    def stop_stream(self):
+        """Stop playback."""
+        self.running = False
+
+    def __enter__(self):
+        """Context manager entry point."""
+        self.start_stream()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.stop_stream()
+
+
+if __name__ == "__main__":
+    from oakd_lite_camera import OakDLiteCamera
+    from depth_ai_stereo import DepthAIStereoDepth
+
+    # Record 10 s of RGB preview with device sequence numbers and timestamps
+    with OakDLiteCamera(preview_size=(640, 480), fps=30, threaded=True) as camera, \
+            FrameRecorder("rgb.frames", (480, 640, 3), np.uint8) as recorder:
+        for _ in range(300):
+            latest = camera.get_latest(timeout=1.0)
+            if latest is None:
+                break
+            recorder.append(*latest)
+
+    # Record 300 depth frames
+    with DepthAIStereoDepth(resolution=400) as depth_sensor, \
+            FrameRecorder("depth.frames", (400, 640), np.uint16) as recorder:
+        depth_sensor.start_stream()
+        for _ in range(300):
+            recorder.append(depth_sensor.get_depth_frame())
+
+    # Replay both without a camera, the RGB at the recorded rate, the depth as fast as possible
+    with FrameReplay("rgb.frames", realtime=True) as replay:
+        while (frame := replay.get_frame()) is not None:
+            pass
+    with FrameReplay("depth.frames", realtime=False) as replay:
+        start = time.perf_counter()
+        while (depth := replay.get_depth_frame()) is not None:
+            pass
+        print(f"Replayed {len(replay)} depth frames in {time.perf_counter() - start:.3f} s")
@@ -0,0 +1,92 @@
+import threading
+import numpy as np
+
+
+class FrameRing:
+    """Fixed-size ring of preallocated frame buffers.
+
+    A single producer (the capture thread) writes into the buffer returned by
+    ``next_buffer()`` and then calls ``publish()``. Consumers get a view of the
+    newest published buffer without copying. The buffer being written is never
+    the one most recently published, so a view handed out stays valid until
+    ``size - 1`` further frames have been published.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, size=4):
+        """
+        Initialize the ring.
+
+        Args:
+            shape (tuple): Shape of a single frame, e.g. (height, width, 3)
+            dtype: NumPy dtype of the frames
+            size (int): Number of buffers (at least 2)
+        """
+        if size < 2:
+            raise ValueError("FrameRing needs at least 2 buffers")
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.size = size
+        self.buffers = [np.empty(self.shape, dtype=self.dtype) for _ in range(size)]
+        self.sequence_numbers = [-1] * size
+        self.timestamps = [0.0] * size
+        self.published = 0  # Total number of frames published
+        self.closed = False
+        self._latest = -1
+        self._cond = threading.Condition()
+
+    def next_buffer(self):
+        """Return the buffer the producer should fill next."""
+        return self.buffers[(self._latest + 1) % self.size]
+
+    def publish(self, sequence_number, timestamp):
+        """Make the buffer returned by ``next_buffer()`` the newest frame.
+
+        Args:
+            sequence_number (int): Frame sequence number from the device
+            timestamp (float): Capture timestamp in seconds
+        """
+        index = (self._latest + 1) % self.size
+        with self._cond:
+            self.sequence_numbers[index] = sequence_number
+            self.timestamps[index] = timestamp
+            self._latest = index
+            self.published += 1
+            self._cond.notify_all()
+
+    def latest(self):
+        """Get the newest frame.
+
+        Returns:
+            tuple: (frame, sequence_number, timestamp), or None if nothing
+            has been published yet
+        """
+        with self._cond:
+            return self._entry(self._latest)
+
+    def wait_newer(self, after_count, timeout=None):
+        """Block until more than ``after_count`` frames have been published.
+
+        Args:
+            after_count (int): Value of ``published`` the caller last saw
+            timeout (float): Maximum time to wait in seconds, None waits forever
+
+        Returns:
+            tuple: (frame, sequence_number, timestamp, published), or None on
+            timeout or after ``close()``
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.published > after_count or self.closed, timeout)
+            if self.published <= after_count:
+                return None
+            return self._entry(self._latest) + (self.published,)
+
+    def close(self):
+        """Release any consumers blocked in ``wait_newer`` (used on shutdown)."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def _entry(self, index):
+        if index < 0:
+            return None
+        return self.buffers[index], self.sequence_numbers[index], self.timestamps[index]
@@ -0,0 +1,278 @@
+import bisect
+import http.server
+import json
+import math
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds: 0.1 ms doubling up to about 26 s
+DEFAULT_BUCKETS = tuple(0.0001 * 2 ** i for i in range(19))
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last entry is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Upper bucket bound below which a fraction ``q`` of the samples fall."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+        }
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Metrics:
+    """Named latency histograms with JSON / Prometheus export.
+
+    Disabled by default: ``observe()`` returns on its first line and
+    ``timer()`` hands out a shared no-op context manager, so instrumented
+    code costs a function call per sample until ``enable()`` is called.
+    """
+
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled (bool): Start recording immediately
+            buckets (tuple): Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.histograms = {}  # (name, ((label, value), ...)) -> Histogram
+        self._lock = threading.Lock()
+        self._server = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop every recorded sample."""
+        with self._lock:
+            self.histograms.clear()
+
+    def observe(self, name, seconds, **labels):
+        """
+        Record one duration.
+
+        Args:
+            name (str): Metric name, e.g. 'decode_seconds'
+            seconds (float): Duration in seconds
+            **labels: Label values, e.g. stream='rgb'
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def timer(self, name, **labels):
+        """Context manager that records the duration of its block."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def observe_frame(self, stream, img_frame, wait_start, device_now):
+        """
+        Record queue wait and capture-to-host latency of a received ImgFrame.
+
+        Args:
+            stream (str): Stream label
+            img_frame (dai.ImgFrame): Frame just taken from the output queue
+            wait_start (float): ``time.perf_counter()`` before the queue get
+            device_now (callable): ``dai.Clock.now`` (host clock synced to the
+                device timestamps)
+        """
+        if not self.enabled:
+            return
+        self.observe("queue_wait_seconds", time.perf_counter() - wait_start, stream=stream)
+        self.observe("capture_to_host_seconds",
+                     (device_now() - img_frame.getTimestamp()).total_seconds(), stream=stream)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: metric name -> list of {'labels', 'count', 'sum', 'mean',
+            'min', 'max', 'p50', 'p90', 'p99'} in seconds
+        """
+        with self._lock:
+            items = sorted(self.histograms.items())
+            result = {}
+            for (name, labels), histogram in items:
+                result.setdefault(name, []).append(dict(histogram.snapshot(), labels=dict(labels)))
+            return result
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=1)
+
+    def to_prometheus(self, prefix="oakd_"):
+        """Prometheus text exposition format (histogram type)."""
+        lines = []
+        with self._lock:
+            items = sorted(self.histograms.items())
+            declared = set()
+            for (name, labels), histogram in items:
+                metric = prefix + name
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} histogram")
+                    declared.add(metric)
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                separator = "," if label_text else ""
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else f"{bound:.6g}"
+                    lines.append(f'{metric}_bucket{{{label_text}{separator}le="{le}"}} {cumulative}')
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{metric}_sum{suffix} {histogram.sum:.9g}")
+                lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the metrics to a file: JSON for ``*.json``, Prometheus text otherwise."""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(text)
+        os.replace(temporary, path)  # Readers never see a half-written file
+
+    def serve(self, port=9100, host="127.0.0.1"):
+        """
+        Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` from a background thread.
+
+        Returns:
+            http.server.ThreadingHTTPServer: The running server
+        """
+        metrics = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = metrics.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+
+        self.stop_server()
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"Serving metrics on http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+    def stop_server(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def print_summary(self):
+        """Print count, mean and tail latencies of every histogram in milliseconds."""
+        print(f"{'metric':>28} {'labels':>18} {'count':>7} {'mean':>8} {'p50':>8} {'p99':>8} {'max':>8}")
+        for name, entries in self.snapshot().items():
+            for entry in entries:
+                labels = ",".join(f"{key}={value}" for key, value in entry['labels'].items())
+                print(f"{name:>28} {labels:>18} {entry['count']:7d} {entry['mean'] * 1000:8.2f} "
+                      f"{entry['p50'] * 1000:8.2f} {entry['p99'] * 1000:8.2f} {entry['max'] * 1000:8.2f}")
+
+
+_shared_metrics = None
+
+
+def shared_metrics():
+    """The process-wide Metrics used by the camera and robot classes (disabled until enabled)."""
+    global _shared_metrics
+    if _shared_metrics is None:
+        _shared_metrics = Metrics()
+    return _shared_metrics
+
+
+if __name__ == "__main__":
+    from qr_tracking import decode_qr
+    import cv2
+
+    metrics = shared_metrics()
+    metrics.enable()
+    image = cv2.imread(os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "engine.png"))
+    for _ in range(50):
+        with metrics.timer("decode_seconds", stream="file"):
+            decode_qr(image)
+    metrics.print_summary()
+    metrics.write("metrics.prom")
+    metrics.write("metrics.json")
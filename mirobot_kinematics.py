@@ -0,0 +1,145 @@
+import math
+import numpy as np
+
+# Nominal modified (Craig) DH parameters of the WLKATA Mirobot:
+# (a_{i-1} mm, alpha_{i-1} deg, d_i mm, theta offset deg) per joint.
+# With all joints at 0 this gives the controller's home pose (198.67, 0, 230.72).
+MIROBOT_DH = (
+    (0.0, 0.0, 127.0, 0.0),
+    (29.69, -90.0, 0.0, -90.0),
+    (108.0, 0.0, 0.0, 0.0),
+    (20.0, -90.0, 168.98, 0.0),
+    (0.0, 90.0, 0.0, -90.0),
+    (0.0, 90.0, 24.29, 0.0),
+)
+
+# Joint limits in degrees
+MIROBOT_JOINT_LIMITS = (
+    (-110.0, 160.0),
+    (-35.0, 70.0),
+    (-120.0, 60.0),
+    (-180.0, 180.0),
+    (-200.0, 30.0),
+    (-360.0, 360.0),
+)
+
+# The controller reports the home orientation as (0, 0, 0) with the tool
+# pointing down, i.e. the flange frame turned 180 degrees about Y.
+_TOOL_FLIP = np.diag([-1.0, 1.0, -1.0])
+
+
+def _link_transform(a, alpha, d, theta):
+    ca, sa = math.cos(alpha), math.sin(alpha)
+    ct, st = math.cos(theta), math.sin(theta)
+    return np.array([
+        [ct, -st, 0.0, a],
+        [st * ca, ct * ca, -sa, -sa * d],
+        [st * sa, ct * sa, ca, ca * d],
+        [0.0, 0.0, 0.0, 1.0],
+    ])
+
+
+def forward_kinematics(angles, dh=MIROBOT_DH):
+    """
+    Tool pose for a set of joint angles.
+
+    Args:
+        angles (array-like): Six joint angles in degrees
+        dh (tuple): DH table, see MIROBOT_DH
+
+    Returns:
+        numpy.ndarray: 4x4 homogeneous transform of the tool in the base frame
+    """
+    transform = np.eye(4)
+    for (a, alpha, d, offset), angle in zip(dh, angles):
+        transform = transform @ _link_transform(a, math.radians(alpha), d, math.radians(angle + offset))
+    transform[:3, :3] = transform[:3, :3] @ _TOOL_FLIP
+    return transform
+
+
+def pose_from_matrix(transform):
+    """
+    Controller-style pose from a transform.
+
+    Orientation is returned as roll/pitch/yaw in degrees with
+    R = Rz(yaw) @ Ry(pitch) @ Rx(roll).
+
+    Returns:
+        list: [x, y, z, roll, pitch, yaw]
+    """
+    rotation = transform[:3, :3]
+    pitch = math.asin(max(-1.0, min(1.0, -rotation[2, 0])))
+    roll = math.atan2(rotation[2, 1], rotation[2, 2])
+    yaw = math.atan2(rotation[1, 0], rotation[0, 0])
+    return list(transform[:3, 3]) + [math.degrees(roll), math.degrees(pitch), math.degrees(yaw)]
+
+
+def matrix_from_pose(pose):
+    """Inverse of ``pose_from_matrix``."""
+    x, y, z, roll, pitch, yaw = pose
+    cr, sr = math.cos(math.radians(roll)), math.sin(math.radians(roll))
+    cp, sp = math.cos(math.radians(pitch)), math.sin(math.radians(pitch))
+    cy, sy = math.cos(math.radians(yaw)), math.sin(math.radians(yaw))
+    transform = np.eye(4)
+    transform[:3, :3] = np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ])
+    transform[:3, 3] = (x, y, z)
+    return transform
+
+
+def _rotation_error(target, current):
+    """Rotation vector (radians) turning ``current`` into ``target``."""
+    error = target @ current.T
+    vee = 0.5 * np.array([error[2, 1] - error[1, 2], error[0, 2] - error[2, 0], error[1, 0] - error[0, 1]])
+    angle = math.acos(max(-1.0, min(1.0, (np.trace(error) - 1.0) / 2.0)))
+    sin_angle = math.sin(angle)
+    if sin_angle < 1e-6:
+        return vee
+    return vee * (angle / sin_angle)
+
+
+def inverse_kinematics(pose, seed=None, dh=MIROBOT_DH, limits=MIROBOT_JOINT_LIMITS,
+                       tolerance=0.05, max_iterations=200, orientation_weight=100.0):
+    """
+    Numerical inverse kinematics (damped least squares).
+
+    Args:
+        pose (array-like): Target [x, y, z, roll, pitch, yaw] in mm / degrees
+        seed (array-like): Starting joint angles in degrees (default: home)
+        dh (tuple): DH table, see MIROBOT_DH
+        limits (tuple): Joint limits in degrees
+        tolerance (float): Position tolerance in mm (orientation uses
+            tolerance / orientation_weight radians)
+        max_iterations (int): Iteration limit
+        orientation_weight (float): mm of position error equivalent to 1 rad
+
+    Returns:
+        list: Six joint angles in degrees, or None if no solution was found
+    """
+    target = matrix_from_pose(pose)
+    angles = np.array(seed if seed is not None else [0.0] * 6, dtype=np.float64)
+    lower = np.array([low for low, _ in limits])
+    upper = np.array([high for _, high in limits])
+    step = 1e-3  # Degrees, for the numerical Jacobian
+    damping = 1.0
+
+    def error_at(q):
+        current = forward_kinematics(q, dh)
+        return np.concatenate([target[:3, 3] - current[:3, 3],
+                               orientation_weight * _rotation_error(target[:3, :3], current[:3, :3])])
+
+    for _ in range(max_iterations):
+        error = error_at(angles)
+        if np.linalg.norm(error) < tolerance:
+            return [float(a) for a in angles]
+        jacobian = np.empty((6, 6))
+        for j in range(6):
+            probe = angles.copy()
+            probe[j] += step
+            jacobian[:, j] = (error - error_at(probe)) / step
+        delta = jacobian.T @ np.linalg.solve(jacobian @ jacobian.T + damping ** 2 * np.eye(6), error)
+        angles = np.clip(angles + delta, lower, upper)
+    return None
@@ -0,0 +1,192 @@
+import collections
+import threading
+import time
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from wlkata_controller import Motion, PositionMode
+
+
+class MotionCommandQueue:
+    """Stream motion commands to the WLKATA arm ahead of execution.
+
+    Commands are sent from a background thread without waiting for the arm to
+    stop in between, so the controller can plan through consecutive moves. As
+    in GRBL's streaming, a buffer slot is freed by the acknowledgement: each
+    wlkatapython call returns once the controller has accepted the line, and
+    the controller holds that acknowledgement back while its own buffer is
+    full, so the next command goes out as soon as there is room.
+
+    Every submitted command returns a ``concurrent.futures.Future``. The
+    status report carries no per-command progress, so a future completes when
+    the controller next reports Idle after the command was sent, i.e. once
+    the buffer has drained through it; ``barrier()`` waits for everything
+    submitted so far. While the queue is open all serial traffic must go
+    through it.
+    """
+
+    def __init__(self, robot, max_in_flight=8, poll_interval=0.02, start_grace=0.2):
+        """
+        Initialize the queue and start the streaming thread.
+
+        Args:
+            robot (WlkataRobotController): Connected robot controller
+            max_in_flight (int): Commands sent per streaming step, between two
+                status polls
+            poll_interval (float): Delay between status polls in seconds
+            start_grace (float): Time after a send before an Idle status is trusted
+        """
+        self.robot = robot
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.start_grace = start_grace
+        self._pending = collections.deque()  # (function, args, kwargs, future) not yet sent
+        self._in_flight = collections.deque()  # Futures acknowledged, buffer not yet drained
+        self._outstanding = []  # Every future not known to be done, for barrier()
+        self._last_send = 0.0
+        self._seen_busy = False
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _submit(self, function, *args, **kwargs):
+        future = Future()
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("Motion queue is closed")
+            self._pending.append((function, args, kwargs, future))
+            self._outstanding.append(future)
+            self._cond.notify()
+        return future
+
+    def move_joints(self, angles, mode=PositionMode.ABSOLUTE):
+        """Queue a joint-space move. Returns a Future."""
+        return self._submit(self.robot.set_joint_angles, list(angles), mode, wait=False)
+
+    def move_to(self, coordinates, motion=Motion.LINEAR_MOVEMENT, mode=PositionMode.ABSOLUTE):
+        """Queue a cartesian move. Returns a Future."""
+        return self._submit(self.robot.set_coordinates, list(coordinates), motion, mode, wait=False)
+
+    def pump(self, state):
+        """Queue a pump on/off command. Returns a Future."""
+        return self._submit(self.robot.set_pump, state, wait=False)
+
+    def barrier(self, timeout=None):
+        """
+        Wait until every command submitted so far has been executed.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds, None waits forever
+
+        Returns:
+            bool: True if everything completed, False on timeout
+        """
+        with self._cond:
+            self._outstanding = [future for future in self._outstanding if not future.done()]
+            futures = list(self._outstanding)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                future.result(remaining)
+            except FutureTimeoutError:
+                return False
+            except (CancelledError, Exception):
+                pass  # Failed or cancelled commands still count as finished
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending and not self._in_flight:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                to_send = []
+                while self._pending and len(to_send) < self.max_in_flight:
+                    to_send.append(self._pending.popleft())
+
+            for function, args, kwargs, future in to_send:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    function(*args, **kwargs)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                self._last_send = time.monotonic()
+                self._seen_busy = False
+                with self._cond:
+                    self._in_flight.append(future)
+
+            if self._in_flight:
+                self._poll_status()
+            time.sleep(self.poll_interval)
+
+        # Closing: cancel anything that never ran and fail what was never confirmed
+        with self._cond:
+            pending = list(self._pending)
+            in_flight = list(self._in_flight)
+            self._pending.clear()
+            self._in_flight.clear()
+        for _, _, _, future in pending:
+            future.cancel()
+        for future in in_flight:
+            future.set_exception(RuntimeError("Motion queue closed before the command was confirmed"))
+
+    def _poll_status(self):
+        try:
+            state = self.robot.status()["state"]
+        except Exception as e:
+            print(f"Status poll failed: {e}")
+            return
+        if state != "Idle":
+            self._seen_busy = True
+            return
+        if self._seen_busy or time.monotonic() - self._last_send >= self.start_grace:
+            # The controller buffer has drained: everything acknowledged so far is done
+            with self._cond:
+                done = list(self._in_flight)
+                self._in_flight.clear()
+            for future in done:
+                future.set_result(True)
+
+    def close(self, wait=True):
+        """
+        Stop streaming.
+
+        Args:
+            wait (bool): Finish all queued commands first; otherwise unsent
+                commands are cancelled and sent ones that were not confirmed
+                yet fail with RuntimeError
+        """
+        if wait:
+            self.barrier()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=2.0)
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close(wait=exc_type is None)
+
+
+if __name__ == "__main__":
+    from wlkata_controller import WlkataRobotController
+
+    with WlkataRobotController(port="COM3", baudrate=115200, timeout=1) as robot:
+        robot.home()
+        with MotionCommandQueue(robot) as motion:
+            # Approach, pick, lift and place are streamed without stopping in between
+            motion.move_to([200, 0, 120, 0, 0, 0])
+            motion.move_to([200, 0, 60, 0, 0, 0])
+            motion.pump(True)
+            motion.move_to([200, 0, 120, 0, 0, 0])
+            placed = motion.move_to([150, 150, 120, 0, 0, 0])
+            motion.pump(False)
+            motion.barrier()
+            print(f"Place move done: {placed.done()}")
@@ -0,0 +1,218 @@
+import depthai as dai
+
+
+class OakDDeviceManager:
+    """One pipeline and one device boot shared by several camera classes.
+
+    Pass the manager as ``device_manager`` to OakDLiteCamera,
+    OakDQRCodeReader and DepthAIStereoDepth. Each of them adds its nodes to
+    the shared pipeline when it is constructed and gets its own XLinkOut
+    stream, so every consumer has a separate host queue. The device is booted
+    by the first ``start()`` (or the first consumer's ``start_stream``); all
+    consumers must therefore be created before any of them starts.
+    Consumers never close the shared device, call ``close()`` on the manager
+    when done.
+    """
+
+    def __init__(self, device_info=None):
+        """
+        Initialize the manager with an empty pipeline.
+
+        Args:
+            device_info (dai.DeviceInfo): Device to open, None for the first one found
+        """
+        self.device_info = device_info
+        self.pipeline = dai.Pipeline()
+        self.device = None
+        self.streams = []
+        self._color_camera = None
+        self._color_config = None
+        self._mono_cameras = {}
+        self._stereo = None
+        self._stereo_config = None
+
+    def _check_not_started(self):
+        if self.device is not None:
+            raise RuntimeError("Streams must be added before the shared device is started")
+
+    def _unique_name(self, name):
+        stream_name = name
+        count = 1
+        while stream_name in self.streams:
+            count += 1
+            stream_name = f"{name}_{count}"
+        self.streams.append(stream_name)
+        return stream_name
+
+    def color_camera(self, preview_size=(640, 480), fps=30):
+        """
+        The shared color camera node, created on first use.
+
+        Args:
+            preview_size (tuple): Preview resolution (width, height)
+            fps (int): Frames per second
+
+        Returns:
+            dai.node.ColorCamera
+        """
+        self._check_not_started()
+        config = (tuple(preview_size), fps)
+        if self._color_camera is None:
+            self._color_camera = self.pipeline.create(dai.node.ColorCamera)
+            self._color_camera.setPreviewSize(*preview_size)
+            self._color_camera.setInterleaved(False)
+            self._color_camera.setFps(fps)
+            self._color_config = config
+        elif config != self._color_config:
+            raise ValueError(f"Color camera already configured as {self._color_config}, requested {config}")
+        return self._color_camera
+
+    def mono_camera(self, socket, resolution=dai.MonoCameraProperties.SensorResolution.THE_400_P):
+        """
+        The shared mono camera node on ``socket``, created on first use.
+
+        Args:
+            socket (dai.CameraBoardSocket): LEFT or RIGHT
+            resolution (dai.MonoCameraProperties.SensorResolution): Sensor resolution
+
+        Returns:
+            dai.node.MonoCamera
+        """
+        self._check_not_started()
+        if socket not in self._mono_cameras:
+            mono = self.pipeline.create(dai.node.MonoCamera)
+            mono.setBoardSocket(socket)
+            mono.setResolution(resolution)
+            self._mono_cameras[socket] = (mono, resolution)
+        mono, configured = self._mono_cameras[socket]
+        if configured != resolution:
+            raise ValueError(f"Mono camera {socket} already configured as {configured}, requested {resolution}")
+        return mono
+
+    def stereo_depth(self, resolution=dai.MonoCameraProperties.SensorResolution.THE_400_P,
+                     extended_disparity=True, median_filter=True, align_to=None, output_size=None):
+        """
+        The shared stereo depth node fed by both mono cameras, created on first use.
+
+        Args:
+            resolution (dai.MonoCameraProperties.SensorResolution): Mono sensor resolution
+            extended_disparity (bool): Enable extended disparity for longer range
+            median_filter (bool): Enable 7x7 median filtering
+            align_to (dai.CameraBoardSocket): Align depth to this camera (e.g.
+                RGB); None keeps the rectified right camera
+            output_size (tuple): Depth output (width, height) when aligned
+
+        Returns:
+            dai.node.StereoDepth
+        """
+        self._check_not_started()
+        config = (resolution, extended_disparity, median_filter, align_to,
+                  tuple(output_size) if output_size is not None else None)
+        if self._stereo is None:
+            self._stereo = self.pipeline.create(dai.node.StereoDepth)
+            self.mono_camera(dai.CameraBoardSocket.LEFT, resolution).out.link(self._stereo.left)
+            self.mono_camera(dai.CameraBoardSocket.RIGHT, resolution).out.link(self._stereo.right)
+            if extended_disparity:
+                self._stereo.setExtendedDisparity(True)
+            if median_filter:
+                self._stereo.setMedianFilter(dai.StereoDepthProperties.MedianFilter.KERNEL_7x7)
+            if align_to is not None:
+                self._stereo.setDepthAlign(align_to)
+            if output_size is not None:
+                self._stereo.setOutputSize(*output_size)
+            self._stereo_config = config
+        elif config != self._stereo_config:
+            raise ValueError(f"Stereo depth already configured as {self._stereo_config}, requested {config}")
+        return self._stereo
+
+    def add_output(self, name, output):
+        """
+        Stream a node output to the host under a name no other consumer uses.
+
+        Args:
+            name (str): Preferred stream name; a suffix is added if taken
+            output: Node output, e.g. ``color_camera().preview``
+
+        Returns:
+            str: The stream name to pass to ``device.getOutputQueue``
+        """
+        self._check_not_started()
+        stream_name = self._unique_name(name)
+        xout = self.pipeline.create(dai.node.XLinkOut)
+        xout.setStreamName(stream_name)
+        output.link(xout.input)
+        return stream_name
+
+    def add_input(self, name, node_input):
+        """
+        Host-to-device stream into a node input (e.g. ImageManip configs).
+
+        Returns:
+            str: The stream name to pass to ``device.getInputQueue``
+        """
+        self._check_not_started()
+        stream_name = self._unique_name(name)
+        xin = self.pipeline.create(dai.node.XLinkIn)
+        xin.setStreamName(stream_name)
+        xin.out.link(node_input)
+        return stream_name
+
+    def start(self):
+        """
+        Boot the device with the shared pipeline (only the first call boots).
+
+        Returns:
+            dai.Device: The shared device
+        """
+        if self.device is None:
+            if self.device_info is not None:
+                self.device = dai.Device(self.pipeline, self.device_info)
+            else:
+                self.device = dai.Device(self.pipeline)
+            print(f"Shared device started with streams: {', '.join(self.streams)}")
+        return self.device
+
+    def close(self):
+        """Close the shared device."""
+        if self.device is not None:
+            self.device.close()
+            self.device = None
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close()
+
+
+if __name__ == "__main__":
+    import cv2
+    from depth_ai_stereo import DepthAIStereoDepth
+    from oakd_lite_camera import OakDLiteCamera
+    from oakd_qr_code_reader import OakDQRCodeReader
+
+    # RGB preview, QR scanning and depth from a single device boot
+    with OakDDeviceManager() as manager:
+        camera = OakDLiteCamera(preview_size=(640, 480), fps=30, device_manager=manager)
+        scanner = OakDQRCodeReader(preview_size=(640, 480), fps=30, device_manager=manager)
+        depth_sensor = DepthAIStereoDepth(resolution=400, device_manager=manager)
+        left_stream = manager.add_output("left", manager.mono_camera(dai.CameraBoardSocket.LEFT).out)
+
+        manager.start()
+        scanner.start_stream()
+        depth_sensor.start_stream()
+        camera.start_stream()
+        left_queue = manager.device.getOutputQueue(name=left_stream, maxSize=1, blocking=False)
+
+        qr_data = scanner.read_qr_code(stop_after_read=False)
+        print(f"QR code: {qr_data}")
+        depth = depth_sensor.get_depth_frame()
+        print(f"Depth at the centre: {depth[depth.shape[0] // 2, depth.shape[1] // 2]} mm")
+        cv2.imshow("Left", left_queue.get().getCvFrame())
+        cv2.waitKey(0)
+
+        scanner.stop_stream()
+        depth_sensor.stop()
+        camera.stop_stream()
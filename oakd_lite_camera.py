@@ -1,24 +1,56 @@
+import threading
+import time
 import cv2
 import depthai as dai
+import numpy as np
+from display_sink import DisplaySink
+from frame_ring import FrameRing
+from instrumentation import shared_metrics
 
 class OakDLiteCamera:
-    def __init__(self, preview_size=(640, 480), fps=30):
+    def __init__(self, preview_size=(640, 480), fps=30, threaded=False, ring_size=4, device_manager=None,
+                 frame_pool=None, metrics=None):
         """
         Initialize OAK-D Lite camera with specified parameters.
         
         Args:
             preview_size (tuple): Camera preview resolution (width, height)
             fps (int): Frames per second
+            threaded (bool): Drain the device queue on a background capture
+                thread into a ring of preallocated buffers
+            ring_size (int): Number of buffers in the ring (threaded mode only)
+            device_manager (OakDDeviceManager): Share one device with other
+                streams instead of opening a device of its own
+            frame_pool (FramePool): Convert frames into recycled buffers (e.g.
+                ``shared_frame_pool()``) instead of allocating one per frame
+            metrics (Metrics): Latency histograms (default: the shared,
+                normally disabled registry)
         """
         self.preview_size = preview_size
         self.fps = fps
+        self.threaded = threaded
+        self.ring_size = ring_size
         self.pipeline = None
         self.device = None
         self.video_queue = None
         self.running = False
+        self.ring = None
+        self.capture_thread = None
+        self._last_published = 0
+        self.device_manager = device_manager
+        self.stream_name = "video"
+        self.frame_pool = frame_pool
+        self.metrics = metrics if metrics is not None else shared_metrics()
+        if device_manager is not None:
+            self.initialize_pipeline()
 
     def initialize_pipeline(self):
-        """Set up the DepthAI pipeline."""
+        """Set up the DepthAI pipeline (or add the preview stream to the shared one)."""
+        if self.device_manager is not None:
+            cam_rgb = self.device_manager.color_camera(self.preview_size, self.fps)
+            self.stream_name = self.device_manager.add_output("video", cam_rgb.preview)
+            return
+
         self.pipeline = dai.Pipeline()
         
         # Configure color camera
@@ -35,56 +67,144 @@ class OakDLiteCamera:
     def start_stream(self):
         """Start the camera stream."""
         try:
-            self.initialize_pipeline()
-            self.device = dai.Device(self.pipeline)
+            if self.device_manager is not None:
+                self.device = self.device_manager.start()
+            else:
+                self.initialize_pipeline()
+                self.device = dai.Device(self.pipeline)
             self.video_queue = self.device.getOutputQueue(
-                name="video", 
+                name=self.stream_name, 
                 maxSize=1, 
                 blocking=False
             )
             self.running = True
+            if self.threaded:
+                self._start_capture_thread()
             print("Camera stream started successfully")
         except Exception as e:
             print(f"Failed to start camera stream: {e}")
             self.running = False
 
+    def _start_capture_thread(self):
+        """Start the background thread that fills the frame ring."""
+        width, height = self.preview_size
+        self.ring = FrameRing((height, width, 3), np.uint8, self.ring_size)
+        self._last_published = 0
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+
+    def _capture_loop(self):
+        """Block on the device queue and copy each frame into the next ring slot."""
+        width, height = self.preview_size
+        try:
+            while self.running:
+                wait_start = time.perf_counter()
+                try:
+                    img_frame = self.video_queue.get()
+                except RuntimeError:
+                    break  # Queue closed while stopping
+                self.metrics.observe_frame("rgb", img_frame, wait_start, dai.Clock.now)
+                # Planar BGR -> interleaved straight into the preallocated slot
+                planar = img_frame.getData().reshape(3, height, width)
+                cv2.merge((planar[0], planar[1], planar[2]), dst=self.ring.next_buffer())
+                self.ring.publish(img_frame.getSequenceNum(), img_frame.getTimestamp().total_seconds())
+        except Exception as e:
+            print(f"Capture thread stopped: {e}")
+        finally:
+            self.ring.close()  # Wake readers blocked in get_latest() whatever happened
+
     def get_frame(self):
         """Get the current frame from the camera.
         
+        In threaded mode the newest frame from the ring is returned as a view;
+        it stays valid until ``ring_size - 1`` further frames have arrived.
+        With a frame pool the frame is a recycled buffer as well.
+        
         Returns:
             numpy.ndarray: OpenCV frame if available, None otherwise
         """
-        if self.running and self.video_queue.has():
-            return self.video_queue.get().getCvFrame()
+        if not self.running:
+            return None
+        if self.threaded:
+            latest = self.ring.latest()
+            return latest[0] if latest is not None else None
+        if self.video_queue.has():
+            return self._read_frame()
         return None
 
+    def _read_frame(self):
+        """Block for the next frame on the device queue and convert it."""
+        wait_start = time.perf_counter()
+        img_frame = self.video_queue.get()
+        self.metrics.observe_frame("rgb", img_frame, wait_start, dai.Clock.now)
+        if self.frame_pool is not None:
+            return self.frame_pool.bgr(img_frame)
+        return img_frame.getCvFrame()
+
+    def get_latest(self, timeout=None):
+        """Wait for a frame newer than the last one returned by this method.
+        
+        Only available in threaded mode.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds, None waits forever
+            
+        Returns:
+            tuple: (frame, sequence_number, timestamp) or None on timeout
+        """
+        if not self.threaded or self.ring is None:
+            print("get_latest() requires a running camera with threaded=True")
+            return None
+        result = self.ring.wait_newer(self._last_published, timeout)
+        if result is None:
+            return None
+        frame, sequence_number, timestamp, self._last_published = result
+        return frame, sequence_number, timestamp
+
     def stop_stream(self):
         """Stop the camera stream and clean up resources."""
         self.running = False
-        if hasattr(self, 'device') and self.device:
-            self.device.close()
-        cv2.destroyAllWindows()
+        if hasattr(self, 'device') and self.device and self.device_manager is None:
+            self.device.close()  # A shared device is closed by its manager
+        if self.ring is not None:
+            self.ring.close()
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=1.0)
+            self.capture_thread = None
         print("Camera stream stopped")
 
-    def stream_video(self, window_name="OAK-D Lite RGB Stream"):
+    def stream_video(self, window_name="OAK-D Lite RGB Stream", max_fps=30, headless=False):
         """
         Display live video stream in a window.
         
+        Frames are handed to a DisplaySink, so drawing never holds up capture.
+        
         Args:
             window_name (str): Name of the display window
+            max_fps (float): Maximum redraw rate of the window
+            headless (bool): Run the loop without any OpenCV window
         """
         if not self.running:
             self.start_stream()
             
+        sink = DisplaySink(max_fps=max_fps, headless=headless, metrics=self.metrics, stream="rgb")
         try:
             while self.running:
-                frame = self.get_frame()
+                if self.threaded:
+                    # Sleep until the capture thread publishes instead of polling
+                    latest = self.get_latest(timeout=0.1)
+                    frame = latest[0] if latest is not None else None
+                else:
+                    try:
+                        frame = self._read_frame()
+                    except RuntimeError:
+                        break  # Device closed from another thread
                 if frame is not None:
-                    cv2.imshow(window_name, frame)
-                
-                if cv2.waitKey(1) == ord('q'):
+                    sink.show(window_name, frame)
+                if sink.poll_key() == ord('q'):
                     break
         finally:
+            sink.close()
             self.stop_stream()
 
     def __enter__(self):
@@ -118,4 +238,16 @@ if __name__ == "__main__":
             if cv2.waitKey(1) == ord('q'):
                 break
     finally:
-        camera.stop_stream()
\ No newline at end of file
+        camera.stop_stream()
+        cv2.destroyAllWindows()
+
+    # Threaded capture: block for the newest frame instead of polling
+    with OakDLiteCamera(preview_size=(640, 480), fps=30, threaded=True) as camera:
+        while True:
+            latest = camera.get_latest(timeout=1.0)
+            if latest is None:
+                break
+            frame, sequence_number, timestamp = latest
+            cv2.imshow("Threaded Stream", frame)
+            if cv2.waitKey(1) == ord('q'):
+                break
\ No newline at end of file
@@ -1,60 +1,417 @@
-import cv2
-from pyzbar.pyzbar import decode
+import time
 import depthai as dai
+import numpy as np
+from adaptive_stream import AdaptiveStreamController
+from depth_regions import DepthRegionStats
+from display_sink import DisplaySink
+from instrumentation import shared_metrics
+from qr_decode_pool import QRDecodePool
+from qr_localization import locate_codes
+from qr_decoders import QRDetection, create_decoder
+from qr_tracking import QRCodeTracker
+from scene_change import SceneChangeDetector
 
 class OakDQRCodeReader:
-    def __init__(self, preview_size=(640, 480), fps=30):
+    def __init__(self, preview_size=(640, 480), fps=30, tracking=False,
+                 roi_padding=40, full_scan_interval=15, search_scale=0.5,
+                 decode_workers=0, skip_static=False, change_threshold=3.0,
+                 device_manager=None, gray=False, crop=None, adaptive=False,
+                 frame_pool=None, metrics=None, depth=False, decoder="pyzbar"):
         """
         Initialize OAK-D QR Code Reader.
         
         Args:
             preview_size (tuple): Camera resolution (width, height)
             fps (int): Frames per second
+            tracking (bool): Decode only around the last known code location
+            roi_padding (int): Pixels added around the tracked code (tracking mode)
+            full_scan_interval (int): Force a full-frame search every N frames (tracking mode)
+            search_scale (float): Downscale factor for full-frame searches (tracking mode)
+            decode_workers (int): Decode on this many worker processes (0 decodes
+                in-process; tracking only applies to in-process decoding)
+            skip_static (bool): Reuse cached results instead of decoding when the
+                scene has not changed (in-process decoding only)
+            change_threshold (float): Mean gray-level difference that counts as a change
+            device_manager (OakDDeviceManager): Share one device with other
+                streams instead of opening a device of its own
+            gray (bool): Convert to grayscale on the device (GRAY8), a third of
+                the USB traffic of BGR previews
+            crop (tuple): (x, y, width, height) region of the preview to crop on
+                the device. With ``gray`` or ``crop`` an ImageManip stage runs
+                on the device and ``set_crop()`` can move the region at runtime
+            adaptive (bool): Adjust the on-device resolution and the host frame
+                rate to decode latency, hit rate and dropped frames (in-process
+                decoding only)
+            frame_pool (FramePool): Convert frames into recycled buffers; without
+                display, in-process decoding then reads luminance straight
+                from the frame data
+            metrics (Metrics): Latency histograms (default: the shared,
+                normally disabled registry)
+            depth (bool): Also stream stereo depth aligned to the RGB camera
+                so ``detect()`` can return 3D positions. This reader's frames
+                then cover the camera's full field of view (no aspect-ratio
+                crop), scaled on an ImageManip of its own; the shared preview
+                is left as it is
+            decoder (str): Decoder backend from ``qr_decoders`` ("pyzbar",
+                "opencv", "opencv_aruco", optionally "prefilter+..."); run
+                scripts/benchmark_decoders.py to pick one for a line
         """
         self.preview_size = preview_size
         self.fps = fps
+        self.decoder = create_decoder(decoder)
+        self.tracker = None
+        if tracking:
+            self.tracker = QRCodeTracker(padding=roi_padding,
+                                         full_scan_interval=full_scan_interval,
+                                         search_scale=search_scale,
+                                         decoder=decoder)
+        self.change_detector = None
+        if skip_static:
+            self.change_detector = SceneChangeDetector(threshold=change_threshold)
+        self.decode_workers = decode_workers
+        self.decode_pool = None
         self.pipeline = None
         self.device = None
         self.video_queue = None
         self.running = False
+        self.device_manager = device_manager
+        self.stream_name = "video"
+        self.gray = gray
+        self.crop = self._clamp_crop(crop)
+        self.scale = 1.0
+        self._config_pending = False
+        self.adaptive = AdaptiveStreamController() if adaptive else None
+        self.frame_pool = frame_pool
+        self.metrics = metrics if metrics is not None else shared_metrics()
+        self.depth = depth
+        self.depth_stream_name = None
+        self.depth_queue = None
+        self.region_stats = DepthRegionStats()
+        self.intrinsics = None
+        self.config_stream_name = None
+        self.config_queue = None
+        if device_manager is not None:
+            self.initialize_pipeline()
 
     def initialize_pipeline(self):
-        """Set up the DepthAI pipeline for QR code scanning."""
-        self.pipeline = dai.Pipeline()
-        
-        # Configure color camera
-        cam_rgb = self.pipeline.create(dai.node.ColorCamera)
-        cam_rgb.setPreviewSize(*self.preview_size)
-        cam_rgb.setInterleaved(False)
-        cam_rgb.setFps(self.fps)
+        """Set up the DepthAI pipeline for QR code scanning (or add to the shared one)."""
+        if self.device_manager is not None:
+            pipeline = self.device_manager.pipeline
+            cam_rgb = self.device_manager.color_camera(self.preview_size, self.fps)
+        else:
+            pipeline = self.pipeline = dai.Pipeline()
+            
+            # Configure color camera
+            cam_rgb = pipeline.create(dai.node.ColorCamera)
+            cam_rgb.setPreviewSize(*self.preview_size)
+            cam_rgb.setInterleaved(False)
+            cam_rgb.setFps(self.fps)
+        output = cam_rgb.preview
+
+        stereo = None
+        if self.depth:
+            # Depth is reprojected onto the whole RGB frame, so this branch scales
+            # the full ISP output to the preview size instead of changing the
+            # preview other consumers of the camera may share
+            width, height = self.preview_size
+            full_view = pipeline.create(dai.node.ImageManip)
+            full_view.initialConfig.setResize(width, height)
+            full_view.initialConfig.setKeepAspectRatio(False)
+            full_view.initialConfig.setFrameType(dai.ImgFrame.Type.BGR888p)
+            full_view.setMaxOutputFrameSize(width * height * 3)
+            cam_rgb.isp.link(full_view.inputImage)
+            output = full_view.out
+            resolution = dai.MonoCameraProperties.SensorResolution.THE_400_P
+            if self.device_manager is not None:
+                stereo = self.device_manager.stereo_depth(resolution, align_to=dai.CameraBoardSocket.RGB,
+                                                          output_size=self.preview_size)
+            else:
+                stereo = pipeline.create(dai.node.StereoDepth)
+                for socket, stereo_input in ((dai.CameraBoardSocket.LEFT, stereo.left),
+                                             (dai.CameraBoardSocket.RIGHT, stereo.right)):
+                    mono = pipeline.create(dai.node.MonoCamera)
+                    mono.setBoardSocket(socket)
+                    mono.setResolution(resolution)
+                    mono.out.link(stereo_input)
+                stereo.setExtendedDisparity(True)
+                stereo.setMedianFilter(dai.StereoDepthProperties.MedianFilter.KERNEL_7x7)
+                stereo.setDepthAlign(dai.CameraBoardSocket.RGB)
+                stereo.setOutputSize(*self.preview_size)
+
+        # Optional on-device grayscale conversion and crop, reconfigurable from the host
+        manip = None
+        if self.gray or self.crop is not None or self.adaptive is not None:
+            width, height = self.preview_size
+            manip = pipeline.create(dai.node.ImageManip)
+            self._configure_manip(manip.initialConfig, self.crop)
+            manip.setMaxOutputFrameSize(width * height * 3)
+            manip.inputConfig.setWaitForMessage(False)
+            output.link(manip.inputImage)
+            output = manip.out
+
+        if self.device_manager is not None:
+            self.stream_name = self.device_manager.add_output("qr_video", output)
+            if stereo is not None:
+                self.depth_stream_name = self.device_manager.add_output("qr_depth", stereo.depth)
+            if manip is not None:
+                self.config_stream_name = self.device_manager.add_input("qr_manip_config", manip.inputConfig)
+            return
         
         # Set up output stream
-        xout = self.pipeline.create(dai.node.XLinkOut)
+        xout = pipeline.create(dai.node.XLinkOut)
         xout.setStreamName("video")
-        cam_rgb.preview.link(xout.input)
+        output.link(xout.input)
+        if stereo is not None:
+            xout_depth = pipeline.create(dai.node.XLinkOut)
+            xout_depth.setStreamName("depth")
+            stereo.depth.link(xout_depth.input)
+            self.depth_stream_name = "depth"
+        if manip is not None:
+            xin = pipeline.create(dai.node.XLinkIn)
+            xin.setStreamName("manip_config")
+            xin.out.link(manip.inputConfig)
+            self.config_stream_name = "manip_config"
+
+    def _configure_manip(self, config, crop):
+        """Fill an ImageManipConfig with the crop region and output type."""
+        width, height = self.preview_size
+        if crop is None:
+            config.setCropRect(0.0, 0.0, 1.0, 1.0)
+        else:
+            x, y, w, h = crop
+            config.setCropRect(x / width, y / height, (x + w) / width, (y + h) / height)
+        if self.scale != 1.0:
+            crop_width, crop_height = (crop[2], crop[3]) if crop is not None else (width, height)
+            config.setResize(max(1, int(crop_width * self.scale)), max(1, int(crop_height * self.scale)))
+        if self.gray:
+            config.setFrameType(dai.ImgFrame.Type.GRAY8)
+
+    def _clamp_crop(self, crop):
+        if crop is None:
+            return None
+        width, height = self.preview_size
+        x, y, w, h = (int(v) for v in crop)
+        x = min(max(x, 0), width - 1)
+        y = min(max(y, 0), height - 1)
+        return x, y, max(1, min(w, width - x)), max(1, min(h, height - y))
+
+    def set_crop(self, crop):
+        """
+        Move the on-device crop region without rebuilding the pipeline.
+        
+        Detections are reported in pixels of the cropped frame; add the
+        crop's (x, y) for preview coordinates. Frames already in flight when
+        the config is sent are dropped if the crop size changed; a crop moved
+        at the same size cannot be told apart and they still use the old one.
+        
+        Args:
+            crop (tuple): (x, y, width, height) in preview pixels, None for the full frame
+            
+        Returns:
+            bool: True if the new configuration was sent
+        """
+        if self.config_queue is None:
+            print("set_crop() needs a running reader created with gray=True, a crop or adaptive=True")
+            return False
+        self.crop = self._clamp_crop(crop)
+        self._send_manip_config()
+        return True
+
+    def set_scale(self, scale):
+        """
+        Resize the (cropped) preview on the device without rebuilding the pipeline.
+        
+        Detections are reported in pixels of the resized frame. Frames still
+        in flight at the old size are dropped.
+        
+        Args:
+            scale (float): Output size relative to the crop, 1.0 for full resolution
+            
+        Returns:
+            bool: True if the new configuration was sent
+        """
+        if self.config_queue is None:
+            print("set_scale() needs a running reader created with gray=True, a crop or adaptive=True")
+            return False
+        self.scale = scale
+        self._send_manip_config()
+        return True
+
+    def _send_manip_config(self):
+        config = dai.ImageManipConfig()
+        self._configure_manip(config, self.crop)
+        self.config_queue.send(config)
+        self._config_pending = True
+        # Cached locations and scenes refer to the previous crop or size
+        if self.tracker is not None:
+            self.tracker.reset()
+        if self.change_detector is not None:
+            self.change_detector.reset()
+
+    def _frame_shape(self):
+        """Shape of the frames arriving from the device."""
+        width, height = self.preview_size
+        if self.crop is not None:
+            _, _, width, height = self.crop
+        if self.scale != 1.0:
+            width, height = max(1, int(width * self.scale)), max(1, int(height * self.scale))
+        return (height, width) if self.gray else (height, width, 3)
 
     def start_stream(self):
         """Start the camera stream."""
         try:
-            self.initialize_pipeline()
-            self.device = dai.Device(self.pipeline)
+            if self.device_manager is not None:
+                self.device = self.device_manager.start()
+            else:
+                self.initialize_pipeline()
+                self.device = dai.Device(self.pipeline)
             self.video_queue = self.device.getOutputQueue(
-                name="video", 
+                name=self.stream_name, 
                 maxSize=1, 
                 blocking=False
             )
+            if self.config_stream_name is not None:
+                self.config_queue = self.device.getInputQueue(self.config_stream_name)
+            if self.depth_stream_name is not None:
+                self.depth_queue = self.device.getOutputQueue(name=self.depth_stream_name,
+                                                              maxSize=1, blocking=False)
+                if self.intrinsics is None:
+                    width, height = self.preview_size
+                    self.intrinsics = np.array(self.device.readCalibration().getCameraIntrinsics(
+                        dai.CameraBoardSocket.RGB, width, height, keepAspectRatio=False))
+            if self.decode_workers > 0 and self.decode_pool is None:
+                self.decode_pool = QRDecodePool(workers=self.decode_workers,
+                                                frame_shape=self._frame_shape(),
+                                                decoder=self.decoder.name)
             self.running = True
             print("Camera stream started successfully")
         except Exception as e:
             print(f"Failed to start camera stream: {e}")
             self.running = False
 
-    def read_qr_code(self, display=False):
+    def decode_frame(self, frame):
+        """
+        Decode QR codes in a single frame.
+        
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame
+            
+        Returns:
+            list: QRDetection for every code found
+        """
+        if self.change_detector is not None:
+            cached = self.change_detector.lookup(frame)
+            if cached is not None:
+                return cached
+
+        if self.tracker is not None:
+            qr_codes = self.tracker.decode(frame)
+        else:
+            qr_codes = self.decoder.decode(frame)
+
+        if self.change_detector is not None:
+            self.change_detector.store(qr_codes)
+        return qr_codes
+
+    def _next_img_frame(self):
+        """
+        Next device frame to decode.
+        
+        Skips frames dropped by the host-side frame rate reduction and frames
+        produced with the previous crop or scale before a config change took
+        effect, so their detections are never mapped with the new geometry.
+        """
+        while True:
+            wait_start = time.perf_counter()
+            img_frame = self.video_queue.get()
+            self.metrics.observe_frame("qr", img_frame, wait_start, dai.Clock.now)
+            if self.adaptive is not None and not self.adaptive.should_process(img_frame.getSequenceNum()):
+                continue  # Host-side frame rate reduction
+            if self._config_pending:
+                if (img_frame.getHeight(), img_frame.getWidth()) != self._frame_shape()[:2]:
+                    continue  # Still in flight from before the config change
+                self._config_pending = False
+            return img_frame
+
+    def _adapt(self, decode_time, found, active):
+        """Feed one decode to the adaptive controller and apply a new level."""
+        if self.adaptive.record(decode_time, found, active):
+            self.set_scale(self.adaptive.scale)
+            print(f"Adaptive stream: scale {self.adaptive.scale}, "
+                  f"every {self.adaptive.decimation} frame(s)")
+
+    def _to_preview(self, qr_codes):
+        """Map detections from the (cropped, resized) frame back to preview pixels."""
+        if self.crop is None and self.scale == 1.0:
+            return qr_codes
+        offset_x, offset_y = (self.crop[0], self.crop[1]) if self.crop is not None else (0, 0)
+        mapped = []
+        for code in qr_codes:
+            x, y, w, h = code.rect
+            rect = (int(x / self.scale) + offset_x, int(y / self.scale) + offset_y,
+                    int(w / self.scale), int(h / self.scale))
+            polygon = [(int(px / self.scale) + offset_x, int(py / self.scale) + offset_y)
+                       for px, py in code.polygon]
+            mapped.append(QRDetection(code.data, rect, polygon))
+        return mapped
+
+    def detect(self):
+        """
+        Decode every QR code in the next frame and locate each one in 3D.
+
+        Needs a reader created with ``depth=True`` for positions; without
+        depth the codes are still returned with NaN depth and position.
+        Corners are in preview pixels whatever the crop and scale.
+        
+        Returns:
+            list: QRLocation per code found, empty if none or on error
+        """
+        if not self.running:
+            self.start_stream()
+        if not self.running:
+            return []
+
+        try:
+            img_frame = self._next_img_frame()
+            if self.frame_pool is None:
+                frame = img_frame.getCvFrame()
+            else:
+                frame = self.frame_pool.luma(img_frame)
+            skipped = self.change_detector.skipped if self.change_detector is not None else 0
+            start = time.perf_counter()
+            qr_codes = self.decode_frame(frame)
+            decode_time = time.perf_counter() - start
+            self.metrics.observe("decode_seconds", decode_time, stream="qr")
+            # Map with the geometry this frame was produced at, before adapting it
+            qr_codes = self._to_preview(qr_codes)
+            if self.adaptive is not None:
+                active = self.change_detector is None or self.change_detector.skipped == skipped
+                self._adapt(decode_time, bool(qr_codes), active)
+            if not qr_codes:
+                return []
+
+            region_stats = None
+            if self.depth_queue is not None:
+                # Newest depth frame; the code and the camera are assumed to be still
+                depth_frame = self.depth_queue.get()
+                self.region_stats.update(depth_frame.getFrame())
+                region_stats = self.region_stats
+            with self.metrics.timer("localize_seconds", stream="qr"):
+                return locate_codes(qr_codes, region_stats, self.intrinsics)
+        except Exception as e:
+            print(f"Error during QR code detection: {e}")
+            return []
+
+    def read_qr_code(self, display=False, stop_after_read=True, display_fps=30):
         """
         Read QR codes from the camera stream.
         
         Args:
             display (bool): Whether to show the camera feed
+            stop_after_read (bool): Stop the camera once a code is found; pass
+                False to keep it streaming for the next read
+            display_fps (float): Maximum redraw rate of the display window,
+                which is drawn from its own thread
             
         Returns:
             str: QR code data if found, None otherwise
@@ -62,28 +419,51 @@ class OakDQRCodeReader:
         if not self.running:
             self.start_stream()
             
+        sink = DisplaySink(max_fps=display_fps, metrics=self.metrics, stream="qr") if display else None
         try:
             while self.running:
-                frame = self.video_queue.get().getCvFrame()
-                qr_codes = decode(frame)
+                img_frame = self._next_img_frame()
+                if self.frame_pool is None:
+                    frame = img_frame.getCvFrame()
+                elif display or self.decode_pool is not None:
+                    frame = self.frame_pool.bgr(img_frame)
+                else:
+                    frame = self.frame_pool.luma(img_frame)  # Decoders only need luminance
+                if self.decode_pool is not None and frame.shape == self.decode_pool.frame_shape:
+                    # Results arrive in frame order, a few frames behind capture
+                    self.decode_pool.submit(frame)
+                    qr_codes = [code for _, codes in self.decode_pool.results() for code in codes]
+                else:
+                    # In-process, also for crops whose size differs from the pool's slots
+                    skipped = self.change_detector.skipped if self.change_detector is not None else 0
+                    start = time.perf_counter()
+                    qr_codes = self.decode_frame(frame)
+                    decode_time = time.perf_counter() - start
+                    self.metrics.observe("decode_seconds", decode_time, stream="qr")
+                    if self.adaptive is not None:
+                        active = self.change_detector is None or self.change_detector.skipped == skipped
+                        self._adapt(decode_time, bool(qr_codes), active)
                 
-                if display:
-                    cv2.imshow("OAK-D QR Code Scanner", frame)
+                key = -1
+                if sink is not None:
+                    sink.show("OAK-D QR Code Scanner", frame)
+                    key = sink.poll_key()
                 
                 for qr_code in qr_codes:
-                    data = qr_code.data.decode('utf-8')
+                    data = qr_code.data
                     print(f"QR Code Detected: {data}")
-                    self.stop_stream()
+                    if stop_after_read:
+                        self.stop_stream()
                     return data
                 
-                if display and cv2.waitKey(1) == ord('q'):
+                if key == ord('q'):
                     break
                     
         except Exception as e:
             print(f"Error during QR code scanning: {e}")
         finally:
-            if display:
-                cv2.destroyAllWindows()
+            if sink is not None:
+                sink.close()
                 
         print("No QR code detected")
         return None
@@ -91,9 +471,16 @@ class OakDQRCodeReader:
     def stop_stream(self):
         """Stop the camera stream and clean up resources."""
         self.running = False
-        if hasattr(self, 'device') and self.device:
-            self.device.close()
-        cv2.destroyAllWindows()
+        self.config_queue = None
+        self.depth_queue = None
+        if hasattr(self, 'device') and self.device and self.device_manager is None:
+            self.device.close()  # A shared device is closed by its manager
+        if self.decode_pool is not None:
+            self.decode_pool.close()
+            self.decode_pool = None
+        if self.change_detector is not None and self.change_detector.frames:
+            print(f"Static-scene skip ratio: {self.change_detector.skip_ratio:.1%} "
+                  f"({self.change_detector.skipped}/{self.change_detector.frames} frames)")
         print("Camera stream stopped")
 
     def __enter__(self):
@@ -112,4 +499,37 @@ if __name__ == "__main__":
         # Scan with display window
         qr_data = scanner.read_qr_code(display=True)
         if qr_data:
-            print(f"Successfully read QR code: {qr_data}")
\ No newline at end of file
+            print(f"Successfully read QR code: {qr_data}")
+
+    # ROI tracking: decode around the last code and rescan the full frame every 15 frames
+    with OakDQRCodeReader(preview_size=(640, 480), fps=30, tracking=True) as scanner:
+        qr_data = scanner.read_qr_code(display=True)
+
+    # Decode on 4 worker processes so decoding no longer caps the frame rate
+    with OakDQRCodeReader(preview_size=(640, 480), fps=60, decode_workers=4) as scanner:
+        qr_data = scanner.read_qr_code(display=True)
+
+    # Skip decoding while the scanning area is empty or not moving
+    with OakDQRCodeReader(preview_size=(640, 480), fps=30, skip_static=True) as scanner:
+        qr_data = scanner.read_qr_code(display=True)
+
+    # Let the reader lower resolution and frame rate while codes decode easily
+    with OakDQRCodeReader(preview_size=(1280, 720), fps=30, gray=True, adaptive=True, skip_static=True) as scanner:
+        qr_data = scanner.read_qr_code(display=True)
+
+    # Every code in view with its position from aligned depth: plan all picks from one scan
+    with OakDQRCodeReader(preview_size=(640, 400), fps=30, depth=True) as scanner:
+        codes = [code for code in scanner.detect() if np.isfinite(code.depth)]
+        for code in sorted(codes, key=lambda code: code.depth):
+            x, y, z = code.position
+            print(f"{code.data}: ({x:.3f}, {y:.3f}, {z:.3f}) m, depth spread {code.depth_std:.1f} mm")
+
+    # OpenCV decoder behind the finder-pattern prefilter (see scripts/benchmark_decoders.py)
+    with OakDQRCodeReader(preview_size=(640, 480), fps=30, decoder="prefilter+opencv_aruco") as scanner:
+        qr_data = scanner.read_qr_code(display=True)
+
+    # Grayscale, cropped to the conveyor on the device; move the crop as objects arrive
+    with OakDQRCodeReader(preview_size=(640, 480), fps=60, gray=True, crop=(160, 120, 320, 240)) as scanner:
+        qr_data = scanner.read_qr_code(display=True, stop_after_read=False)
+        scanner.set_crop((0, 120, 320, 240))
+        qr_data = scanner.read_qr_code(display=True)
@@ -0,0 +1,131 @@
+import numpy as np
+
+# Ray grids are keyed by (intrinsics, width, height, scale) and shared by every
+# generator, so each resolution is only computed once per process.
+_RAY_CACHE = {}
+
+
+def get_ray_grid(intrinsics, width, height, scale=0.001):
+    """
+    Per-pixel ray directions for a pinhole camera.
+
+    Multiplying the grid by a depth frame gives XYZ in the camera frame:
+    X = (u - cx) / fx * Z, Y = (v - cy) / fy * Z.
+
+    Args:
+        intrinsics (array-like): 3x3 camera matrix
+        width (int): Frame width in pixels
+        height (int): Frame height in pixels
+        scale (float): Depth unit to output unit factor (mm -> m by default)
+
+    Returns:
+        numpy.ndarray: (height, width, 3) float32 grid, read-only
+    """
+    matrix = np.asarray(intrinsics, dtype=np.float64).reshape(3, 3)
+    key = (tuple(np.round(matrix.ravel(), 6)), width, height, scale)
+    rays = _RAY_CACHE.get(key)
+    if rays is None:
+        fx, fy = matrix[0, 0], matrix[1, 1]
+        cx, cy = matrix[0, 2], matrix[1, 2]
+        rays = np.empty((height, width, 3), np.float32)
+        rays[:, :, 0] = ((np.arange(width) - cx) / fx * scale)[None, :]
+        rays[:, :, 1] = ((np.arange(height) - cy) / fy * scale)[:, None]
+        rays[:, :, 2] = scale
+        rays.flags.writeable = False
+        _RAY_CACHE[key] = rays
+    return rays
+
+
+def voxel_downsample(points, voxel_size):
+    """
+    Replace all points falling in the same voxel by their centroid.
+
+    Args:
+        points (numpy.ndarray): (N, 3) points
+        voxel_size (float): Voxel edge length in the units of ``points``
+
+    Returns:
+        numpy.ndarray: (M, 3) float32 centroids, M <= N
+    """
+    if len(points) == 0:
+        return points.reshape(0, 3).astype(np.float32)
+    cells = np.floor(points / voxel_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    extent = cells.max(axis=0) + 1
+    # Pack the three cell indices into one integer key
+    keys = (cells[:, 0] * extent[1] + cells[:, 1]) * extent[2] + cells[:, 2]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    centroids = np.empty((len(counts), 3), np.float32)
+    for axis in range(3):
+        centroids[:, axis] = np.bincount(inverse, weights=points[:, axis]) / counts
+    return centroids
+
+
+class PointCloudGenerator:
+    """Convert uint16 depth frames to XYZ using a cached ray grid.
+
+    Each frame costs one multiply of the depth into the ray grid, written into
+    a reused output buffer. Strides and ROIs are views into the cached grid,
+    so they need no extra precomputation.
+    """
+
+    def __init__(self, intrinsics, width, height, scale=0.001):
+        """
+        Initialize the generator.
+
+        Args:
+            intrinsics (array-like): 3x3 camera matrix for the depth frame
+            width (int): Depth frame width in pixels
+            height (int): Depth frame height in pixels
+            scale (float): Depth unit to output unit factor (mm -> m by default)
+        """
+        self.rays = get_ray_grid(intrinsics, width, height, scale)
+        self._out = None
+
+    def compute(self, depth, stride=1, roi=None):
+        """
+        Organized point cloud for a depth frame.
+
+        The returned array is reused by the next call; copy it to keep it.
+        Pixels without depth come out as (0, 0, 0).
+
+        Args:
+            depth (numpy.ndarray): uint16 depth frame
+            stride (int): Keep every ``stride``-th pixel in both directions
+            roi (tuple): Optional (x, y, width, height) region of the frame
+
+        Returns:
+            numpy.ndarray: (h, w, 3) float32 XYZ
+        """
+        rays = self.rays
+        if roi is not None:
+            x, y, w, h = roi
+            depth = depth[y:y + h, x:x + w]
+            rays = rays[y:y + h, x:x + w]
+        if stride > 1:
+            depth = depth[::stride, ::stride]
+            rays = rays[::stride, ::stride]
+
+        if self._out is None or self._out.shape != rays.shape:
+            self._out = np.empty(rays.shape, np.float32)
+        np.multiply(rays, depth[:, :, None], out=self._out)
+        return self._out
+
+    def points(self, depth, stride=1, roi=None, voxel_size=None):
+        """
+        Unorganized cloud of the valid pixels only.
+
+        Args:
+            depth (numpy.ndarray): uint16 depth frame
+            stride (int): Keep every ``stride``-th pixel in both directions
+            roi (tuple): Optional (x, y, width, height) region of the frame
+            voxel_size (float): Optional voxel grid size for downsampling
+
+        Returns:
+            numpy.ndarray: (N, 3) float32 XYZ
+        """
+        xyz = self.compute(depth, stride, roi)
+        points = xyz[xyz[:, :, 2] > 0]
+        if voxel_size:
+            points = voxel_downsample(points, voxel_size)
+        return points
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+from mirobot_kinematics import MIROBOT_DH, MIROBOT_JOINT_LIMITS, inverse_kinematics
+from sorting_poses import APPROACH_HEIGHT, SORTING_POSES
+
+# Joint solutions are memoized next to this module, whatever the working directory
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pose_cache.json")
+
+
+class PoseLibrary:
+    """Named cartesian targets with precomputed joint solutions.
+
+    Joint solutions come from the local Mirobot kinematics model and are
+    memoized in a JSON file keyed by the model and the target, so IK is only
+    solved once per target across runs. ``move()`` then sends a plain
+    ``writeangle`` joint-space move instead of asking the controller to solve
+    IK for a linear move. Solutions measured on the real arm can be stored
+    with ``teach()`` and take precedence over computed ones.
+    """
+
+    def __init__(self, poses=None, cache_path=DEFAULT_CACHE_PATH, dh=MIROBOT_DH, limits=MIROBOT_JOINT_LIMITS):
+        """
+        Initialize the library.
+
+        Args:
+            poses (dict): name -> [x, y, z, roll, pitch, yaw]
+            cache_path (str): JSON file for memoized joint solutions (None disables)
+            dh (tuple): DH table of the kinematics model
+            limits (tuple): Joint limits of the kinematics model
+        """
+        self.poses = {}
+        self.joint_solutions = {}
+        self.cache_path = cache_path
+        self.dh = dh
+        self.limits = limits
+        self.model_id = hashlib.sha1(repr((dh, limits)).encode()).hexdigest()[:12]
+        self._cache = {}
+        self._taught = {}
+        self._load_cache()
+        for name, coordinates in (poses or {}).items():
+            self.add(name, coordinates)
+
+    @staticmethod
+    def _key(coordinates):
+        return ",".join(f"{value:.2f}" for value in coordinates)
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable pose cache {self.cache_path}: {e}")
+            return
+        self._taught = data.get("taught", {})
+        if data.get("model") == self.model_id:
+            self._cache = data.get("solutions", {})
+
+    def save(self):
+        """Write the memoized and taught solutions to the cache file."""
+        if not self.cache_path:
+            return
+        with open(self.cache_path, "w") as f:
+            json.dump({"model": self.model_id, "solutions": self._cache, "taught": self._taught}, f, indent=1)
+
+    def add(self, name, coordinates):
+        """Add or replace a named cartesian target."""
+        self.poses[name] = list(coordinates)
+        self.joint_solutions.pop(name, None)
+
+    def teach(self, name, angles):
+        """Store joint angles measured on the arm for a named target."""
+        self._taught[self._key(self.poses[name])] = list(angles)
+        self.joint_solutions[name] = list(angles)
+
+    def joints(self, name):
+        """
+        Joint solution for a named target (solved and memoized on first use).
+
+        Returns:
+            list: Six joint angles in degrees, or None if the target is unreachable
+        """
+        if name in self.joint_solutions:
+            return self.joint_solutions[name]
+        key = self._key(self.poses[name])
+        angles = self._taught.get(key) or self._cache.get(key)
+        if angles is None:
+            angles = inverse_kinematics(self.poses[name], seed=self._nearest_seed(name),
+                                        dh=self.dh, limits=self.limits)
+            if angles is None:
+                print(f"No joint solution for pose '{name}': {self.poses[name]}")
+                return None
+            angles = [round(a, 3) for a in angles]
+            self._cache[key] = angles
+        self.joint_solutions[name] = angles
+        return angles
+
+    def _nearest_seed(self, name):
+        # Start IK from the solved target closest in space, if any
+        x, y, z = self.poses[name][:3]
+        best, best_distance = None, None
+        for other, angles in self.joint_solutions.items():
+            ox, oy, oz = self.poses[other][:3]
+            distance = (x - ox) ** 2 + (y - oy) ** 2 + (z - oz) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = angles, distance
+        return best
+
+    def precompute(self):
+        """Solve every target and save the cache. Returns the names that failed."""
+        failed = [name for name in self.poses if self.joints(name) is None]
+        self.save()
+        return failed
+
+    def move(self, robot, name, linear=False, **kwargs):
+        """
+        Move the robot to a named target.
+
+        Args:
+            robot: WlkataRobotController (or a simulated controller)
+            name (str): Target name
+            linear (bool): Use a controller-side linear move (straight-line path)
+                instead of the cached joint solution
+            **kwargs: Passed on to the controller (timeout, wait)
+        """
+        angles = None if linear else self.joints(name)
+        if angles is None:
+            robot.set_coordinates(self.poses[name], **kwargs)  # Linear is the default motion
+        else:
+            robot.set_joint_angles(angles, **kwargs)
+
+
+def sorting_pose_library(cache_path=DEFAULT_CACHE_PATH):
+    """PoseLibrary with the sorting targets and an approach pose above each of them."""
+    library = PoseLibrary(cache_path=cache_path)
+    for name, coordinates in SORTING_POSES.items():
+        library.add(name, coordinates)
+        if name != "scan":
+            above = list(coordinates)
+            above[2] += APPROACH_HEIGHT
+            library.add(f"{name}_approach", above)
+    return library
+
+
+if __name__ == "__main__":
+    library = sorting_pose_library()
+    failed = library.precompute()
+    for name in library.poses:
+        print(f"{name:>18}: {library.poses[name]} -> {library.joints(name)}")
+    if failed:
+        print(f"Unreachable targets: {failed}")
@@ -0,0 +1,224 @@
+import glob
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import urllib.request
+import cv2
+import numpy as np
+from qr_decoders import create_decoder
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+# Per-user cache, so runs from any directory share results and never litter a checkout
+DEFAULT_CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                  "oakd_qr", "qr_cache.sqlite")
+
+
+def expand_paths(patterns, recursive=True):
+    """
+    Image files from files, directories and glob patterns.
+
+    Args:
+        patterns (list): Paths, directories or globs ("frames/**/*.png")
+        recursive (bool): Descend into subdirectories of directories
+
+    Returns:
+        list: Sorted unique file paths
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*") if recursive else os.path.join(pattern, "*")
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS):
+                paths.add(path)
+    return sorted(paths)
+
+
+class DecodeCache:
+    """SQLite index of decode results keyed by image content hash.
+
+    Results are stored per (content hash, decoder), so renamed or copied
+    frames are still hits. A second table remembers the hash of every path
+    with its size and modification time; unchanged files are then looked up
+    without being read at all.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, readonly=False):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): SQLite file, ":memory:" for a throwaway cache
+            readonly (bool): Open an existing cache for lookups only (used by
+                the decode workers next to the writing parent)
+        """
+        self.path = path
+        if readonly:
+            uri = f"file:{urllib.request.pathname2url(os.path.abspath(path))}?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True)
+            return
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results "
+                                "(hash TEXT, decoder TEXT, codes TEXT, PRIMARY KEY (hash, decoder))")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS files "
+                                "(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT)")
+        self.connection.commit()
+
+    def known_hash(self, path, stat):
+        """Content hash recorded for ``path`` if its size and mtime are unchanged."""
+        row = self.connection.execute("SELECT size, mtime_ns, hash FROM files WHERE path = ?",
+                                      (os.path.abspath(path),)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        return None
+
+    def get(self, content_hash, decoder):
+        """
+        Returns:
+            list: Cached code dicts, None on a miss
+        """
+        row = self.connection.execute("SELECT codes FROM results WHERE hash = ? AND decoder = ?",
+                                      (content_hash, decoder)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, path, stat, content_hash, decoder, codes):
+        """Store a result (committed by ``commit()``)."""
+        self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, content_hash))
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                (content_hash, decoder, json.dumps(codes)))
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close()
+
+
+_worker_decoder = None
+_worker_decoder_name = None
+_worker_cache = None
+
+
+def _init_worker(decoder_name, cache_path):
+    global _worker_decoder, _worker_decoder_name, _worker_cache
+    _worker_decoder = create_decoder(decoder_name)
+    _worker_decoder_name = decoder_name
+    if cache_path is not None and cache_path != ":memory:":
+        _worker_cache = DecodeCache(cache_path, readonly=True)
+
+
+def content_hash(data):
+    """Hash of a file's bytes used as the cache key."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _decode_file(path):
+    """Worker: read a file once, hash its bytes and decode it unless the content is cached."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = content_hash(data)
+        if _worker_cache is not None:
+            codes = _worker_cache.get(digest, _worker_decoder_name)
+            if codes is not None:
+                return path, digest, codes, None, True  # Touched, renamed or copied frame
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return path, digest, None, "unreadable image", False
+        codes = [{'data': code.data, 'rect': list(code.rect), 'polygon': [list(p) for p in code.polygon]}
+                 for code in _worker_decoder.decode(image)]
+        return path, digest, codes, None, False
+    except Exception as e:
+        return path, None, None, str(e), False
+
+
+def decode_files(paths, decoder="pyzbar", workers=None, cache=None, chunksize=8, commit_every=256):
+    """
+    Decode every code in many image files on a process pool.
+
+    Files whose path, size and mtime are in the cache are yielded first
+    without being read. Every other file is read and hashed once, by a
+    worker, which looks the content up in the cache before decoding, so
+    touched, renamed or copied frames are still cache hits. Those results
+    arrive in completion order.
+
+    Args:
+        paths (list): Image file paths (see ``expand_paths``)
+        decoder (str): Backend name from ``qr_decoders``
+        workers (int): Worker processes, default one per CPU
+        cache (DecodeCache): Result cache, None to decode everything
+        chunksize (int): Files handed to a worker at a time
+        commit_every (int): New results between cache commits
+
+    Yields:
+        dict: 'path', 'hash', 'codes' (list of {'data', 'rect', 'polygon'}),
+        'cached' and 'error' (None unless the file could not be decoded)
+    """
+    pending = []
+    stats = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            yield {'path': path, 'hash': None, 'codes': [], 'cached': False, 'error': str(e)}
+            continue
+        if cache is not None:
+            digest = cache.known_hash(path, stat)
+            codes = cache.get(digest, decoder) if digest is not None else None
+            if codes is not None:
+                yield {'path': path, 'hash': digest, 'codes': codes, 'cached': True, 'error': None}
+                continue
+        stats[path] = stat
+        pending.append(path)
+    if not pending:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    new_results = 0
+    cache_path = cache.path if cache is not None else None
+    if cache is not None:
+        cache.commit()  # Workers only see committed rows
+    with mp.Pool(min(workers, len(pending)), initializer=_init_worker, initargs=(decoder, cache_path)) as pool:
+        for path, digest, codes, error, cached in pool.imap_unordered(_decode_file, pending, chunksize):
+            if error is None and cache is not None:
+                cache.put(path, stats[path], digest, decoder, codes)  # Also records the new size and mtime
+                new_results += 1
+                if new_results % commit_every == 0:
+                    cache.commit()
+            yield {'path': path, 'hash': digest, 'codes': codes or [], 'cached': cached, 'error': error}
+    if cache is not None:
+        cache.commit()
+
+
+def write_jsonl(results, f):
+    """
+    Stream results to a file object as one JSON object per line.
+
+    Returns:
+        dict: 'images', 'codes', 'cached' and 'errors' counts
+    """
+    summary = {'images': 0, 'codes': 0, 'cached': 0, 'errors': 0}
+    for result in results:
+        f.write(json.dumps(result) + "\n")
+        summary['images'] += 1
+        summary['codes'] += len(result['codes'])
+        summary['cached'] += result['cached']
+        summary['errors'] += result['error'] is not None
+    return summary
@@ -0,0 +1,183 @@
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from qr_decoders import create_decoder
+
+WORKER_CHECK_INTERVAL = 0.5  # Seconds between liveness checks while waiting for results
+
+
+def _decode_worker(shm_name, frame_shape, slot_count, task_queue, result_queue, decoder_name):
+    """Worker process: decode frames from shared-memory slots until told to stop."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((slot_count,) + frame_shape, dtype=np.uint8, buffer=shm.buf)
+    decoder = create_decoder(decoder_name)
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            frame_id, slot = task
+            try:
+                detections = decoder.decode(frames[slot])
+            except Exception as e:
+                print(f"Decode worker error on frame {frame_id}: {e}")
+                detections = []
+            result_queue.put((frame_id, slot, detections))
+    finally:
+        del frames  # Release the buffer export before closing the mapping
+        shm.close()
+
+
+class QRDecodePool:
+    """Decode QR codes on a pool of worker processes.
+
+    Frames are copied into slots of a shared-memory block and only the
+    (frame_id, slot) pair travels through the task queue. Results are handed
+    back in submission order, each tagged with its frame id.
+    """
+
+    def __init__(self, workers=2, frame_shape=(480, 640, 3), slots=None, decoder="pyzbar"):
+        """
+        Initialize the pool and start the worker processes.
+
+        Args:
+            workers (int): Number of decode processes
+            frame_shape (tuple): Shape of every submitted frame (height, width, channels)
+            slots (int): Number of shared-memory frame slots (default 2 per worker)
+            decoder (str): Backend name from ``qr_decoders`` each worker creates
+        """
+        self.workers = workers
+        self.frame_shape = tuple(frame_shape)
+        self.slot_count = slots or 2 * workers
+        frame_bytes = int(np.prod(self.frame_shape))
+        self._shm = shared_memory.SharedMemory(create=True, size=frame_bytes * self.slot_count)
+        self._frames = np.ndarray((self.slot_count,) + self.frame_shape, dtype=np.uint8,
+                                  buffer=self._shm.buf)
+        self._free_slots = list(range(self.slot_count))
+        self._tasks = mp.Queue()
+        self._results = mp.Queue()
+        self._ready = {}
+        self._next_id = 0
+        self._next_result = 0
+        self._processes = [
+            mp.Process(target=_decode_worker,
+                       args=(self._shm.name, self.frame_shape, self.slot_count,
+                             self._tasks, self._results, decoder),
+                       daemon=True)
+            for _ in range(workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    @property
+    def pending(self):
+        """Number of submitted frames whose result has not been returned yet."""
+        return self._next_id - self._next_result
+
+    def submit(self, frame):
+        """
+        Copy a frame into a free slot and queue it for decoding.
+
+        Blocks while every slot is in use by a worker.
+
+        Args:
+            frame (numpy.ndarray): Frame with shape ``frame_shape``
+
+        Returns:
+            int: Frame id used to tag the result
+
+        Raises:
+            RuntimeError: If a worker process died, since its slot never comes back
+        """
+        while not self._free_slots:
+            self._collect_until(None)
+        slot = self._free_slots.pop()
+        np.copyto(self._frames[slot], frame)
+        frame_id = self._next_id
+        self._next_id += 1
+        self._tasks.put((frame_id, slot))
+        return frame_id
+
+    def get_result(self, timeout=None):
+        """
+        Get the next result in frame order.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds, None waits forever,
+                0 returns immediately
+
+        Returns:
+            tuple: (frame_id, detections), or None if nothing is outstanding
+            or the result is not ready within the timeout
+
+        Raises:
+            RuntimeError: If a worker process died while waiting
+        """
+        if self._next_result >= self._next_id:
+            return None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._next_result not in self._ready:
+            try:
+                self._collect_until(deadline)
+            except queue.Empty:
+                return None
+        frame_id = self._next_result
+        self._next_result += 1
+        return frame_id, self._ready.pop(frame_id)
+
+    def results(self):
+        """Yield every (frame_id, detections) that is ready, in frame order, without blocking."""
+        while True:
+            result = self.get_result(timeout=0)
+            if result is None:
+                return
+            yield result
+
+    def _collect_until(self, deadline):
+        """Collect one result by ``deadline`` (None: no limit), raising if a worker has died."""
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            wait = WORKER_CHECK_INTERVAL if remaining is None else min(remaining, WORKER_CHECK_INTERVAL)
+            try:
+                self._collect(wait)
+                return
+            except queue.Empty:
+                dead = [process for process in self._processes if not process.is_alive()]
+                if dead:
+                    raise RuntimeError(f"QR decode worker exited with code {dead[0].exitcode}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+    def _collect(self, timeout):
+        if timeout == 0:
+            frame_id, slot, detections = self._results.get_nowait()
+        else:
+            frame_id, slot, detections = self._results.get(timeout=timeout)
+        self._free_slots.append(slot)
+        self._ready[frame_id] = detections
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._shm is None:
+            return
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.close()
@@ -0,0 +1,348 @@
+import collections
+import time
+import cv2
+import numpy as np
+
+try:
+    from pyzbar.pyzbar import ZBarSymbol, decode as zbar_decode
+except ImportError:  # libzbar missing: the OpenCV backends still work
+    ZBarSymbol = None
+    zbar_decode = None
+
+# data: decoded string, rect: (left, top, width, height), polygon: [(x, y), ...]
+# Coordinates are always in full-frame pixels.
+QRDetection = collections.namedtuple("QRDetection", ["data", "rect", "polygon"])
+
+
+def _to_detections(codes, offset, scale):
+    """QRDetection list from (data, corner points) pairs in image pixels."""
+    ox, oy = offset
+    detections = []
+    for data, points in codes:
+        polygon = [(int(x * scale) + ox, int(y * scale) + oy) for x, y in points]
+        xs = [x for x, _ in polygon]
+        ys = [y for _, y in polygon]
+        detections.append(QRDetection(data, (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)), polygon))
+    return detections
+
+
+def decode_qr(image, offset=(0, 0), scale=1.0, symbols=None):
+    """
+    Decode codes in an image with pyzbar.
+
+    Args:
+        image (numpy.ndarray): BGR or grayscale image (may be a crop or a
+            downscaled copy of the full frame)
+        offset (tuple): (x, y) of the image origin in the full frame
+        scale (float): Factor mapping image pixels back to full-frame pixels
+        symbols (list): pyzbar symbol types to look for, None for all
+
+    Returns:
+        list: QRDetection for every code found
+    """
+    if zbar_decode is None:
+        raise RuntimeError("pyzbar is not available (pip install pyzbar and install the zbar library)")
+    ox, oy = offset
+    detections = []
+    for code in zbar_decode(image, symbols=symbols):
+        left, top, width, height = code.rect
+        detections.append(QRDetection(
+            code.data.decode('utf-8'),
+            (int(left * scale) + ox, int(top * scale) + oy,
+             int(width * scale), int(height * scale)),
+            [(int(x * scale) + ox, int(y * scale) + oy) for x, y in code.polygon],
+        ))
+    return detections
+
+
+class PyzbarDecoder:
+    """ZBar: robust on blur and small codes, the original decoder."""
+
+    name = "pyzbar"
+
+    def __init__(self, symbols=None):
+        """
+        Args:
+            symbols (list): pyzbar symbol types (ZBarSymbol or names such as
+                "QRCODE") to look for, None for all
+        """
+        if zbar_decode is None:
+            raise RuntimeError("pyzbar is not available (pip install pyzbar and install the zbar library)")
+        self.symbols = [ZBarSymbol[symbol] if isinstance(symbol, str) else symbol
+                        for symbol in symbols] if symbols else None
+
+    def decode(self, image, offset=(0, 0), scale=1.0):
+        """
+        Decode every code in an image.
+
+        Args:
+            image (numpy.ndarray): BGR or grayscale image
+            offset (tuple): (x, y) of the image origin in the full frame
+            scale (float): Factor mapping image pixels back to full-frame pixels
+
+        Returns:
+            list: QRDetection for every code found
+        """
+        return decode_qr(image, offset, scale, self.symbols)
+
+
+class OpenCVDecoder:
+    """OpenCV's QRCodeDetector (classic finder-pattern detector)."""
+
+    name = "opencv"
+
+    def __init__(self):
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image, offset=(0, 0), scale=1.0):
+        """Same as ``PyzbarDecoder.decode``."""
+        try:
+            found, texts, points, _ = self.detector.detectAndDecodeMulti(image)
+        except cv2.error:
+            return []  # Degenerate candidate quads can trip internal assertions
+        if not found or points is None:
+            return []
+        # Codes that were located but could not be decoded come back as ''
+        return _to_detections([(text, corners) for text, corners in zip(texts, points) if text],
+                              offset, scale)
+
+
+class OpenCVArucoDecoder(OpenCVDecoder):
+    """OpenCV's QRCodeDetectorAruco: ArUco-based corner detection, better under
+    perspective and uneven lighting (OpenCV 4.8 or newer)."""
+
+    name = "opencv_aruco"
+
+    def __init__(self):
+        if not hasattr(cv2, "QRCodeDetectorAruco"):
+            raise RuntimeError(f"QRCodeDetectorAruco needs OpenCV 4.8 or newer (found {cv2.__version__})")
+        self.detector = cv2.QRCodeDetectorAruco()
+
+
+def count_finder_patterns(gray, max_side=320, min_size=5, min_contrast=20):
+    """
+    Count candidate QR finder patterns (three nested squares) in an image.
+
+    Runs on a downscaled copy: one adaptive threshold and one contour pass,
+    a fraction of the cost of a decode attempt.
+
+    Args:
+        gray (numpy.ndarray): BGR or grayscale image
+        max_side (int): Longest side of the analysed copy
+        min_size (int): Smallest outer square side in pixels of that copy
+        min_contrast (int): Gray levels a pixel must be below its
+            neighbourhood mean to count as dark; keeps sensor noise from
+            flooding the contour pass
+
+    Returns:
+        int: Number of contours with two nested levels inside, roughly square
+    """
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+    factor = max_side / max(height, width)
+    if factor < 1.0:
+        gray = cv2.resize(gray, (max(1, int(width * factor)), max(1, int(height * factor))),
+                          interpolation=cv2.INTER_AREA)
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 31, min_contrast)
+    contours, hierarchy = cv2.findContours(binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return 0
+    child = hierarchy[0][:, 2]
+    nested = np.flatnonzero((child >= 0) & (hierarchy[0][np.maximum(child, 0), 2] >= 0))
+    count = 0
+    for i in nested:
+        _, _, w, h = cv2.boundingRect(contours[i])
+        if min(w, h) >= min_size and max(w, h) <= 2 * min(w, h):
+            count += 1
+    return count
+
+
+class PrefilteredDecoder:
+    """Run an expensive decoder only on frames that contain finder patterns.
+
+    Frames without at least ``min_patterns`` finder-pattern candidates return
+    no codes without decoding. A code needs three finder patterns; the
+    default of two still lets a partly occluded code through.
+    """
+
+    def __init__(self, decoder, min_patterns=2, max_side=320):
+        """
+        Args:
+            decoder: Backend to run on frames that pass the filter
+            min_patterns (int): Finder-pattern candidates needed to decode
+            max_side (int): Longest side of the copy the filter analyses
+        """
+        self.decoder = decoder
+        self.min_patterns = min_patterns
+        self.max_side = max_side
+        self.name = f"prefilter+{decoder.name}"
+        self.checked = 0
+        self.skipped = 0
+
+    def decode(self, image, offset=(0, 0), scale=1.0):
+        """Same as ``PyzbarDecoder.decode``."""
+        self.checked += 1
+        if count_finder_patterns(image, self.max_side) < self.min_patterns:
+            self.skipped += 1
+            return []
+        return self.decoder.decode(image, offset, scale)
+
+
+DECODERS = {
+    "pyzbar": PyzbarDecoder,
+    "opencv": OpenCVDecoder,
+    "opencv_aruco": OpenCVArucoDecoder,
+}
+
+
+def create_decoder(name="pyzbar", symbols=None):
+    """
+    Create a decoder backend by name.
+
+    Args:
+        name (str): One of ``DECODERS``, optionally prefixed with
+            ``"prefilter+"`` (e.g. ``"prefilter+opencv"``); a decoder object
+            is returned unchanged
+        symbols (list): Symbol types for pyzbar (e.g. ``["QRCODE"]``); the
+            OpenCV backends only ever find QR codes
+
+    Returns:
+        Decoder with ``name`` and ``decode(image, offset, scale)``
+    """
+    if not isinstance(name, str):
+        return name
+    if name.startswith("prefilter+"):
+        return PrefilteredDecoder(create_decoder(name[len("prefilter+"):], symbols))
+    if name not in DECODERS:
+        raise ValueError(f"Unknown decoder '{name}', choose from {', '.join(DECODERS)}")
+    if name == "pyzbar":
+        return PyzbarDecoder(symbols)
+    return DECODERS[name]()
+
+
+def available_decoders(prefilter=True):
+    """
+    Names of the backends that can be created in this environment.
+
+    Args:
+        prefilter (bool): Also list the prefiltered variant of each backend
+
+    Returns:
+        list: Decoder names
+    """
+    names = []
+    for name in DECODERS:
+        try:
+            create_decoder(name)
+        except RuntimeError:
+            continue
+        names.append(name)
+    if prefilter:
+        names += [f"prefilter+{name}" for name in list(names)]
+    return names
+
+
+def match_detections(detections, truth):
+    """
+    Pair detections with ground-truth codes, each code at most once.
+
+    A detection matches a code with the same data whose 'polygon' contains
+    the detection's centre; codes without a polygon match on data alone.
+    Two codes with the same data in one frame therefore count separately.
+
+    Args:
+        detections (list): QRDetection list of one frame
+        truth (list): Expected codes of that frame, dicts with 'data' and
+            optionally 'polygon' (corners in frame pixels), or plain strings
+
+    Returns:
+        tuple: (hits, false_codes) counts
+    """
+    remaining = [{'data': code} if isinstance(code, str) else code for code in truth]
+    hits = 0
+    for detection in detections:
+        center = tuple(float(v) for v in np.mean(detection.polygon, axis=0)) if detection.polygon else None
+        for i, code in enumerate(remaining):
+            if code['data'] != detection.data:
+                continue
+            if code.get('polygon') is not None and (center is None or cv2.pointPolygonTest(
+                    np.asarray(code['polygon'], np.float32), center, False) < 0):
+                continue
+            del remaining[i]
+            hits += 1
+            break
+    return hits, len(detections) - hits
+
+
+def benchmark_decoders(frames, expected=None, names=None, repeat=1):
+    """
+    Decode latency and hit rate of several backends on the same frames.
+
+    Args:
+        frames (list): BGR or grayscale images
+        expected (list): Expected codes per frame, as accepted by
+            ``match_detections`` (strings, or dicts with 'data' and
+            'polygon'); None uses the union of what all backends decode as
+            the reference
+        names (list): Decoder names, default ``available_decoders()``
+        repeat (int): Passes over the frames per backend (latency only)
+
+    Returns:
+        list: One dict per backend with 'name', 'mean_ms', 'p90_ms',
+        'hit_rate' (fraction of expected codes found), 'false_codes' and
+        'frames'
+    """
+    names = names or available_decoders()
+    decoders = [create_decoder(name) for name in names]
+    found = {}
+    times = {}
+    for decoder in decoders:
+        decoder.decode(frames[0])  # Warm up
+        durations = []
+        results = []
+        for _ in range(max(1, repeat)):
+            results = []
+            for frame in frames:
+                start = time.perf_counter()
+                codes = decoder.decode(frame)
+                durations.append(time.perf_counter() - start)
+                results.append(codes)
+        found[decoder.name] = results
+        times[decoder.name] = np.array(durations)
+
+    if expected is None:
+        expected = [sorted(set().union(*({code.data for code in found[decoder.name][i]} for decoder in decoders)))
+                    for i in range(len(frames))]
+    total = sum(len(codes) for codes in expected)
+
+    report = []
+    for decoder in decoders:
+        matches = [match_detections(codes, truth) for codes, truth in zip(found[decoder.name], expected)]
+        hits = sum(hit for hit, _ in matches)
+        report.append({
+            'name': decoder.name,
+            'mean_ms': float(times[decoder.name].mean() * 1000),
+            'p90_ms': float(np.percentile(times[decoder.name], 90) * 1000),
+            'hit_rate': hits / total if total else 1.0,
+            'false_codes': sum(false for _, false in matches),
+            'frames': len(frames),
+        })
+    return report
+
+
+def select_decoder(report, min_hit_rate=0.95):
+    """
+    Fastest backend that finds at least ``min_hit_rate`` of the codes.
+
+    Args:
+        report (list): Output of ``benchmark_decoders``
+        min_hit_rate (float): Required fraction of expected codes
+
+    Returns:
+        str: Decoder name; the most accurate one if none reaches the rate
+    """
+    accurate = [entry for entry in report if entry['hit_rate'] >= min_hit_rate]
+    if accurate:
+        return min(accurate, key=lambda entry: entry['mean_ms'])['name']
+    return max(report, key=lambda entry: (entry['hit_rate'], -entry['mean_ms']))['name']
@@ -0,0 +1,54 @@
+import collections
+import numpy as np
+
+# data: decoded string, polygon: [(x, y), ...] corners and center: (u, v) in
+# preview pixels, depth: median depth in mm, depth_std: spread of the depth over
+# the code in mm, position: (x, y, z) in metres in the RGB camera frame.
+# depth and position are NaN where the code has no valid depth.
+QRLocation = collections.namedtuple("QRLocation", ["data", "polygon", "center", "depth", "depth_std", "position"])
+
+
+def locate_codes(detections, region_stats, intrinsics, samples=8, scale=0.001):
+    """
+    3D position of every detected code from a depth frame aligned to the image.
+
+    All codes are handled in one vectorized pass: the depth of each code is
+    the median over a sample grid inside its bounding box, and its center is
+    back-projected through the pinhole intrinsics.
+
+    Args:
+        detections (list): QRDetection in pixels of the depth frame
+        region_stats (DepthRegionStats): Updated with the aligned depth frame,
+            None when there is no depth (depth and position are then NaN)
+        intrinsics (array-like): 3x3 camera matrix for that resolution
+        samples (int): Grid points per box side for the median
+        scale (float): Depth unit to output unit factor (mm -> m by default)
+
+    Returns:
+        list: QRLocation per detection, in the same order
+    """
+    if not detections:
+        return []
+    boxes = np.array([code.rect for code in detections], dtype=np.int64)
+    centers = np.array([np.mean(code.polygon, axis=0) if code.polygon else
+                        (code.rect[0] + code.rect[2] / 2, code.rect[1] + code.rect[3] / 2)
+                        for code in detections], dtype=np.float64)
+
+    if region_stats is None or intrinsics is None:
+        depth = np.full(len(detections), np.nan)
+        depth_std = np.full(len(detections), np.nan)
+        intrinsics = np.eye(3)
+    else:
+        depth = region_stats.medians(boxes, samples).astype(np.float64)
+        depth_std = region_stats.query(boxes)['std']
+
+    matrix = np.asarray(intrinsics, dtype=np.float64).reshape(3, 3)
+    z = depth * scale
+    x = (centers[:, 0] - matrix[0, 2]) / matrix[0, 0] * z
+    y = (centers[:, 1] - matrix[1, 2]) / matrix[1, 1] * z
+    positions = np.stack([x, y, z], axis=1)
+
+    return [
+        QRLocation(code.data, list(code.polygon), tuple(center), float(d), float(s), tuple(position))
+        for code, center, d, s, position in zip(detections, centers.tolist(), depth, depth_std, positions.tolist())
+    ]
@@ -0,0 +1,316 @@
+import functools
+import json
+import multiprocessing as mp
+import os
+import cv2
+import numpy as np
+import qrcode
+
+QUIET_ZONE = 4  # Modules of white border around every code
+
+# Corpus layout:
+#   <path>              encoded frames (JPEG by default) back to back
+#   <path>.idx          one ARCHIVE_INDEX_DTYPE record (byte offset, length) per frame
+#   <path>.truth.jsonl  ground truth, one JSON line per frame
+ARCHIVE_INDEX_DTYPE = np.dtype([("offset", "<u8"), ("length", "<u4")])
+
+
+@functools.lru_cache(maxsize=64)
+def code_modules(data, error_correction=qrcode.constants.ERROR_CORRECT_M):
+    """
+    QR module matrix of a string, quiet zone included.
+
+    Returns:
+        numpy.ndarray: bool array, True for dark modules
+    """
+    qr = qrcode.QRCode(error_correction=error_correction, box_size=1, border=QUIET_ZONE)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return np.array(qr.get_matrix(), dtype=bool)
+
+
+class SceneGenerator:
+    """Render QR labels into synthetic camera frames with known corners.
+
+    Every frame gets a shaded, cluttered background and up to
+    ``codes_per_frame`` printed labels placed without overlap under a random
+    rotation, perspective and scale; then, at random, partial occlusion,
+    glare, blur and sensor noise. Frame ``i`` depends only on ``(seed, i)``,
+    so a corpus is reproducible whatever the number of worker processes.
+
+    Labels are drawn with replacement, so a frame often holds the same label
+    more than once; the ground truth tells those codes apart by their
+    polygons (see ``qr_decoders.match_detections``), not by their data.
+    """
+
+    def __init__(self, labels=("engine", "gearbox"), size=(640, 480), seed=0, codes_per_frame=(1, 3),
+                 empty_ratio=0.1, side_range=(60, 220), perspective=0.15, occlusion=0.2, glare=0.3,
+                 blur=0.5, noise=(2.0, 10.0), clutter=8):
+        """
+        Initialize the generator.
+
+        Args:
+            labels (tuple): Strings to encode; each code picks one at random
+            size (tuple): Frame (width, height), the camera preview resolution
+            seed (int): Corpus seed
+            codes_per_frame (tuple): (min, max) codes in a non-empty frame
+            empty_ratio (float): Share of frames without any code
+            side_range (tuple): (min, max) side of a code in pixels
+            perspective (float): Corner jitter as a fraction of the code side
+            occlusion (float): Probability that a code is partly covered
+            glare (float): Probability of a specular highlight in a frame
+            blur (float): Probability of focus or motion blur in a frame
+            noise (tuple): (min, max) standard deviation of the sensor noise
+            clutter (int): Maximum number of background shapes
+        """
+        self.labels = tuple(labels)
+        self.size = tuple(size)
+        self.seed = seed
+        self.codes_per_frame = codes_per_frame
+        self.empty_ratio = empty_ratio
+        self.side_range = side_range
+        self.perspective = perspective
+        self.occlusion = occlusion
+        self.glare = glare
+        self.blur = blur
+        self.noise = noise
+        self.clutter = clutter
+
+    def _background(self, rng):
+        width, height = self.size
+        shading = cv2.resize(rng.uniform(-40, 40, (3, 4)).astype(np.float32), (width, height),
+                             interpolation=cv2.INTER_CUBIC)
+        gray = np.clip(rng.uniform(70, 190) + shading, 0, 255).astype(np.uint8)
+        frame = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        for _ in range(int(rng.integers(0, self.clutter + 1))):
+            color = tuple(int(c) for c in rng.integers(0, 256, 3))
+            x0, x1 = sorted(int(v) for v in rng.integers(0, width, 2))
+            y0, y1 = sorted(int(v) for v in rng.integers(0, height, 2))
+            if rng.random() < 0.5:
+                cv2.rectangle(frame, (x0, y0), (x1, y1), color, -1 if rng.random() < 0.5 else int(rng.integers(1, 6)))
+            else:
+                cv2.line(frame, (x0, y0), (x1, y1), color, int(rng.integers(1, 8)))
+        return frame
+
+    def _place_code(self, frame, data, rng, taken):
+        """Warp one label into the frame; returns its corner polygon or None if it did not fit."""
+        width, height = self.size
+        modules = code_modules(data)
+        n = modules.shape[0]
+        ink, paper = rng.uniform(10, 70), rng.uniform(170, 250)
+        pixels_per_module = 4
+        label = np.where(modules, ink, paper).astype(np.uint8)
+        label = cv2.resize(label, (n * pixels_per_module, n * pixels_per_module), interpolation=cv2.INTER_NEAREST)
+
+        for _ in range(20):
+            # Side of the symbol without the quiet zone
+            side = rng.uniform(*self.side_range)
+            outer = side * n / (n - 2 * QUIET_ZONE)
+            angle = rng.uniform(0, 2 * np.pi)
+            center = np.array([rng.uniform(outer / 2, width - outer / 2), rng.uniform(outer / 2, height - outer / 2)])
+            unit = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]]) * outer
+            rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+            corners = unit @ rotation.T + center + rng.uniform(-1, 1, (4, 2)) * self.perspective * outer
+            x0, y0 = corners.min(axis=0)
+            x1, y1 = corners.max(axis=0)
+            if x0 < 0 or y0 < 0 or x1 >= width or y1 >= height:
+                continue
+            if any(x0 < bx1 and bx0 < x1 and y0 < by1 and by0 < y1 for bx0, by0, bx1, by1 in taken):
+                continue
+            taken.append((x0, y0, x1, y1))
+
+            size = n * pixels_per_module
+            source = np.float32([[0, 0], [size, 0], [size, size], [0, size]])
+            homography = cv2.getPerspectiveTransform(source, corners.astype(np.float32))
+            # Transparent border: pixels outside the label keep the background
+            cv2.warpPerspective(cv2.cvtColor(label, cv2.COLOR_GRAY2BGR), homography, (width, height), dst=frame,
+                                flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_TRANSPARENT)
+
+            inner = QUIET_ZONE * pixels_per_module
+            symbol = np.float32([[[inner, inner], [size - inner, inner],
+                                  [size - inner, size - inner], [inner, size - inner]]])
+            return cv2.perspectiveTransform(symbol, homography)[0]
+        return None
+
+    def _occlude(self, frame, polygon, rng):
+        """Cover a strip along one side of the code; returns the covered share of its bounding box."""
+        x0, y0 = polygon.min(axis=0).astype(int)
+        x1, y1 = polygon.max(axis=0).astype(int)
+        fraction = rng.uniform(0.1, 0.35)
+        side = int(rng.integers(4))
+        if side == 0:
+            box = (x0, y0, int(x0 + (x1 - x0) * fraction), y1)
+        elif side == 1:
+            box = (int(x1 - (x1 - x0) * fraction), y0, x1, y1)
+        elif side == 2:
+            box = (x0, y0, x1, int(y0 + (y1 - y0) * fraction))
+        else:
+            box = (x0, int(y1 - (y1 - y0) * fraction), x1, y1)
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.rectangle(frame, box[:2], box[2:], color, -1)
+        return fraction
+
+    def render(self, index):
+        """
+        Render frame ``index`` of the corpus.
+
+        Returns:
+            tuple: (BGR frame, truth dict with 'frame', 'codes' (each with
+            'data', 'polygon' of the symbol corners in frame pixels and
+            'occlusion'), 'blur', 'glare' and 'noise'); match detections
+            to 'codes' by polygon, the data may repeat within a frame
+        """
+        rng = np.random.default_rng((self.seed, index))
+        frame = self._background(rng)
+        codes = []
+        if rng.random() >= self.empty_ratio:
+            taken = []
+            for _ in range(int(rng.integers(self.codes_per_frame[0], self.codes_per_frame[1] + 1))):
+                data = self.labels[int(rng.integers(len(self.labels)))]
+                polygon = self._place_code(frame, data, rng, taken)
+                if polygon is None:
+                    continue
+                occlusion = self._occlude(frame, polygon, rng) if rng.random() < self.occlusion else 0.0
+                codes.append({'data': data, 'polygon': np.round(polygon.astype(np.float64), 1).tolist(),
+                              'occlusion': round(occlusion, 3)})
+
+        frame = frame.astype(np.float32)
+        frame *= rng.uniform(0.85, 1.15, 3)  # Gain and white balance
+        glare = 0.0
+        if rng.random() < self.glare:
+            width, height = self.size
+            sigma = rng.uniform(20, 90)
+            x = np.arange(width, dtype=np.float32) - rng.uniform(0, width)
+            y = np.arange(height, dtype=np.float32) - rng.uniform(0, height)
+            glare = rng.uniform(80, 220)
+            frame += (glare * np.exp(-(y[:, None] ** 2 + x[None, :] ** 2) / (2 * sigma * sigma)))[:, :, None]
+
+        blur = None
+        if rng.random() < self.blur:
+            if rng.random() < 0.5:
+                sigma = rng.uniform(0.5, 2.0)
+                frame = cv2.GaussianBlur(frame, (0, 0), sigma)
+                blur = f"focus {sigma:.2f}"
+            else:
+                length = int(rng.integers(3, 10))
+                kernel = np.zeros((length, length), np.float32)
+                kernel[length // 2, :] = 1.0 / length
+                rotation = cv2.getRotationMatrix2D(((length - 1) / 2, (length - 1) / 2), rng.uniform(0, 180), 1.0)
+                kernel = cv2.warpAffine(kernel, rotation, (length, length))
+                frame = cv2.filter2D(frame, -1, kernel / kernel.sum())
+                blur = f"motion {length}"
+
+        noise = rng.uniform(*self.noise)
+        frame += rng.normal(0, noise, frame.shape).astype(np.float32)
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+        return frame, {'frame': index, 'codes': codes, 'blur': blur, 'glare': round(float(glare), 1),
+                       'noise': round(float(noise), 2)}
+
+
+class SceneArchive:
+    """Random access to the frames of a generated corpus.
+
+    Frames are stored encoded, a fraction of the size of raw frames, and
+    decoded on access through a memory map of the archive.
+    """
+
+    def __init__(self, path):
+        """
+        Open a corpus archive.
+
+        Args:
+            path (str): Archive path written by ``generate_corpus``
+        """
+        self.path = path
+        self.index = np.fromfile(path + ".idx", dtype=ARCHIVE_INDEX_DTYPE)
+        if len(self.index):
+            self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            self.data = np.empty(0, np.uint8)  # Empty files cannot be mapped
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        """Frame ``i`` decoded to BGR."""
+        offset, length = self.index[i]
+        return cv2.imdecode(self.data[offset:offset + length], cv2.IMREAD_COLOR)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+_worker_generator = None
+_worker_extension = ".jpg"
+ENCODE_PARAMS = {".jpg": [cv2.IMWRITE_JPEG_QUALITY, 95], ".png": []}
+
+
+def _init_worker(generator, extension):
+    global _worker_generator, _worker_extension
+    _worker_generator = generator
+    _worker_extension = extension
+
+
+def _render(index):
+    frame, truth = _worker_generator.render(index)
+    ok, encoded = cv2.imencode(_worker_extension, frame, ENCODE_PARAMS.get(_worker_extension, []))
+    if not ok:
+        raise RuntimeError(f"Could not encode frame {index} as {_worker_extension}")
+    return encoded.tobytes(), truth
+
+
+def truth_path(path):
+    """Ground-truth index stored next to a corpus archive."""
+    return path + ".truth.jsonl"
+
+
+def generate_corpus(path, count, generator=None, workers=None, extension=".jpg", chunksize=4):
+    """
+    Render ``count`` frames on a process pool into a corpus archive.
+
+    Workers render and encode the frames; they are appended to ``path`` in
+    frame order with their offsets in ``path.idx`` and the ground truth in
+    ``truth_path(path)``.
+
+    Args:
+        path (str): Archive file path
+        count (int): Number of frames
+        generator (SceneGenerator): Scene settings (default: engine and gearbox labels)
+        workers (int): Render processes, default one per CPU
+        extension (str): Frame encoding, ".jpg" (quality 95, about an eighth
+            of the raw size) or ".png" (lossless, the noise keeps it large)
+        chunksize (int): Frames handed to a worker at a time
+
+    Returns:
+        int: Number of codes in the corpus
+    """
+    generator = generator or SceneGenerator()
+    codes = 0
+    offset = 0
+    index = np.zeros(count, ARCHIVE_INDEX_DTYPE)
+    workers = workers or os.cpu_count() or 1
+    with mp.Pool(workers, initializer=_init_worker, initargs=(generator, extension)) as pool, \
+            open(path, "wb") as data_file, open(truth_path(path), "w") as truth_file:
+        # imap keeps frame order, so the archive, the index and the truth line up
+        for i, (encoded, truth) in enumerate(pool.imap(_render, range(count), chunksize)):
+            data_file.write(encoded)
+            index[i] = (offset, len(encoded))
+            offset += len(encoded)
+            truth_file.write(json.dumps(truth) + "\n")
+            codes += len(truth['codes'])
+    index.tofile(path + ".idx")
+    return codes
+
+
+def load_corpus(path):
+    """
+    Open a generated corpus.
+
+    Returns:
+        tuple: (SceneArchive of the frames, list of truth dicts per frame)
+    """
+    archive = SceneArchive(path)
+    with open(truth_path(path)) as f:
+        truth = [json.loads(line) for line in f]
+    return archive, truth[:len(archive)]
@@ -0,0 +1,105 @@
+import cv2
+# QRDetection and decode_qr now live in qr_decoders and are still importable from here
+from qr_decoders import QRDetection, create_decoder, decode_qr
+
+
+class QRCodeTracker:
+    """Decode QR codes by searching near the last known location first.
+
+    Once a code has been found only a padded region of interest around it is
+    decoded. A full-frame search (on a downscaled grayscale copy) runs when the
+    ROI misses and every ``full_scan_interval`` frames, so new codes entering
+    the view are still picked up.
+    """
+
+    def __init__(self, padding=40, full_scan_interval=15, search_scale=0.5,
+                 symbols=("QRCODE",), decoder="pyzbar"):
+        """
+        Initialize the tracker.
+
+        Args:
+            padding (int): Pixels added around the last code bounding box
+            full_scan_interval (int): Force a full-frame search every N frames
+            search_scale (float): Downscale factor for full-frame searches
+                (1.0 searches at full resolution)
+            symbols (tuple): pyzbar symbol types (ZBarSymbol or names) to decode
+            decoder: Backend name from ``qr_decoders``, created restricted to
+                ``symbols``, or a decoder object used as is
+        """
+        self.padding = padding
+        self.full_scan_interval = max(1, full_scan_interval)
+        self.search_scale = search_scale
+        self.symbols = list(symbols) if symbols else None
+        self.decoder = create_decoder(decoder, self.symbols)
+        self.roi = None  # (x0, y0, x1, y1) in full-frame pixels
+        self.frame_count = 0
+        self.roi_hits = 0
+        self.full_scans = 0
+        self._gray = None
+        self._small = None
+
+    def reset(self):
+        """Forget the tracked location."""
+        self.roi = None
+
+    def decode(self, frame):
+        """
+        Decode codes in a frame, using the tracked ROI when possible.
+
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame
+
+        Returns:
+            list: QRDetection for every code found
+        """
+        gray = self._to_gray(frame)
+        self.frame_count += 1
+        periodic = self.frame_count % self.full_scan_interval == 0
+
+        if self.roi is not None and not periodic:
+            x0, y0, x1, y1 = self.roi
+            detections = self.decoder.decode(gray[y0:y1, x0:x1], offset=(x0, y0))
+            if detections:
+                self.roi_hits += 1
+                self._update_roi(detections, gray.shape)
+                return detections
+
+        detections = self._full_scan(gray, periodic)
+        if detections:
+            self._update_roi(detections, gray.shape)
+        else:
+            self.roi = None
+        return detections
+
+    def _to_gray(self, frame):
+        if frame.ndim == 2:
+            return frame
+        if self._gray is not None and self._gray.shape != frame.shape[:2]:
+            self._gray = None
+        self._gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        return self._gray
+
+    def _full_scan(self, gray, periodic):
+        self.full_scans += 1
+        if self.search_scale >= 1.0:
+            return self.decoder.decode(gray)
+
+        height, width = gray.shape
+        size = (max(1, int(width * self.search_scale)), max(1, int(height * self.search_scale)))
+        if self._small is not None and self._small.shape[::-1] != size:
+            self._small = None
+        self._small = cv2.resize(gray, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        detections = self.decoder.decode(self._small, scale=width / size[0])
+
+        # Small codes may not survive downscaling, so periodically look at full resolution
+        if not detections and periodic:
+            detections = self.decoder.decode(gray)
+        return detections
+
+    def _update_roi(self, detections, shape):
+        height, width = shape[:2]
+        x0 = min(d.rect[0] for d in detections) - self.padding
+        y0 = min(d.rect[1] for d in detections) - self.padding
+        x1 = max(d.rect[0] + d.rect[2] for d in detections) + self.padding
+        y1 = max(d.rect[1] + d.rect[3] for d in detections) + self.padding
+        self.roi = (max(0, x0), max(0, y0), min(width, x1), min(height, y1))
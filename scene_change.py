@@ -0,0 +1,74 @@
+import cv2
+
+
+class SceneChangeDetector:
+    """Cheap check for whether a frame differs from recently decoded ones.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with the
+    thumbnails of the last few decoded frames by mean absolute difference. When
+    one matches, the decode results stored with it can be reused and the
+    expensive decode skipped.
+    """
+
+    def __init__(self, size=(80, 60), threshold=3.0, cache_size=4):
+        """
+        Initialize the detector.
+
+        Args:
+            size (tuple): Thumbnail resolution (width, height)
+            threshold (float): Mean absolute gray-level difference below which
+                two frames count as the same scene
+            cache_size (int): Number of recent scenes whose results are kept
+        """
+        self.size = size
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self.cache = []  # [(thumbnail, results)], most recent first
+        self.frames = 0
+        self.skipped = 0
+        self._gray = None
+        self._thumb = None
+        self._diff = None
+
+    @property
+    def skip_ratio(self):
+        """Fraction of frames whose decode was skipped."""
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def lookup(self, frame):
+        """
+        Compare a frame against the cached scenes.
+
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame
+
+        Returns:
+            list: Cached results if the scene is unchanged, None otherwise
+        """
+        self.frames += 1
+        gray = frame
+        if frame.ndim == 3:
+            if self._gray is not None and self._gray.shape != frame.shape[:2]:
+                self._gray = None
+            gray = self._gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        self._thumb = cv2.resize(gray, self.size, dst=self._thumb, interpolation=cv2.INTER_AREA)
+
+        for i, (thumbnail, results) in enumerate(self.cache):
+            self._diff = cv2.absdiff(self._thumb, thumbnail, dst=self._diff)
+            if cv2.mean(self._diff)[0] < self.threshold:
+                if i:
+                    self.cache.insert(0, self.cache.pop(i))
+                self.skipped += 1
+                return results
+        return None
+
+    def store(self, results):
+        """Remember the results decoded from the frame last passed to ``lookup()``."""
+        self.cache.insert(0, (self._thumb.copy(), results))
+        del self.cache[self.cache_size:]
+
+    def reset(self):
+        """Forget cached scenes and counters."""
+        self.cache = []
+        self.frames = 0
+        self.skipped = 0
@@ -0,0 +1,100 @@
+import argparse
+import glob
+import json
+import os
+import cv2
+import numpy as np
+from qr_decoders import available_decoders, benchmark_decoders, create_decoder, select_decoder
+from qr_scenes import load_corpus
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "images")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def make_frames(count, size=(640, 480), empty_ratio=0.5, seed=0):
+    """Sample codes pasted onto noisy frames; a share of the frames stays empty.
+
+    Returns:
+        tuple: (frames, expected) with the list of code strings per frame
+    """
+    rng = np.random.default_rng(seed)
+    codes = [cv2.imread(os.path.join(IMAGES_DIR, name)) for name in ("engine.png", "gearbox.png")]
+    # Ground truth is whatever the clean sample image holds
+    reference = create_decoder(available_decoders(prefilter=False)[0])
+    labels = [reference.decode(code)[0].data for code in codes]
+    width, height = size
+    frames, expected = [], []
+    for i in range(count):
+        frame = rng.integers(90, 160, (height, width, 3), dtype=np.uint8)
+        truth = []
+        if rng.random() >= empty_ratio:
+            side = int(rng.integers(100, 260))
+            code = cv2.resize(codes[i % len(codes)], (side, side), interpolation=cv2.INTER_AREA)
+            x = int(rng.integers(0, width - side))
+            y = int(rng.integers(0, height - side))
+            frame[y:y + side, x:x + side] = code
+            truth.append(labels[i % len(codes)])
+        frames.append(frame)
+        expected.append(truth)
+    return frames, expected
+
+
+def load_frames(patterns):
+    """Images from files, directories and glob patterns, sorted by path."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        paths += [path for path in glob.glob(pattern) if path.lower().endswith(IMAGE_EXTENSIONS)]
+    paths = sorted(set(paths))
+    return paths, [cv2.imread(path) for path in paths]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare QR decoder backends and pick the fastest accurate one")
+    parser.add_argument("paths", nargs="*", help="Image files, directories or globs (default: synthetic frames)")
+    parser.add_argument("--corpus", help="Scene corpus written by scripts/generate_qr.py --corpus "
+                                         "(ground truth from its index)")
+    parser.add_argument("--labels", help="JSON file mapping image file names to their list of codes "
+                                         "(default: the union of what all backends decode)")
+    parser.add_argument("--frames", type=int, default=200, help="Number of synthetic frames")
+    parser.add_argument("--empty-ratio", type=float, default=0.5, help="Share of synthetic frames without a code")
+    parser.add_argument("--decoders", nargs="+", default=None, help="Backends to compare (default: all available)")
+    parser.add_argument("--min-hit-rate", type=float, default=0.95, help="Accuracy the selected backend must reach")
+    parser.add_argument("--repeat", type=int, default=1, help="Timing passes over the corpus")
+    parser.add_argument("--gray", action="store_true", help="Convert frames to grayscale first, like gray=True readers")
+    args = parser.parse_args()
+
+    if args.corpus:
+        archive, truth = load_corpus(args.corpus)
+        frames = list(archive)
+        expected = [entry['codes'] for entry in truth]  # Matched by polygon, so repeated labels count apart
+    elif args.paths:
+        paths, frames = load_frames(args.paths)
+        if not frames:
+            parser.error("No images found")
+        expected = None
+        if args.labels:
+            with open(args.labels) as f:
+                labels = json.load(f)
+            expected = [list(labels.get(os.path.basename(path), [])) for path in paths]
+    else:
+        frames, expected = make_frames(args.frames, empty_ratio=args.empty_ratio)
+    if args.gray:
+        frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame for frame in frames]
+
+    report = benchmark_decoders(frames, expected, args.decoders or available_decoders(), args.repeat)
+    print(f"{len(frames)} frames, {frames[0].shape[1]}x{frames[0].shape[0]}")
+    print(f"{'decoder':>24} {'mean ms':>8} {'p90 ms':>8} {'hit rate':>9} {'false':>6}")
+    for entry in sorted(report, key=lambda entry: entry['mean_ms']):
+        print(f"{entry['name']:>24} {entry['mean_ms']:8.2f} {entry['p90_ms']:8.2f} "
+              f"{entry['hit_rate']:9.1%} {entry['false_codes']:6d}")
+    best = select_decoder(report, args.min_hit_rate)
+    best_rate = next(entry['hit_rate'] for entry in report if entry['name'] == best)
+    if best_rate >= args.min_hit_rate:
+        print(f"\nSelected: {best} (fastest with a hit rate of at least {args.min_hit_rate:.0%}); "
+              f"use OakDQRCodeReader(decoder=\"{best}\")")
+    else:
+        print(f"\nWarning: no backend reached a hit rate of {args.min_hit_rate:.0%}; falling back to the "
+              f"most accurate one, {best} ({best_rate:.1%}). Use OakDQRCodeReader(decoder=\"{best}\") or "
+              f"improve the imaging conditions")
@@ -0,0 +1,55 @@
+import argparse
+import time
+import numpy as np
+from depth_filters import HostDepthFilterChain, PostProcessingConfig
+
+
+def make_depth(width, height, seed=0):
+    """Synthetic depth: a tilted floor plane with boxes, sensor noise and holes."""
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:height, 0:width]
+    depth = 800.0 + 0.6 * ys
+    for _ in range(6):
+        x, y = rng.integers(0, width - width // 5), rng.integers(0, height - height // 5)
+        depth[y:y + height // 6, x:x + width // 6] -= rng.uniform(50, 300)
+    depth += rng.normal(0, 8, depth.shape)
+    depth[rng.random(depth.shape) < 0.05] = 0
+    return depth.astype(np.uint16)
+
+
+def single_filter_config(name):
+    config = PostProcessingConfig()
+    if name == "median":
+        config.median = 5
+    elif name == "all":
+        config.median = 5
+        config.speckleFilter.enable = True
+        config.spatialFilter.enable = True
+        config.temporalFilter.enable = True
+    elif name != "none":
+        getattr(config, name).enable = True
+    return config
+
+
+def bench(depth_frames, config, repeats):
+    chain = HostDepthFilterChain(config)
+    chain.process(depth_frames[0])  # Allocate buffers outside the timing
+    start = time.perf_counter()
+    for i in range(repeats):
+        chain.process(depth_frames[i % len(depth_frames)])
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host-side depth post-processing cost per frame")
+    parser.add_argument("--repeats", type=int, default=30, help="Frames timed per filter")
+    args = parser.parse_args()
+
+    filters = ["none", "median", "speckleFilter", "spatialFilter", "temporalFilter", "all"]
+    print(f"{'filter':>16} {'400p ms':>9} {'800p ms':>9}")
+    frames = {size: [make_depth(*size, seed=i) for i in range(3)] for size in ((640, 400), (1280, 800))}
+    for name in filters:
+        config = single_filter_config(name)
+        low = bench(frames[(640, 400)], config, args.repeats)
+        high = bench(frames[(1280, 800)], config, args.repeats)
+        print(f"{name:>16} {low:9.2f} {high:9.2f}")
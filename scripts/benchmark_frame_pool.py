@@ -0,0 +1,64 @@
+import argparse
+import gc
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from frame_pool import FramePool
+
+
+def allocating(planar):
+    """What getCvFrame() plus a grayscale conversion cost per frame."""
+    frame = np.ascontiguousarray(planar.transpose(1, 2, 0))
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return frame, gray
+
+
+def pooled(pool):
+    def convert(planar):
+        frame = pool.interleave(planar)
+        return frame, pool.to_gray(frame)
+    return convert
+
+
+def luma_only(pool):
+    def convert(planar):
+        return None, pool.planar_to_gray(planar)
+    return convert
+
+
+def measure(convert, frames):
+    for planar in frames[:16]:
+        convert(planar)  # Warm up (fills the pool)
+    gc_start = sum(generation['collections'] for generation in gc.get_stats())
+    tracemalloc.start()
+    start = time.perf_counter()
+    for planar in frames:
+        convert(planar)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = sum(generation['collections'] for generation in gc.get_stats()) - gc_start
+    return elapsed / len(frames), peak, collections
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-frame allocations of getCvFrame-style conversion vs FramePool")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per run")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for width, height in ((640, 480), (1280, 720)):
+        source = [rng.integers(0, 256, (3, height, width), dtype=np.uint8) for _ in range(4)]
+        frames = [source[i % len(source)] for i in range(args.frames)]
+        print(f"\n{width}x{height}, {args.frames} frames")
+        print(f"{'method':>22} {'ms/frame':>9} {'peak KiB':>9} {'GC runs':>8}")
+        pool = FramePool()
+        for name, convert in (("getCvFrame + cvtColor", allocating),
+                              ("FramePool BGR + gray", pooled(pool)),
+                              ("FramePool luma only", luma_only(pool))):
+            per_frame, peak, collections = measure(convert, frames)
+            print(f"{name:>22} {per_frame * 1000:9.3f} {peak / 1024:9.1f} {collections:8d}")
+        stats = pool.stats()
+        print(f"Pool: {stats['allocations']} allocations for {stats['conversions']} conversions "
+              f"({stats['allocations_per_conversion']:.4f} per conversion)")
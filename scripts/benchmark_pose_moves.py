@@ -0,0 +1,50 @@
+import argparse
+import time
+from pose_library import DEFAULT_CACHE_PATH, sorting_pose_library
+from simulated_robot import SimulatedRobotController
+
+# One sorting cycle per label: scan -> pick -> drop-off -> scan
+CYCLE = ["pick_approach", "pick", "pick_approach", "{label}_approach", "{label}", "{label}_approach", "scan"]
+
+
+def run_cycles(robot, library, labels, cycles, linear):
+    start = time.perf_counter()
+    library.move(robot, "scan", linear=linear)
+    for i in range(cycles):
+        label = labels[i % len(labels)]
+        for step in CYCLE:
+            library.move(robot, step.format(label=label), linear=linear)
+    return (time.perf_counter() - start) / cycles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cycle time of cached joint-space moves vs linear moves")
+    parser.add_argument("--port", help="Serial port of the arm (default: simulated arm)")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--cycles", type=int, default=4, help="Pick-and-place cycles per run")
+    parser.add_argument("--time-scale", type=float, default=0.25, help="Simulated arm time scale")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Pose cache file")
+    args = parser.parse_args()
+
+    library = sorting_pose_library(cache_path=args.cache)
+    start = time.perf_counter()
+    failed = library.precompute()
+    print(f"Precomputed {len(library.poses)} poses in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if failed:
+        print(f"Unreachable targets (linear moves are used instead): {failed}")
+
+    if args.port:
+        from wlkata_controller import WlkataRobotController
+        robot = WlkataRobotController(port=args.port, baudrate=args.baudrate, timeout=1)
+        robot.home()
+    else:
+        robot = SimulatedRobotController(time_scale=args.time_scale)
+
+    labels = [name for name in library.poses if name not in ("scan", "pick") and not name.endswith("_approach")]
+    try:
+        # No context manager: WlkataRobotController already connected in __init__
+        for linear in (True, False):
+            cycle_time = run_cycles(robot, library, labels, args.cycles, linear)
+            print(f"{'linear' if linear else 'joint (cached)':>15}: {cycle_time:.2f} s per cycle")
+    finally:
+        robot.disconnect()
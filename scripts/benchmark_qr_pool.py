@@ -0,0 +1,64 @@
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from qr_decode_pool import QRDecodePool
+from qr_tracking import decode_qr
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "images")
+
+
+def make_frames(count, size=(640, 480), seed=0):
+    """Paste the sample QR codes at random positions and sizes onto noisy frames."""
+    rng = np.random.default_rng(seed)
+    codes = [cv2.imread(os.path.join(IMAGES_DIR, name)) for name in ("engine.png", "gearbox.png")]
+    width, height = size
+    frames = []
+    for i in range(count):
+        frame = rng.integers(90, 160, (height, width, 3), dtype=np.uint8)
+        side = int(rng.integers(120, 260))
+        code = cv2.resize(codes[i % len(codes)], (side, side), interpolation=cv2.INTER_NEAREST)
+        x = int(rng.integers(0, width - side))
+        y = int(rng.integers(0, height - side))
+        frame[y:y + side, x:x + side] = code
+        frames.append(frame)
+    return frames
+
+
+def bench_inline(frames):
+    start = time.perf_counter()
+    hits = sum(1 for frame in frames if decode_qr(frame))
+    return len(frames) / (time.perf_counter() - start), hits
+
+
+def bench_pool(frames, workers):
+    with QRDecodePool(workers=workers, frame_shape=frames[0].shape) as pool:
+        # Warm up so process start-up is not counted
+        pool.submit(frames[0])
+        pool.get_result()
+
+        hits = 0
+        start = time.perf_counter()
+        for frame in frames:
+            pool.submit(frame)
+            hits += sum(1 for _, detections in pool.results() if detections)
+        while pool.pending:
+            _, detections = pool.get_result()
+            hits += bool(detections)
+        return len(frames) / (time.perf_counter() - start), hits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure QR decode throughput against decode pool size")
+    parser.add_argument("--frames", type=int, default=300, help="Number of synthetic frames")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="Largest pool size to test")
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames)
+    baseline, hits = bench_inline(frames)
+    print(f"{'workers':>8} {'frames/s':>10} {'speedup':>8} {'hits':>6}")
+    print(f"{'inline':>8} {baseline:10.1f} {1.0:8.2f} {hits:6d}")
+    for workers in range(1, args.max_workers + 1):
+        fps, hits = bench_pool(frames, workers)
+        print(f"{workers:8d} {fps:10.1f} {fps / baseline:8.2f} {hits:6d}")
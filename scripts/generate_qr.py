@@ -1,4 +1,7 @@
+import argparse
+import time
 import qrcode
+from qr_scenes import SceneGenerator, generate_corpus, truth_path
 
 def generate_qr_code(data, file_name="qr_code.png"):
     qr = qrcode.QRCode(
@@ -15,5 +18,33 @@ def generate_qr_code(data, file_name="qr_code.png"):
     print(f"QR code saved as {file_name}")
 
 if __name__ == "__main__":
-    generate_qr_code("gearbox", "gearbox.png")
-    generate_qr_code("engine", "gearbox.png")
+    parser = argparse.ArgumentParser(description="Write clean QR label images, or a synthetic scene corpus "
+                                                 "with ground-truth corners for decode benchmarks")
+    parser.add_argument("labels", nargs="*", default=["engine", "gearbox"], help="Strings to encode")
+    parser.add_argument("--corpus", help="Write this many scenes to --output instead of label images", type=int)
+    parser.add_argument("--output", default="qr_corpus.bin", help="Corpus archive path")
+    parser.add_argument("--format", choices=("jpg", "png"), default="jpg", help="Frame encoding in the archive")
+    parser.add_argument("--size", type=int, nargs=2, default=(640, 480), metavar=("WIDTH", "HEIGHT"),
+                        help="Frame size (the camera preview resolution)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed; the same seed gives the same frames")
+    parser.add_argument("--codes-per-frame", type=int, nargs=2, default=(1, 3), metavar=("MIN", "MAX"))
+    parser.add_argument("--empty-ratio", type=float, default=0.1, help="Share of frames without a code")
+    parser.add_argument("--occlusion", type=float, default=0.2, help="Probability a code is partly covered")
+    parser.add_argument("--glare", type=float, default=0.3, help="Probability of glare in a frame")
+    parser.add_argument("--blur", type=float, default=0.5, help="Probability of focus or motion blur")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if args.corpus is None:
+        for label in args.labels:
+            generate_qr_code(label, f"{label}.png")
+    else:
+        generator = SceneGenerator(labels=args.labels, size=tuple(args.size), seed=args.seed,
+                                   codes_per_frame=tuple(args.codes_per_frame), empty_ratio=args.empty_ratio,
+                                   occlusion=args.occlusion, glare=args.glare, blur=args.blur)
+        start = time.perf_counter()
+        codes = generate_corpus(args.output, args.corpus, generator, args.workers, f".{args.format}")
+        elapsed = time.perf_counter() - start
+        print(f"{args.corpus} frames with {codes} codes written to {args.output} "
+              f"(ground truth: {truth_path(args.output)}) in {elapsed:.1f} s, "
+              f"{args.corpus / elapsed:.0f} frames/s")
@@ -1,6 +1,7 @@
 import cv2
 import depthai as dai
 import numpy as np
+from depth_visualizer import DepthColorizer
 
 # Create pipeline
 pipeline = dai.Pipeline()
@@ -41,6 +42,9 @@ def get_depth(event, x, y, flags, param):
             distance = depth_frame[y, x] / 1000.0  # Convert mm to meters
             print(f"Depth at ({x}, {y}): {distance:.2f} meters")
 
+# Fixed-range lookup-table colorizer (no per-frame normalize, no flicker)
+colorizer = DepthColorizer(min_depth=200, max_depth=5000, colormap=cv2.COLORMAP_TURBO)
+
 # OpenCV window and mouse callback
 cv2.namedWindow("Depth Image")
 cv2.setMouseCallback("Depth Image", get_depth)
@@ -53,11 +57,8 @@ with dai.Device(pipeline) as device:
         depth_data = depth_queue.get()
         depth_frame = depth_data.getFrame()  # Get depth data
 
-        # Normalize depth for visualization
-        depth_vis = cv2.normalize(depth_frame, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-
-        # Apply colormap
-        depth_colored = cv2.applyColorMap(depth_vis, cv2.COLORMAP_TURBO)
+        # Colorize depth for visualization
+        depth_colored = colorizer.colorize(depth_frame)
 
         # Show depth image
         cv2.imshow("Depth Image", depth_colored)
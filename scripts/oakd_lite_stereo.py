@@ -1,6 +1,7 @@
 import cv2
 import depthai as dai
 import numpy as np
+from depth_visualizer import DepthColorizer
 
 # Create pipeline
 pipeline = dai.Pipeline()
@@ -28,6 +29,9 @@ xout_depth = pipeline.create(dai.node.XLinkOut)
 xout_depth.setStreamName("depth")
 stereo.depth.link(xout_depth.input)
 
+# Fixed-range lookup-table colorizer
+colorizer = DepthColorizer(min_depth=200, max_depth=5000, colormap=cv2.COLORMAP_JET)
+
 # Start pipeline
 with dai.Device(pipeline) as device:
     depth_queue = device.getOutputQueue(name="depth", maxSize=1, blocking=True)
@@ -35,11 +39,8 @@ with dai.Device(pipeline) as device:
     while True:
         depth_frame = depth_queue.get().getFrame()  # Get depth frame
 
-        # Normalize depth image for visualization (convert to 8-bit)
-        #depth_frame = cv2.normalize(depth_frame, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-        depth_frame = (depth_frame * 255.0).astype(np.uint8)
-        # Apply a colormap for better visibility
-        depth_colored = cv2.applyColorMap(depth_frame, cv2.COLORMAP_JET)
+        # Map depth (mm) to colours through the lookup table
+        depth_colored = colorizer.colorize(depth_frame)
 
         # Show depth image
         cv2.imshow("Depth Image", depth_colored)
@@ -1,6 +1,7 @@
 import cv2
 import depthai as dai
 import numpy as np
+from depth_visualizer import DepthColorizer
 
 # Create pipeline
 pipeline = dai.Pipeline()
@@ -51,6 +52,9 @@ xout_depth = pipeline.create(dai.node.XLinkOut)
 xout_depth.setStreamName("depth")
 stereo.depth.link(xout_depth.input)
 
+# Fixed-range lookup-table colorizer
+colorizer = DepthColorizer(min_depth=200, max_depth=5000, colormap=cv2.COLORMAP_TURBO)
+
 # Start the pipeline
 with dai.Device(pipeline) as device:
     depth_queue = device.getOutputQueue(name="depth", maxSize=1, blocking=False)
@@ -58,11 +62,8 @@ with dai.Device(pipeline) as device:
     while True:
         depth_frame = depth_queue.get().getFrame()
 
-        # Normalize depth image for visualization
-        depth_frame = (depth_frame * 255.0).astype(np.uint8)
-
-        # Apply colormap
-        depth_colored = cv2.applyColorMap(depth_frame, cv2.COLORMAP_TURBO)
+        # Colorize depth for visualization
+        depth_colored = colorizer.colorize(depth_frame)
 
         # Show depth image
         cv2.imshow("Filtered Depth Image", depth_colored)
@@ -1,22 +1,49 @@
+import argparse
+import sys
+import time
 import cv2
-from pyzbar.pyzbar import decode
+from qr_batch import DEFAULT_CACHE_PATH, DecodeCache, decode_files, expand_paths, write_jsonl
+from qr_decoders import create_decoder
 
-def read_qr_code(image_path):
+def read_qr_code(image_path, decoder="pyzbar"):
     # Load the image
     image = cv2.imread(image_path)
-    
-    # Decode the QR code
-    qr_codes = decode(image)
-    
+
+    # Decode the QR code with the chosen backend (see qr_decoders.DECODERS)
+    qr_codes = create_decoder(decoder).decode(image)
+
     # Extract and print data from QR codes
     for qr_code in qr_codes:
-        data = qr_code.data.decode('utf-8')
+        data = qr_code.data
         print(f"QR Code Data: {data}")
         return data
-    
+
     print("No QR code found.")
     return None
 
 if __name__ == "__main__":
-    image_path = "qr_code.png"  # Replace with your QR code image file
-    read_qr_code(image_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Decode every QR code in image files, directories or globs; "
+                                                 "one JSON line per image")
+    parser.add_argument("paths", nargs="*", default=["qr_code.png"], help="Images, directories or glob patterns")
+    parser.add_argument("--decoder", default="pyzbar", help="Decoder backend (see qr_decoders.DECODERS)")
+    parser.add_argument("--workers", type=int, default=None, help="Decode processes (default: one per CPU)")
+    parser.add_argument("--output", "-o", default="-", help="JSONL output file, - for stdout")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Result cache keyed by content hash")
+    parser.add_argument("--no-cache", action="store_true", help="Decode every image again")
+    args = parser.parse_args()
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        parser.error("No images found")
+    start = time.perf_counter()
+    cache = None if args.no_cache else DecodeCache(args.cache)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        summary = write_jsonl(decode_files(paths, args.decoder, args.workers, cache), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if cache is not None:
+            cache.close()
+    print(f"{summary['images']} images, {summary['codes']} codes, {summary['cached']} from cache, "
+          f"{summary['errors']} errors in {time.perf_counter() - start:.2f} s", file=sys.stderr)
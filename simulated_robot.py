@@ -0,0 +1,121 @@
+import math
+import threading
+import time
+from wlkata_controller import Motion, PositionMode
+
+HOME_ANGLES = [0, 0, 0, 0, 0, 0]
+HOME_COORDINATES = [198.67, 0, 230.72, 0, 0, 0]
+
+
+class _SimulatedMirobot:
+    """Stand-in for ``wlkatapython.Wlkata_UART`` that only answers status requests."""
+
+    def __init__(self, robot):
+        self._robot = robot
+
+    def getStatus(self):
+        busy = time.monotonic() < self._robot.busy_until
+        return {"state": "Run" if busy else "Idle"}
+
+
+class SimulatedRobotController:
+    """Drop-in replacement for WlkataRobotController that needs no hardware.
+
+    Each command takes a duration estimated from the distance travelled, so
+    schedulers and benchmarks see realistic timing. Commands sent with
+    ``wait=False`` queue up behind the current motion and ``getStatus()``
+    reports ``Run`` until all of them have finished, like the real controller.
+    """
+
+    def __init__(self, linear_speed=80.0, joint_speed=60.0, fast_factor=1.6, pump_time=0.15,
+                 home_time=2.0, settle_time=0.05, time_scale=1.0):
+        """
+        Initialize the simulated arm.
+
+        Args:
+            linear_speed (float): Cartesian speed in mm/s for linear moves
+            joint_speed (float): Joint speed in degrees/s
+            fast_factor (float): Speed-up of fast (joint-space) moves over linear ones
+            pump_time (float): Seconds for the pump to switch
+            home_time (float): Seconds for homing
+            settle_time (float): Seconds added to every motion for acceleration and settling
+            time_scale (float): Multiply all durations (e.g. 0.1 to run 10x faster)
+        """
+        self.linear_speed = linear_speed
+        self.joint_speed = joint_speed
+        self.fast_factor = fast_factor
+        self.pump_time = pump_time
+        self.home_time = home_time
+        self.settle_time = settle_time
+        self.time_scale = time_scale
+        self.angles = list(HOME_ANGLES)
+        self.coordinates = list(HOME_COORDINATES)
+        self.pump_on = False
+        self.busy_until = 0.0
+        self.commands = 0
+        self.mirobot = _SimulatedMirobot(self)
+        self._lock = threading.Lock()
+
+    def _run(self, duration, wait):
+        with self._lock:
+            start = max(time.monotonic(), self.busy_until)
+            self.busy_until = start + duration * self.time_scale
+            self.commands += 1
+            finish = self.busy_until
+        if wait:
+            self.wait_for_completion()
+        return finish
+
+    def wait_for_completion(self, timeout=30, **kwargs):
+        """Sleep until the simulated motion finishes."""
+        remaining = self.busy_until - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return False
+        if remaining > 0:
+            time.sleep(remaining)
+        return True
+
+    def status(self):
+        """Current simulated status dictionary."""
+        return self.mirobot.getStatus()
+
+    def home(self, timeout=60, wait=True):
+        """Simulate homing."""
+        self.angles = list(HOME_ANGLES)
+        self.coordinates = list(HOME_COORDINATES)
+        self._run(self.home_time, wait)
+
+    def set_joint_angles(self, angles, mode=PositionMode.ABSOLUTE, timeout=30, wait=True):
+        """Simulate a joint-space move; duration follows the largest joint change."""
+        if mode == PositionMode.INCREMENTAL:
+            angles = [a + d for a, d in zip(self.angles, angles)]
+        travel = max(abs(a - b) for a, b in zip(angles, self.angles))
+        self.angles = list(angles)
+        self._run(travel / self.joint_speed + self.settle_time, wait)
+
+    def set_coordinates(self, coordinates, motion=Motion.LINEAR_MOVEMENT, mode=PositionMode.ABSOLUTE,
+                        timeout=30, wait=True):
+        """Simulate a cartesian move; duration follows the straight-line distance."""
+        if mode == PositionMode.INCREMENTAL:
+            coordinates = [c + d for c, d in zip(self.coordinates, coordinates)]
+        distance = math.dist(coordinates[:3], self.coordinates[:3])
+        speed = self.linear_speed * (self.fast_factor if motion == Motion.FAST_MOVEMENT else 1.0)
+        self.coordinates = list(coordinates)
+        self._run(distance / speed + self.settle_time, wait)
+
+    def set_pump(self, state, timeout=5, wait=True):
+        """Simulate switching the pump."""
+        self.pump_on = bool(state)
+        self._run(self.pump_time, wait)
+
+    def disconnect(self):
+        """Nothing to close."""
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.disconnect()
@@ -0,0 +1,242 @@
+import collections
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from qr_tracking import decode_qr
+from sorting_poses import APPROACH_HEIGHT, SORTING_POSES
+from wlkata_controller import Motion
+
+ScanResult = collections.namedtuple("ScanResult", ["label", "frame_timestamp", "detected_at", "scan_time"])
+
+
+class StageTimer:
+    """Collect wall-clock durations per named stage."""
+
+    def __init__(self):
+        self.samples = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.samples[name].append(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        Returns:
+            dict: stage name -> {'count', 'mean', 'max', 'total'} in seconds
+        """
+        with self._lock:
+            return {
+                name: {'count': len(values), 'mean': sum(values) / len(values),
+                       'max': max(values), 'total': sum(values)}
+                for name, values in self.samples.items() if values
+            }
+
+
+class PipelinedSorter:
+    """Sort objects by QR label while scanning the next one during the current move.
+
+    A scan thread keeps pulling frames from a continuously streaming camera
+    (anything with ``get_latest(timeout)``, e.g. a threaded OakDLiteCamera or
+    a FrameReplay) and puts each newly classified object on a one-slot queue.
+    The arm loop takes objects from the queue and runs the pick, transfer,
+    place and return stages, so classification of object N+1 overlaps the
+    motion for object N. With ``pipelined=False`` scanning pauses while the
+    arm moves, which reproduces the serial flow of cam_arm_demo.py. Frames
+    captured during a pause are skipped and the object gap count carries over
+    it, so an object still in view after the move is not queued again.
+    """
+
+    def __init__(self, robot, camera, poses=None, decode=decode_qr, min_gap_frames=3,
+                 motion=Motion.LINEAR_MOVEMENT, pipelined=True):
+        """
+        Initialize the sorter.
+
+        Args:
+            robot: WlkataRobotController or SimulatedRobotController
+            camera: Frame source with ``get_latest(timeout)`` and ``running``
+            poses (dict): Targets as in SORTING_POSES; every key other than
+                "scan" and "pick" is a label with its drop-off area
+            decode (callable): frame -> list of QRDetection
+            min_gap_frames (int): Frames without a code that separate two objects
+            motion (Motion): Motion type for all moves
+            pipelined (bool): Scan while the arm is moving
+        """
+        self.robot = robot
+        self.camera = camera
+        self.poses = dict(poses or SORTING_POSES)
+        self.labels = {label for label in self.poses if label not in ("scan", "pick")}
+        self.decode = decode
+        self.min_gap_frames = min_gap_frames
+        self.motion = motion
+        self.pipelined = pipelined
+        self.timer = StageTimer()
+        self.objects = queue.Queue(maxsize=1)
+        self.sorted_counts = collections.Counter()
+        self.sorted_scans = []
+        self._running = False
+        self._scan_allowed = threading.Event()
+        self._scan_allowed.set()
+        self._scan_thread = None
+
+    def _scan_loop(self):
+        absent = self.min_gap_frames
+        last_label = None
+        last_timestamp = None
+        paused_at = None
+        stale_before = None
+        search_start = time.perf_counter()
+        while self._running:
+            if not self._scan_allowed.is_set():
+                if paused_at is None:
+                    paused_at = time.perf_counter()
+                self._scan_allowed.wait(timeout=0.1)
+                continue
+            if paused_at is not None:
+                # Frames stamped before the resume were captured while the arm moved
+                if last_timestamp is not None:
+                    stale_before = last_timestamp + time.perf_counter() - paused_at
+                paused_at = None
+                search_start = time.perf_counter()
+            latest = self.camera.get_latest(timeout=0.5)
+            if latest is None:
+                if not self.camera.running:
+                    break
+                continue
+            frame, _, timestamp = latest
+            if stale_before is not None and timestamp < stale_before:
+                continue
+            last_timestamp = timestamp
+
+            start = time.perf_counter()
+            codes = [code for code in self.decode(frame) if code.data in self.labels]
+            self.timer.add("decode", time.perf_counter() - start)
+
+            if not codes:
+                if absent == 0:
+                    search_start = time.perf_counter()  # The previous object just left the view
+                absent += 1
+                continue
+
+            label = codes[0].data
+            if absent >= self.min_gap_frames or label != last_label:
+                now = time.perf_counter()
+                result = ScanResult(label, timestamp, now, now - search_start)
+                self.timer.add("scan", result.scan_time)
+                while self._running:
+                    try:
+                        self.objects.put(result, timeout=0.1)  # Waits while the arm is still busy
+                        break
+                    except queue.Full:
+                        continue
+            absent = 0
+            last_label = label
+
+    def _move(self, pose, dz=0):
+        target = list(pose)
+        target[2] += dz
+        self.robot.set_coordinates(target, self.motion)
+
+    def _sort_one(self, label):
+        pick = self.poses["pick"]
+        place = self.poses[label]
+        with self.timer.stage("pick"):
+            self._move(pick, APPROACH_HEIGHT)
+            self._move(pick)
+            self.robot.set_pump(True)
+            self._move(pick, APPROACH_HEIGHT)
+        with self.timer.stage("transfer"):
+            self._move(place, APPROACH_HEIGHT)
+        with self.timer.stage("place"):
+            self._move(place)
+            self.robot.set_pump(False)
+            self._move(place, APPROACH_HEIGHT)
+        with self.timer.stage("return"):
+            self._move(self.poses["scan"])
+
+    def run(self, max_objects=None, duration=None):
+        """
+        Sort objects until ``max_objects`` are done, ``duration`` seconds have
+        passed or the camera stops.
+
+        Args:
+            max_objects (int): Stop after this many objects
+            duration (float): Stop after this many seconds
+
+        Returns:
+            dict: 'objects', 'elapsed', 'objects_per_minute', 'sorted' (per
+            label), 'scans' (ScanResult of every sorted object, in order) and
+            'stages' (see StageTimer.summary)
+        """
+        self._running = True
+        self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
+        self._scan_thread.start()
+        start = time.perf_counter()
+        done = 0
+        try:
+            while max_objects is None or done < max_objects:
+                if duration is not None and time.perf_counter() - start > duration:
+                    break
+                wait_start = time.perf_counter()
+                try:
+                    result = self.objects.get(timeout=0.5)
+                except queue.Empty:
+                    if not self._scan_thread.is_alive():
+                        break
+                    continue
+                self.timer.add("wait", time.perf_counter() - wait_start)
+
+                if not self.pipelined:
+                    self._scan_allowed.clear()
+                with self.timer.stage("cycle"):
+                    self._sort_one(result.label)
+                self._scan_allowed.set()
+                self.sorted_counts[result.label] += 1
+                self.sorted_scans.append(result)
+                done += 1
+        finally:
+            self._running = False
+            self._scan_allowed.set()
+            self._scan_thread.join(timeout=2.0)
+
+        elapsed = time.perf_counter() - start
+        return {
+            'objects': done,
+            'elapsed': elapsed,
+            'objects_per_minute': 60.0 * done / elapsed if elapsed > 0 else 0.0,
+            'sorted': dict(self.sorted_counts),
+            'scans': list(self.sorted_scans),
+            'stages': self.timer.summary(),
+        }
+
+
+def print_report(report):
+    """Print a run report from ``PipelinedSorter.run``."""
+    print(f"Sorted {report['objects']} objects in {report['elapsed']:.1f} s "
+          f"({report['objects_per_minute']:.1f} objects/min): {report['sorted']}")
+    print(f"{'stage':>10} {'count':>6} {'mean ms':>9} {'max ms':>9}")
+    for name, stats in report['stages'].items():
+        print(f"{name:>10} {stats['count']:6d} {stats['mean'] * 1000:9.1f} {stats['max'] * 1000:9.1f}")
+
+
+if __name__ == "__main__":
+    from oakd_lite_camera import OakDLiteCamera
+    from wlkata_controller import WlkataRobotController
+
+    # replace COM3 and baudrate with your actual settings
+    robot = WlkataRobotController(port="COM3", baudrate=115200, timeout=1)
+    robot.home()
+    robot.set_coordinates(SORTING_POSES["scan"])
+
+    with OakDLiteCamera(preview_size=(640, 480), fps=30, threaded=True) as camera:
+        sorter = PipelinedSorter(robot, camera)
+        print_report(sorter.run(max_objects=10))
@@ -0,0 +1,9 @@
+# Cartesian targets [x, y, z, roll, pitch, yaw] of the sorting cell, kept free
+# of camera and serial imports so kinematics and planning code can use them.
+SORTING_POSES = {
+    "scan": [198.67, 0, 230.72, 0, 0, 0],
+    "pick": [200, 0, 40, 0, 0, 0],
+    "engine": [120, 160, 40, 0, 0, 0],  # Area 1
+    "gearbox": [120, -160, 40, 0, 0, 0],  # Area 2
+}
+APPROACH_HEIGHT = 60  # mm above the pick and place poses
@@ -0,0 +1,117 @@
+import numpy as np
+from depth_filters import HostDepthFilterChain, PostProcessingConfig
+
+
+def _spatial_config(alpha=0.5, delta=50, radius=2, iterations=1):
+    config = PostProcessingConfig()
+    spatial = config.spatialFilter
+    spatial.enable = True
+    spatial.alpha = alpha
+    spatial.delta = delta
+    spatial.holeFillingRadius = radius
+    spatial.numIterations = iterations
+    return config
+
+
+def _reference_line(line, alpha, delta, radius):
+    """Per-pixel forward and backward recursion with hole filling, as on the device."""
+    for order, step in ((range(1, len(line)), -1), (range(len(line) - 2, -1, -1), 1)):
+        filled = 0
+        for i in order:
+            current, previous = line[i], line[i + step]
+            if current > 0:
+                filled = 0
+                if previous > 0 and abs(current - previous) < delta:
+                    line[i] = current + (previous - current) * (1 - alpha)
+            elif previous > 0 and filled < radius:
+                line[i] = previous
+                filled += 1
+
+
+def _reference_spatial(depth, alpha, delta, radius, iterations):
+    work = depth.astype(np.float64)
+    for _ in range(iterations):
+        for row in work:
+            _reference_line(row, alpha, delta, radius)
+        for column in work.T:
+            _reference_line(column, alpha, delta, radius)
+    return work.astype(np.uint16)
+
+
+def _noisy_depth(seed, shape=(24, 32), holes=0.2):
+    rng = np.random.default_rng(seed)
+    depth = (1000 + np.cumsum(rng.normal(0, 6, shape), axis=1)).astype(np.uint16)
+    depth[:, shape[1] // 2:] += 400  # An edge the filter must not smooth across
+    depth[rng.random(shape) < holes] = 0
+    depth[3:6, 2:12] = 0  # A hole wider than the fill radius
+    return depth
+
+
+def test_spatial_filter_matches_per_pixel_reference():
+    for seed, (alpha, delta, radius, iterations) in enumerate([
+            (0.5, 50, 2, 1), (0.3, 20, 0, 1), (0.8, 50, 4, 2), (1.0, 50, 1, 1)]):
+        depth = _noisy_depth(seed)
+        chain = HostDepthFilterChain(_spatial_config(alpha, delta, radius, iterations))
+        result = chain.process(depth).astype(np.int32)
+        expected = _reference_spatial(depth, alpha, delta, radius, iterations).astype(np.int32)
+        assert np.abs(result - expected).max() <= 1
+        assert ((result > 0) == (expected > 0)).all()
+
+
+def test_spatial_filter_keeps_edges_and_fills_small_holes():
+    depth = np.full((8, 20), 1000, np.uint16)
+    depth[:, 10:] = 2000
+    depth[:, 4] = 0  # One-pixel gap, filled
+    depth[:, 12:17] = 0  # Five-pixel gap, wider than the radius in both directions
+    result = HostDepthFilterChain(_spatial_config(radius=2)).process(depth)
+    assert (result[:, :10] == 1000).all()
+    assert (result[:, 10:12] == 2000).all()
+    assert (result[:, 14] == 0).all()
+    assert (result[:, [12, 13, 15, 16]] == 2000).all()
+
+
+def test_disabled_chain_is_identity():
+    depth = _noisy_depth(3)
+    result = HostDepthFilterChain().process(depth)
+    assert (result == depth).all()
+
+
+def test_median_filter():
+    depth = np.full((9, 9), 1000, np.uint16)
+    depth[4, 4] = 5000
+    config = PostProcessingConfig()
+    config.median = 3
+    assert (HostDepthFilterChain(config).process(depth) == 1000).all()
+
+
+def test_speckle_filter_removes_small_blobs():
+    depth = np.full((20, 20), 1000, np.uint16)
+    depth[5:7, 5:7] = 3000  # 4-pixel speckle
+    config = PostProcessingConfig()
+    config.speckleFilter.enable = True
+    config.speckleFilter.speckleRange = 10
+    result = HostDepthFilterChain(config).process(depth)
+    assert (result[5:7, 5:7] == 0).all()
+    assert (result[10:, 10:] == 1000).all()
+
+
+def test_temporal_filter_smooths_and_persists():
+    config = PostProcessingConfig()
+    temporal = config.temporalFilter
+    temporal.enable = True
+    temporal.alpha = 0.5
+    temporal.persistencyMode = "VALID_2_IN_LAST_3"
+    chain = HostDepthFilterChain(config)
+    chain.process(np.full((4, 4), 1000, np.uint16))
+    assert (chain.process(np.full((4, 4), 1020, np.uint16)) == 1010).all()
+    # Valid in 2 of the last 3 frames: the previous value is kept
+    assert (chain.process(np.zeros((4, 4), np.uint16)) == 1010).all()
+    chain.reset()
+    assert (chain.process(np.zeros((4, 4), np.uint16)) == 0).all()
+
+
+def test_process_reallocates_on_resolution_change():
+    chain = HostDepthFilterChain(_spatial_config())
+    chain.process(_noisy_depth(0, (12, 16)))
+    result = chain.process(_noisy_depth(1, (20, 10)))
+    assert result.shape == (20, 10)
@@ -0,0 +1,74 @@
+import numpy as np
+from depth_regions import DepthRegionStats
+
+
+def _depth(seed=0):
+    rng = np.random.default_rng(seed)
+    depth = rng.integers(300, 3000, (48, 64)).astype(np.uint16)
+    depth[rng.random(depth.shape) < 0.2] = 0
+    depth[30:40, 40:60] = 0  # A box without any valid pixel
+    return depth
+
+
+BOXES = np.array([
+    [0, 0, 64, 48],
+    [5, 7, 10, 12],
+    [40, 30, 20, 10],
+    [60, 44, 20, 20],  # Partly outside the frame
+    [-5, -5, 10, 10],
+    [10, 10, 0, 5],
+])
+
+
+def _reference(depth, box):
+    x, y, w, h = box
+    region = depth[max(y, 0):max(y + h, 0), max(x, 0):max(x + w, 0)]
+    return region[region > 0].astype(np.float64)
+
+
+def test_query_matches_brute_force():
+    depth = _depth()
+    stats = DepthRegionStats()
+    stats.update(depth)
+    result = stats.query(BOXES)
+    for i, box in enumerate(BOXES):
+        values = _reference(depth, box)
+        assert result['count'][i] == len(values)
+        if len(values):
+            assert np.isclose(result['mean'][i], values.mean())
+            assert np.isclose(result['std'][i], values.std(), atol=1e-3)
+        else:
+            assert np.isnan(result['mean'][i])
+
+
+def test_extrema_ignore_invalid_pixels():
+    depth = _depth(1)
+    stats = DepthRegionStats()
+    stats.update(depth)
+    minimum, maximum = stats.extrema(BOXES)
+    for i, box in enumerate(BOXES):
+        values = _reference(depth, box)
+        expected = (values.min(), values.max()) if len(values) else (0, 0)
+        assert (minimum[i], maximum[i]) == expected
+
+
+def test_update_replaces_the_previous_frame():
+    stats = DepthRegionStats()
+    stats.update(np.full((10, 10), 1000, np.uint16))
+    stats.update(np.full((20, 30), 500, np.uint16))
+    result = stats.query([[0, 0, 30, 20]])
+    assert result['count'][0] == 600
+    assert result['mean'][0] == 500
+    assert stats.medians([[0, 0, 30, 20]])[0] == 500
+
+
+def test_medians_of_uniform_and_empty_boxes():
+    depth = np.zeros((40, 40), np.uint16)
+    depth[:, :20] = 800
+    depth[:, 20:] = 1200
+    stats = DepthRegionStats()
+    stats.update(depth)
+    medians = stats.medians([[0, 0, 20, 40], [20, 0, 20, 40], [5, 5, 0, 0]])
+    assert medians[0] == 800
+    assert medians[1] == 1200
+    assert np.isnan(medians[2])
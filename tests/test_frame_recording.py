@@ -0,0 +1,84 @@
+import os
+import time
+import numpy as np
+import pytest
+from frame_recording import FrameRecorder, FrameReplay
+
+
+def _record(path, count, shape=(4, 6, 3), dtype=np.uint8, interval=0.01, chunk_frames=3):
+    with FrameRecorder(path, shape, dtype, chunk_frames=chunk_frames) as recorder:
+        for i in range(count):
+            recorder.append(np.full(shape, i, dtype), sequence_number=i, timestamp=i * interval)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "rgb.frames")
+    _record(path, 7)
+    with FrameReplay(path, realtime=False) as replay:
+        assert len(replay) == 7
+        assert replay.shape == (4, 6, 3)
+        assert os.path.getsize(path) == 4096 + 7 * replay.frames[0].nbytes
+        for i in range(7):
+            frame, sequence_number, timestamp = replay.get_latest()
+            assert (frame == i).all()
+            assert (sequence_number, timestamp) == (i, pytest.approx(i * 0.01))
+        assert replay.get_latest() is None
+        assert replay.find(0.025) == 3
+
+
+def test_depth_frames_and_loop(tmp_path):
+    path = str(tmp_path / "depth.frames")
+    _record(path, 2, shape=(5, 8), dtype=np.uint16)
+    with FrameReplay(path, realtime=False, loop=True) as replay:
+        assert replay.dtype == np.uint16
+        values = [int(replay.get_depth_frame()[0, 0]) for _ in range(5)]
+    assert values == [0, 1, 0, 1, 0]
+
+
+def test_unclosed_recording_is_readable(tmp_path):
+    path = str(tmp_path / "crash.frames")
+    recorder = FrameRecorder(path, (2, 2), np.uint8, chunk_frames=4)
+    for i in range(5):
+        recorder.append(np.full((2, 2), i, np.uint8), i, i * 0.1)
+    recorder._index.flush()
+    recorder._chunk.flush()
+    replay = FrameReplay(path, realtime=False)
+    assert len(replay) == 5
+    assert (replay[4] == 4).all()
+    recorder.close()
+
+
+def test_empty_recording(tmp_path):
+    path = str(tmp_path / "empty.frames")
+    FrameRecorder(path, (2, 2)).close()
+    with FrameReplay(path) as replay:
+        assert len(replay) == 0
+        assert replay.get_frame() is None
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        FrameReplay(str(path))
+
+
+def test_realtime_replay_skips_frames_a_slow_consumer_missed(tmp_path):
+    path = str(tmp_path / "rgb.frames")
+    _record(path, 50, interval=0.01)
+    with FrameReplay(path, realtime=True) as replay:
+        assert replay.get_latest()[1] == 0
+        time.sleep(0.1)
+        _, sequence_number, _ = replay.get_latest()
+    assert sequence_number >= 8
+    assert replay.dropped == sequence_number - 1
+
+
+def test_realtime_replay_timeout(tmp_path):
+    path = str(tmp_path / "slow.frames")
+    _record(path, 3, interval=1.0)
+    with FrameReplay(path, realtime=True) as replay:
+        replay.get_latest()
+        start = time.perf_counter()
+        assert replay.get_latest(timeout=0.05) is None
+        assert time.perf_counter() - start < 0.5
@@ -0,0 +1,40 @@
+import threading
+import numpy as np
+from frame_ring import FrameRing
+
+
+def test_latest_is_none_before_publish():
+    ring = FrameRing((2, 2), size=3)
+    assert ring.latest() is None
+    assert ring.wait_newer(0, timeout=0.01) is None
+
+
+def test_publish_never_overwrites_the_newest_frame():
+    ring = FrameRing((2, 2), size=3)
+    for sequence_number in range(5):
+        buffer = ring.next_buffer()
+        latest = ring.latest()
+        if latest is not None:
+            assert buffer is not latest[0]
+        buffer.fill(sequence_number)
+        ring.publish(sequence_number, sequence_number * 0.1)
+    frame, sequence_number, timestamp = ring.latest()
+    assert sequence_number == 4
+    assert timestamp == 0.4
+    assert (frame == 4).all()
+    assert ring.published == 5
+
+
+def test_wait_newer_wakes_on_publish():
+    ring = FrameRing((1,), size=2)
+    timer = threading.Timer(0.05, lambda: ring.publish(7, 1.0))
+    timer.start()
+    frame, sequence_number, timestamp, published = ring.wait_newer(0, timeout=2.0)
+    assert (sequence_number, timestamp, published) == (7, 1.0, 1)
+
+
+def test_close_releases_waiters():
+    ring = FrameRing((1,), size=2)
+    threading.Timer(0.05, ring.close).start()
+    assert ring.wait_newer(0) is None
+    assert ring.closed
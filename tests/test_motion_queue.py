@@ -0,0 +1,69 @@
+import time
+import pytest
+
+pytest.importorskip("wlkatapython")
+pytest.importorskip("serial")
+
+from motion_queue import MotionCommandQueue  # noqa: E402
+from simulated_robot import SimulatedRobotController  # noqa: E402
+
+
+def _queue(robot):
+    return MotionCommandQueue(robot, poll_interval=0.005, start_grace=0.05)
+
+
+def test_commands_are_streamed_and_complete():
+    robot = SimulatedRobotController(time_scale=0.02)
+    with _queue(robot) as motion:
+        start = time.monotonic()
+        futures = [motion.move_to([200, 0, z, 0, 0, 0]) for z in (200, 150, 100)]
+        futures.append(motion.pump(True))
+        # All commands are handed to the controller before the first move ends
+        while robot.commands < 4:
+            time.sleep(0.001)
+        assert time.monotonic() < robot.busy_until
+        assert motion.barrier(timeout=5.0)
+    assert all(future.result() is True for future in futures)
+    assert time.monotonic() - start >= robot.busy_until - start - 0.01
+    assert robot.pump_on
+
+
+def test_future_waits_for_the_buffer_to_drain():
+    robot = SimulatedRobotController(time_scale=0.05)
+    with _queue(robot) as motion:
+        future = motion.move_to([200, 0, 100, 0, 0, 0])
+        future.result(timeout=5.0)
+        assert time.monotonic() >= robot.busy_until
+
+
+def test_failed_command_sets_the_exception():
+    robot = SimulatedRobotController(time_scale=0.01)
+    with _queue(robot) as motion:
+        future = motion.move_joints([0, 0])  # Wrong number of joints still works in the simulator
+        bad = motion._submit(lambda: 1 / 0)
+        assert motion.barrier(timeout=5.0)
+    assert future.result() is True
+    with pytest.raises(ZeroDivisionError):
+        bad.result()
+
+
+def test_close_without_waiting_does_not_hang():
+    robot = SimulatedRobotController(time_scale=1.0)
+    motion = _queue(robot)
+    futures = [motion.move_to([200, 0, z, 0, 0, 0]) for z in (50, 200, 50, 200)]
+    start = time.monotonic()
+    motion.close(wait=False)
+    assert time.monotonic() - start < 2.5
+    for future in futures:
+        assert future.done()
+        assert future.cancelled() or isinstance(future.exception(), RuntimeError)
+    with pytest.raises(RuntimeError):
+        motion.pump(False)
+
+
+def test_barrier_timeout():
+    robot = SimulatedRobotController(time_scale=1.0)
+    motion = _queue(robot)
+    motion.move_to([200, 0, 0, 0, 0, 0])
+    assert not motion.barrier(timeout=0.05)
+    motion.close(wait=False)
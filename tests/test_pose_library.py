@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import pose_library
+from mirobot_kinematics import forward_kinematics, inverse_kinematics, matrix_from_pose, pose_from_matrix
+from pose_library import PoseLibrary, sorting_pose_library
+from sorting_poses import SORTING_POSES
+
+
+def test_home_pose():
+    transform = forward_kinematics([0] * 6)
+    assert np.allclose(transform[:3, 3], [198.67, 0, 230.72], atol=0.01)
+    assert np.allclose(pose_from_matrix(transform)[3:], [0, 0, 0], atol=1e-6)
+
+
+def test_pose_matrix_round_trip():
+    pose = [150.0, -40.0, 90.0, 10.0, -20.0, 35.0]
+    assert np.allclose(pose_from_matrix(matrix_from_pose(pose)), pose)
+
+
+@pytest.mark.parametrize("name", sorted(SORTING_POSES))
+def test_inverse_kinematics_reaches_sorting_poses(name):
+    pose = SORTING_POSES[name]
+    angles = inverse_kinematics(pose)
+    assert angles is not None
+    assert np.allclose(forward_kinematics(angles)[:3, 3], pose[:3], atol=0.1)
+
+
+def test_unreachable_pose():
+    assert inverse_kinematics([1000, 0, 0, 0, 0, 0], max_iterations=50) is None
+
+
+def test_solutions_are_cached_across_instances(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "poses.json")
+    library = sorting_pose_library(cache_path)
+    assert library.precompute() == []
+    solved = {name: library.joints(name) for name in library.poses}
+
+    def no_ik(*args, **kwargs):
+        raise AssertionError("IK should come from the cache")
+
+    monkeypatch.setattr(pose_library, "inverse_kinematics", no_ik)
+    cached = sorting_pose_library(cache_path)
+    assert {name: cached.joints(name) for name in cached.poses} == solved
+
+
+def test_cache_is_ignored_for_another_model(tmp_path):
+    cache_path = str(tmp_path / "poses.json")
+    library = PoseLibrary({"pick": SORTING_POSES["pick"]}, cache_path=cache_path)
+    library.precompute()
+    limits = tuple((low - 1.0, high + 1.0) for low, high in library.limits)
+    other = PoseLibrary({"pick": SORTING_POSES["pick"]}, cache_path=cache_path, limits=limits)
+    assert other.model_id != library.model_id
+    assert other._cache == {}
+
+
+def test_taught_angles_take_precedence(tmp_path):
+    cache_path = str(tmp_path / "poses.json")
+    library = PoseLibrary({"pick": SORTING_POSES["pick"]}, cache_path=cache_path)
+    library.teach("pick", [1, 2, 3, 4, 5, 6])
+    library.save()
+    assert PoseLibrary({"pick": SORTING_POSES["pick"]}, cache_path=cache_path).joints("pick") == [1, 2, 3, 4, 5, 6]
+
+
+class _RecordingRobot:
+    def __init__(self):
+        self.calls = []
+
+    def set_joint_angles(self, angles, **kwargs):
+        self.calls.append(("joints", angles, kwargs))
+
+    def set_coordinates(self, coordinates, **kwargs):
+        self.calls.append(("coordinates", coordinates, kwargs))
+
+
+def test_move_uses_joint_solution_unless_linear():
+    library = PoseLibrary({"pick": SORTING_POSES["pick"]}, cache_path=None)
+    robot = _RecordingRobot()
+    library.move(robot, "pick", wait=False)
+    library.move(robot, "pick", linear=True)
+    assert robot.calls[0] == ("joints", library.joints("pick"), {"wait": False})
+    assert robot.calls[1] == ("coordinates", SORTING_POSES["pick"], {})
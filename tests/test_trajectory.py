@@ -0,0 +1,87 @@
+import pytest
+from trajectory import MotionLimits, Waypoint, estimate_time, execute, pick_and_place_waypoints, plan, simplify
+
+
+def test_simplify_drops_duplicates_and_collinear_points():
+    waypoints = [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0.1, 0, 0, 0],
+        [50, 0, 0, 0, 0, 0],
+        [100, 0, 0, 0, 0, 0],
+        [100, 100, 0, 0, 0, 0],
+    ]
+    assert [w.pose for w in simplify(waypoints)] == [[0, 0, 0, 0, 0, 0], [100, 0, 0, 0, 0, 0],
+                                                     [100, 100, 0, 0, 0, 0]]
+
+
+def test_simplify_keeps_pump_stop_and_orientation_changes():
+    waypoints = [
+        Waypoint([0, 0, 0, 0, 0, 0]),
+        Waypoint([50, 0, 0, 0, 0, 0], pump=True),
+        Waypoint([100, 0, 0, 0, 0, 0]),
+        Waypoint([150, 0, 0, 0, 0, 0], stop=True),
+        Waypoint([200, 0, 0, 0, 0, 90]),
+        Waypoint([250, 0, 0, 0, 0, 0]),
+    ]
+    # Only the plain point between the pump and the stop point goes
+    assert [w.pose[0] for w in simplify(waypoints)] == [0, 50, 150, 200, 250]
+
+
+def test_simplify_merges_actions_on_duplicate_points():
+    result = simplify([Waypoint([0, 0, 0, 0, 0, 0]), Waypoint([0, 0, 0, 0, 0, 360], pump=True)])
+    assert len(result) == 1
+    assert result[0].pump is True
+
+
+def test_plan_emits_moves_and_pump_commands():
+    commands = plan(pick_and_place_waypoints([200, 0, 40, 0, 0, 0], [120, 160, 40, 0, 0, 0], 60))
+    assert [kind for kind, _ in commands] == ["move", "move", "pump", "move", "move", "move", "pump", "move"]
+    assert commands[2] == ("pump", True)
+    assert commands[-2] == ("pump", False)
+
+
+def test_blending_is_kept_only_when_it_saves_time():
+    square = [[0, 0, 0, 0, 0, 0], [100, 0, 0, 0, 0, 0], [100, 100, 0, 0, 0, 0], [0, 100, 0, 0, 0, 0]]
+    sharp = plan(square)
+    blended = plan(square, blend_radius=40)
+    assert len(blended) == len(sharp) + 2
+    assert estimate_time(blended, square[0]) < estimate_time(sharp, square[0]) - 0.2
+    # A short cut saves less than min_saving per corner and is dropped
+    assert plan(square, blend_radius=5) == sharp
+    assert plan(square, blend_radius=40, min_saving=100.0) == sharp
+
+
+def test_estimate_time_of_a_single_move():
+    limits = MotionLimits(speed=80.0, acceleration=400.0, settle_time=0.05)
+    # 8 mm to accelerate, 84 mm cruise, 8 mm to stop
+    duration = estimate_time([("move", [100, 0, 0, 0, 0, 0])], [0, 0, 0, 0, 0, 0], limits)
+    assert duration == pytest.approx(0.2 + 84 / 80 + 0.2 + 0.05)
+
+
+def test_streaming_is_never_slower():
+    commands = plan(pick_and_place_waypoints([200, 0, 40, 0, 0, 0], [120, 160, 40, 0, 0, 0], 60))
+    start = [198.67, 0, 230.72, 0, 0, 0]
+    assert estimate_time(commands, start) <= estimate_time(commands, start, streamed=False)
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.calls = []
+
+    def move_to(self, coordinates, motion):
+        self.calls.append(("move", coordinates, motion))
+        return len(self.calls)
+
+    def pump(self, state):
+        self.calls.append(("pump", state))
+        return len(self.calls)
+
+
+def test_execute_submits_every_command():
+    pytest.importorskip("wlkatapython")
+    from wlkata_controller import Motion
+
+    queue = _RecordingQueue()
+    futures = execute([("move", [1, 2, 3, 0, 0, 0]), ("pump", True)], queue)
+    assert futures == [1, 2]
+    assert queue.calls == [("move", [1, 2, 3, 0, 0, 0], Motion.LINEAR_MOVEMENT), ("pump", True)]
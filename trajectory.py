@@ -0,0 +1,305 @@
+import collections
+import math
+import numpy as np
+
+# A cartesian target [x, y, z, roll, pitch, yaw]. ``pump`` switches the pump
+# (True/False) once the pose is reached, ``stop`` forces an exact stop there.
+Waypoint = collections.namedtuple("Waypoint", ["pose", "pump", "stop"], defaults=(None, False))
+
+# Planner limits used by the timing estimator (mm/s, mm/s^2, mm, s)
+MotionLimits = collections.namedtuple(
+    "MotionLimits",
+    ["speed", "acceleration", "junction_deviation", "settle_time", "pump_time"],
+    defaults=(80.0, 400.0, 0.05, 0.05, 0.15),
+)
+
+
+def _as_waypoint(waypoint):
+    if isinstance(waypoint, Waypoint):
+        return waypoint
+    return Waypoint(list(waypoint))
+
+
+def _same_orientation(a, b, angle_tolerance):
+    """True if the roll, pitch and yaw of poses a and b match (degrees, wrap-aware)."""
+    return all(abs((x - y + 180.0) % 360.0 - 180.0) <= angle_tolerance for x, y in zip(a[3:6], b[3:6]))
+
+
+def _same_pose(a, b, tolerance, angle_tolerance):
+    return math.dist(a[:3], b[:3]) <= tolerance and _same_orientation(a, b, angle_tolerance)
+
+
+def _is_between(a, b, c, tolerance):
+    """True if b lies on the segment a-c (within ``tolerance`` mm)."""
+    a, b, c = (np.asarray(p[:3], dtype=np.float64) for p in (a, b, c))
+    direction = c - a
+    length_sq = direction @ direction
+    if length_sq == 0:
+        return False
+    t = ((b - a) @ direction) / length_sq
+    if t < 0 or t > 1:
+        return False
+    return np.linalg.norm(a + t * direction - b) <= tolerance
+
+
+def simplify(waypoints, tolerance=0.5, angle_tolerance=0.5):
+    """
+    Drop duplicate waypoints and intermediate points on a straight segment.
+
+    Waypoints with a pump action or ``stop`` are never merged away, since the
+    arm has to reach them exactly.
+
+    Args:
+        waypoints (list): Waypoints or plain [x, y, z, roll, pitch, yaw] poses
+        tolerance (float): Position tolerance in mm
+        angle_tolerance (float): Orientation tolerance in degrees
+
+    Returns:
+        list: Simplified list of Waypoint
+    """
+    result = []
+    for waypoint in map(_as_waypoint, waypoints):
+        if result and _same_pose(result[-1].pose, waypoint.pose, tolerance, angle_tolerance):
+            last = result[-1]
+            if last.pump is None or waypoint.pump is None:
+                # Duplicate: keep a single point carrying both actions
+                pump = last.pump if waypoint.pump is None else waypoint.pump
+                result[-1] = Waypoint(last.pose, pump, last.stop or waypoint.stop)
+                continue
+        elif (len(result) >= 2 and result[-1].pump is None and not result[-1].stop and
+              _same_orientation(result[-2].pose, waypoint.pose, angle_tolerance) and
+              _same_orientation(result[-1].pose, waypoint.pose, angle_tolerance) and
+              _is_between(result[-2].pose, result[-1].pose, waypoint.pose, tolerance)):
+            result.pop()  # The previous point lies on the straight line to this one
+        result.append(Waypoint(list(waypoint.pose), waypoint.pump, waypoint.stop))
+    return result
+
+
+def _corner_cut(previous, corner, following, radius, tolerance):
+    """Entry and exit poses of a blend around ``corner``, or None to keep the corner."""
+    previous, corner, following = (np.asarray(p, dtype=np.float64) for p in (previous, corner, following))
+    incoming = corner[:3] - previous[:3]
+    outgoing = following[:3] - corner[:3]
+    length_in, length_out = np.linalg.norm(incoming), np.linalg.norm(outgoing)
+    if length_in <= tolerance or length_out <= tolerance:
+        return None
+    cos_deflection = (incoming @ outgoing) / (length_in * length_out)
+    if cos_deflection > 0.9998 or cos_deflection < -0.9998:
+        return None  # Straight through or a full reversal: nothing to blend
+    cut = min(radius, length_in / 2, length_out / 2)
+    entry = corner + (previous - corner) * (cut / length_in)
+    exit_ = corner + (following - corner) * (cut / length_out)
+    return entry.tolist(), exit_.tolist()
+
+
+def _build_commands(points, cuts, emit_first, tolerance, angle_tolerance):
+    """Command sequence through ``points``, replacing corner i by the two poses in ``cuts[i]``."""
+    commands = []
+
+    def add_move(pose):
+        if commands and commands[-1][0] == "move" and _same_pose(commands[-1][1], pose, tolerance, angle_tolerance):
+            return
+        commands.append(("move", [float(value) for value in pose]))
+
+    for i, waypoint in enumerate(points):
+        if i in cuts:
+            add_move(cuts[i][0])
+            add_move(cuts[i][1])
+        elif i > 0 or emit_first:
+            add_move(waypoint.pose)
+        if waypoint.pump is not None:
+            commands.append(("pump", waypoint.pump))
+    return commands
+
+
+def plan(waypoints, blend_radius=0.0, tolerance=0.5, angle_tolerance=0.5, start=None, limits=None,
+         min_saving=0.1):
+    """
+    Turn waypoints into the shortest-running command sequence for the arm.
+
+    Waypoints are simplified first. With ``blend_radius`` a corner that does
+    not need an exact stop may be cut at up to that distance along both
+    adjacent segments, so the controller's planner can carry speed through
+    it. A cut costs an extra command, so it is only kept where
+    ``estimate_time`` says it shortens the whole sequence by at least
+    ``min_saving``.
+
+    Args:
+        waypoints (list): Waypoints or plain poses
+        blend_radius (float): Corner blend distance in mm, 0 disables blending
+        tolerance (float): Position tolerance in mm
+        angle_tolerance (float): Orientation tolerance in degrees
+        start (list): Current pose of the arm; used for the first corner and
+            not emitted as a command
+        limits (MotionLimits): Planner limits used to decide on blends
+        min_saving (float): Estimated seconds a cut must save to be worth its
+            extra command
+
+    Returns:
+        list: ('move', pose) and ('pump', state) tuples
+    """
+    points = [_as_waypoint(waypoint) for waypoint in waypoints]
+    if start is not None:
+        points.insert(0, Waypoint(list(start), None, True))
+    points = simplify(points, tolerance, angle_tolerance)
+    limits = limits or MotionLimits()
+    emit_first = start is None
+    cuts = {}
+    if blend_radius > 0 and points:
+        origin = points[0].pose
+        best = estimate_time(_build_commands(points, cuts, emit_first, tolerance, angle_tolerance), origin, limits)
+        for i in range(1, len(points) - 1):
+            if points[i].pump is not None or points[i].stop:
+                continue
+            cut = _corner_cut(points[i - 1].pose, points[i].pose, points[i + 1].pose, blend_radius, tolerance)
+            if cut is None:
+                continue
+            trial = dict(cuts)
+            trial[i] = cut
+            duration = estimate_time(_build_commands(points, trial, emit_first, tolerance, angle_tolerance),
+                                     origin, limits)
+            if best - duration >= min_saving:
+                cuts, best = trial, duration
+    return _build_commands(points, cuts, emit_first, tolerance, angle_tolerance)
+
+
+def _junction_speed(incoming, outgoing, limits):
+    """Maximum speed through the junction of two unit directions (GRBL junction deviation)."""
+    cos_theta = -(incoming @ outgoing)
+    if cos_theta > 0.999999:
+        return 0.0  # Reversal
+    if cos_theta < -0.999999:
+        return limits.speed  # Straight through
+    sin_half = math.sqrt(0.5 * (1.0 - cos_theta))
+    return min(limits.speed, math.sqrt(limits.acceleration * limits.junction_deviation * sin_half / (1.0 - sin_half)))
+
+
+def _segment_time(distance, entry_speed, exit_speed, limits):
+    """Time for a trapezoidal (or triangular) profile between two speeds."""
+    if distance <= 0:
+        return 0.0
+    acceleration = limits.acceleration
+    peak = min(limits.speed, math.sqrt(acceleration * distance + (entry_speed ** 2 + exit_speed ** 2) / 2))
+    ramp = (2 * peak ** 2 - entry_speed ** 2 - exit_speed ** 2) / (2 * acceleration)
+    cruise = max(0.0, distance - ramp)
+    return (2 * peak - entry_speed - exit_speed) / acceleration + cruise / peak
+
+
+def _run_time(points, limits):
+    """Time for consecutive linear moves through ``points`` without a stop in between."""
+    vectors = [np.asarray(b[:3], dtype=np.float64) - np.asarray(a[:3], dtype=np.float64)
+               for a, b in zip(points, points[1:])]
+    lengths = [float(np.linalg.norm(v)) for v in vectors]
+    vectors = [(v, d) for v, d in zip(vectors, lengths) if d > 0]
+    if not vectors:
+        return 0.0
+    lengths = [d for _, d in vectors]
+    units = [v / d for v, d in vectors]
+
+    # Speed limit at each junction, at rest at both ends of the run
+    speeds = [0.0] + [_junction_speed(a, b, limits) for a, b in zip(units, units[1:])] + [0.0]
+    # Backward then forward pass so every segment can reach its exit speed
+    for i in range(len(lengths) - 1, -1, -1):
+        speeds[i] = min(speeds[i], math.sqrt(speeds[i + 1] ** 2 + 2 * limits.acceleration * lengths[i]))
+    for i in range(len(lengths)):
+        speeds[i + 1] = min(speeds[i + 1], math.sqrt(speeds[i] ** 2 + 2 * limits.acceleration * lengths[i]))
+    return sum(_segment_time(d, speeds[i], speeds[i + 1], limits) for i, d in enumerate(lengths))
+
+
+def estimate_time(commands, start, limits=MotionLimits(), streamed=True):
+    """
+    Dry-run duration of a command sequence.
+
+    Moves are modelled as straight lines with a trapezoidal speed profile on
+    the position only; orientation changes are assumed to finish within the
+    linear motion.
+
+    Args:
+        commands (list): Output of ``plan``
+        start (list): Pose of the arm before the first command
+        limits (MotionLimits): Speed, acceleration and settle parameters
+        streamed (bool): Commands are streamed (e.g. through MotionCommandQueue)
+            so the controller plans through junctions; otherwise every move
+            stops and settles before the next one is sent
+
+    Returns:
+        float: Estimated duration in seconds
+    """
+    total = 0.0
+    run = [list(start)]
+
+    def finish_run():
+        nonlocal total
+        if len(run) > 1:
+            total += _run_time(run, limits) + limits.settle_time
+        del run[:-1]
+
+    for kind, value in commands:
+        if kind == "pump":
+            finish_run()
+            total += limits.pump_time
+            continue
+        run.append(value)
+        if not streamed:
+            finish_run()
+    finish_run()
+    return total
+
+
+def execute(commands, motion_queue, motion=None):
+    """
+    Submit a command sequence to a MotionCommandQueue.
+
+    Args:
+        commands (list): Output of ``plan``
+        motion_queue (MotionCommandQueue): Open queue of a connected robot
+        motion (Motion): Motion type for the moves (default: linear)
+
+    Returns:
+        list: One Future per command
+    """
+    # Imported here so planning and dry runs work without the serial stack
+    from wlkata_controller import Motion
+
+    if motion is None:
+        motion = Motion.LINEAR_MOVEMENT
+    futures = []
+    for kind, value in commands:
+        if kind == "pump":
+            futures.append(motion_queue.pump(value))
+        else:
+            futures.append(motion_queue.move_to(value, motion))
+    return futures
+
+
+def pick_and_place_waypoints(pick, place, approach_height):
+    """Approach, pick, lift, transfer, place and retreat as waypoints."""
+    def above(pose):
+        raised = list(pose)
+        raised[2] += approach_height
+        return raised
+
+    return [
+        Waypoint(above(pick)),
+        Waypoint(list(pick), pump=True),
+        Waypoint(above(pick)),
+        Waypoint(above(place)),
+        Waypoint(list(place), pump=False),
+        Waypoint(above(place)),
+    ]
+
+
+if __name__ == "__main__":
+    from sorting_poses import APPROACH_HEIGHT, SORTING_POSES
+
+    scan = SORTING_POSES["scan"]
+    waypoints = pick_and_place_waypoints(SORTING_POSES["pick"], SORTING_POSES["engine"], APPROACH_HEIGHT)
+    waypoints.append(Waypoint(scan))
+
+    stop_and_go = plan(waypoints, start=scan)
+    print(f"Unblended, waiting after every move: {len(stop_and_go)} commands, "
+          f"{estimate_time(stop_and_go, scan, streamed=False):.2f} s")
+    print(f"Unblended, streamed: {len(stop_and_go)} commands, {estimate_time(stop_and_go, scan):.2f} s")
+    for radius in (10, 20, 40):
+        blended = plan(waypoints, blend_radius=radius, start=scan)
+        print(f"Blend radius {radius} mm, streamed: {len(blended)} commands, {estimate_time(blended, scan):.2f} s")
@@ -2,6 +2,7 @@ import wlkatapython
 import serial
 from enum import Enum
 import time
+from instrumentation import shared_metrics
 
 class PositionMode(Enum):
     ABSOLUTE = 0  # Absolute movement
@@ -11,15 +12,60 @@ class Motion(Enum):
     FAST_MOVEMENT = 0  # Fast movement
     LINEAR_MOVEMENT = 1  # Linear movement
 
+class CompletionPoller:
+    """Adaptive Idle detection shared by the blocking and the asyncio waits.
+
+    Feed each status report to ``update()``; between polls sleep for
+    ``backoff()`` seconds, which starts at poll_interval and grows towards
+    max_poll_interval.
+    """
+
+    def __init__(self, timeout=30, poll_interval=0.01, max_poll_interval=0.05, start_grace=0.2):
+        self.timeout = timeout
+        self.max_poll_interval = max_poll_interval
+        self.start_grace = start_grace
+        self.start_time = time.monotonic()
+        self.elapsed = 0.0
+        self.interval = poll_interval
+        self.seen_busy = False
+
+    def update(self, status):
+        """
+        Returns:
+            bool: True once the arm is Idle, False on timeout, None to keep polling
+        """
+        self.elapsed = time.monotonic() - self.start_time
+        # status will be "Idle" when operation is complete
+        if status["state"] == "Idle":
+            if self.seen_busy or self.elapsed >= self.start_grace:
+                return True
+        else:
+            self.seen_busy = True
+        if self.elapsed > self.timeout:
+            return False
+        return None
+
+    def backoff(self):
+        """Delay before the next poll in seconds."""
+        interval = self.interval
+        self.interval = min(interval * 1.5, self.max_poll_interval)
+        return interval
+
 class WlkataRobotController:
     """Controller for the WLKata robot using serial communication.
        Replace COM3 and baudrate with your actual settings."""
     
-    def __init__(self, port="COM3", baudrate=115200, timeout=1):
-        """Initialize the WLKata robot controller."""
+    def __init__(self, port="COM3", baudrate=115200, timeout=1, metrics=None):
+        """Initialize the WLKata robot controller.
+        
+        Args:
+            metrics (Metrics): Latency histograms (default: the shared,
+                normally disabled registry)
+        """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.metrics = metrics if metrics is not None else shared_metrics()
         self.serial_conn = None
         self.mirobot = None
         self.connect()  # Attempt to connect on initialization
@@ -53,76 +99,134 @@ class WlkataRobotController:
             self.serial_conn = None  # Ensure it's fully released
             print("Serial connection closed.")
 
-    def wait_for_completion(self, timeout=30):
-        """Wait for the robot to finish its current operation."""
-        start_time = time.time()
+    def wait_for_completion(self, timeout=30, poll_interval=0.01, max_poll_interval=0.05, start_grace=0.2):
+        """Wait for the robot to finish its current operation.
+        
+        Polls quickly right after the command and backs off towards
+        max_poll_interval, so the call returns within about one poll interval
+        of the arm going Idle instead of sleeping a fixed second. An Idle
+        status seen within start_grace seconds of the command, before the arm
+        was ever reported busy, is not trusted because the controller may not
+        have started the motion yet.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            poll_interval (float): First delay between status polls in seconds
+            max_poll_interval (float): Largest delay between status polls in seconds
+            start_grace (float): Time before a never-busy Idle status is accepted
+                (0 for commands that queue no motion)
+            
+        Returns:
+            bool: True if the robot reported Idle, False on timeout
+        """
+        poller = CompletionPoller(timeout, poll_interval, max_poll_interval, start_grace)
         
         while True:
-            # Check the robot's status (this is a placeholder method)
-            status = self.mirobot.getStatus()  # Hypothetical method that gets current status
+            status = self.status()
             
             # Debugging print
             # print(f"Robot status: {status}")
             
-            # If status indicates the operation is complete
-            if status["state"] == "Idle":  # status will be "Idle" when operation is complete
+            done = poller.update(status)
+            if done:
                 print("Operation completed.")
-                break
-            
-            # Check for timeout
-            if time.time() - start_time > timeout:
+                self.metrics.observe("motion_completion_seconds", poller.elapsed)
+                return True
+            if done is False:
                 print("Timeout waiting for completion.")
-                break
+                return False
             
-            time.sleep(1)  # Sleep for a bit to avoid busy-waiting
+            time.sleep(poller.backoff())
+
+    def _send(self, command, function, *args):
+        """Call a wlkatapython command, recording its serial round-trip time."""
+        if not self.metrics.enabled:
+            return function(*args)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.metrics.observe("serial_round_trip_seconds", time.perf_counter() - start, command=command)
     
-    def home(self):
-        """Send homing command to the robot."""
+    def status(self):
+        """Current controller status dictionary (one timed getStatus round trip)."""
+        return self._send("getStatus", self.mirobot.getStatus)
+
+    def home(self, timeout=60, wait=True):
+        """Send homing command to the robot.
+        
+        Args:
+            timeout (float): Maximum time to wait for homing to finish in seconds
+            wait (bool): Block until homing is complete
+        """
         if self.mirobot:
             print("Sending home command...")
-            self.mirobot.homing()
-            self.wait_for_completion()
-            print("Homing completed.")
+            self._send("homing", self.mirobot.homing)
+            if wait:
+                self.wait_for_completion(timeout=timeout)
+                print("Homing completed.")
         else:
             print("Mirobot not initialized! Home command not sent.")
     
-    def set_joint_angles(self, angles, mode=PositionMode.ABSOLUTE):
-        """Set joint angles for the robot."""
+    def set_joint_angles(self, angles, mode=PositionMode.ABSOLUTE, timeout=30, wait=True):
+        """Set joint angles for the robot.
+        
+        Args:
+            angles (list): Six joint angles in degrees
+            mode (PositionMode): Absolute or incremental angles
+            timeout (float): Maximum time to wait for the move in seconds
+            wait (bool): Block until the arm is idle again
+        """
         if self.mirobot:
             command = [mode.value] + angles
             print(f"Sending joint angles: {command}")
-            self.mirobot.writeangle(*command)
-            self.wait_for_completion()  # Wait for the robot to finish moving
+            self._send("writeangle", self.mirobot.writeangle, *command)
+            if wait:
+                self.wait_for_completion(timeout=timeout)  # Wait for the robot to finish moving
             
         else:
             print("Mirobot not initialized! Cannot set joint angles.")
     
-    def set_coordinates(self, coordinates, motion=Motion.LINEAR_MOVEMENT, mode=PositionMode.ABSOLUTE):
-        """Set cartesian coordinates for the robot."""
+    def set_coordinates(self, coordinates, motion=Motion.LINEAR_MOVEMENT, mode=PositionMode.ABSOLUTE, timeout=30,
+                        wait=True):
+        """Set cartesian coordinates for the robot.
+        
+        Args:
+            coordinates (list): [x, y, z, roll, pitch, yaw]
+            motion (Motion): Fast (joint-space) or linear movement
+            mode (PositionMode): Absolute or incremental coordinates
+            timeout (float): Maximum time to wait for the move in seconds
+            wait (bool): Block until the arm is idle again
+        """
         if self.mirobot:
             command = [motion.value, mode.value] + coordinates
             print(f"Sending coordinates: {command}")
-            self.mirobot.writecoordinate(*command)
-            self.wait_for_completion() # Wait for the robot to finish moving
+            self._send("writecoordinate", self.mirobot.writecoordinate, *command)
+            if wait:
+                self.wait_for_completion(timeout=timeout) # Wait for the robot to finish moving
         else:
             print("Mirobot not initialized! Cannot set coordinates.")
 
-    def set_pump(self, state):
-        """Turn the pump on or off.
-        
-        Args:
-            state: True to turn pump on, False to turn pump off
-        """
-        if self.mirobot:
-            if state:
-                print("Turning pump ON")
-                self.mirobot.pump(1)
-            else:
-                print("Turning pump OFF")
-                self.mirobot.pump(0)
-            self.wait_for_completion()  # Wait for the action to complete
-        else:
-            print("Mirobot not initialized! Cannot control pump.")
+    def set_pump(self, state, timeout=5, wait=True):
+        """Turn the pump on or off.
+        
+        Args:
+            state: True to turn pump on, False to turn pump off
+            timeout (float): Maximum time to wait for the pump command in seconds
+            wait (bool): Block until the arm is idle again
+        """
+        if self.mirobot:
+            if state:
+                print("Turning pump ON")
+                self._send("pump", self.mirobot.pump, 1)
+            else:
+                print("Turning pump OFF")
+                self._send("pump", self.mirobot.pump, 0)
+            if wait:
+                # No motion is queued, so the first Idle report already means done
+                self.wait_for_completion(timeout=timeout, start_grace=0)
+        else:
+            print("Mirobot not initialized! Cannot control pump.")
     
     def __enter__(self):
         """Context manager entry point."""